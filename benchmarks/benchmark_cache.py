@@ -0,0 +1,119 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Multi-process (cold cache) startup benchmark.
+Starts N worker processes at once, each creating a client for the
+same WSDL with a (cold) shared object cache, with and without the
+per-entry cache lock.  Reports the wall time until all workers have
+a client and the number of workers which built the WSDL.
+Then times looking up (and purging the expired of) many small
+entries in the file and SQLite caches.
+Usage: python benchmark_cache.py [workers] [types] [entries]
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '../')
+
+from suds.cache import Cache, FileCache, ObjectCache, SqliteCache
+from suds.client import Client
+from suds.plugin import DocumentPlugin
+from benchmark_startup import wsdl
+
+
+class Loaded(DocumentPlugin):
+
+    def __init__(self):
+        self.count = 0
+
+    def loaded(self, context):
+        self.count += 1
+
+
+def worker(url, location, locked, start, results):
+    if not locked:
+        FileCache.lock = Cache.lock
+    start.wait()
+    plugin = Loaded()
+    Client(url, cache=ObjectCache(location, days=1), cachingpolicy=1, plugins=[plugin])
+    results.put(plugin.count)
+
+
+def run(url, workers, locked):
+    location = tempfile.mkdtemp()
+    try:
+        start = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(url, location, locked, start, results))
+            for n in range(workers)]
+        for p in processes:
+            p.start()
+        time.sleep(0.5)
+        started = time.time()
+        start.set()
+        built = sum([results.get() for p in processes])
+        elapsed = time.time() - started
+        for p in processes:
+            p.join()
+        return elapsed, built
+    finally:
+        shutil.rmtree(location)
+
+
+def lookups(entries):
+    tmp = tempfile.mkdtemp()
+    try:
+        for name, cache in (
+                ('file', ObjectCache(os.path.join(tmp, 'files'), days=1)),
+                ('sqlite', SqliteCache(os.path.join(tmp, 'cache.db'), days=1))):
+            for n in range(entries):
+                cache.put('entry-%d' % n, {'n': n})
+            started = time.time()
+            for n in range(entries):
+                cache.get('entry-%d' % n)
+            elapsed = time.time() - started
+            print('%-8s: get %.1fus/entry' % (name, elapsed * 1000000 / entries))
+        started = time.time()
+        cache.expire()
+        print('sqlite  : expire %.3fs' % (time.time() - started))
+    finally:
+        shutil.rmtree(tmp)
+
+
+def main(workers=8, types=500, entries=5000):
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'types.wsdl')
+        with open(path, 'w') as fp:
+            fp.write(wsdl(types, 20))
+        url = 'file://' + path
+        print('workers: %d  types: %d  cpus: %d' % (workers, types, multiprocessing.cpu_count()))
+        for name, locked in (('unlocked', False), ('locked', True)):
+            elapsed, built = run(url, workers, locked)
+            print('%-8s: %.3fs  built: %d' % (name, elapsed, built))
+        lookups(entries)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,101 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+XML text escaping benchmark.
+Serializes an envelope with 100k leaves using the (single pass)
+encoder and the former (one re.sub per special character) encoder.
+Usage: python benchmark_escape.py [leaves]
+"""
+
+import re
+import sys
+import time
+
+sys.path.insert(0, '../')
+
+from suds import sax
+from suds.sax.element import Element
+from suds.sax.enc import Encoder
+
+TEXTS = [
+    'donald duck',
+    'huey, dewey & louie',
+    '<b>scrooge</b> mc&amp;duck',
+    'a "quoted" \'value\'',
+    '1234567890',
+]
+
+
+class Former(Encoder):
+    """
+    The encoder as it was: one re.sub per special character.
+    """
+
+    def encode(self, s):
+        if self.needsEncoding(s):
+            for x in self.encodings:
+                s = re.sub(x[0], x[1], s)
+        return s
+
+    def decode(self, s):
+        if '&' in s:
+            for x in self.decodings:
+                s = s.replace(x[0], x[1])
+        return s
+
+
+def envelope(leaves):
+    env = Element('Envelope', ns=('soap', 'http://schemas.xmlsoap.org/soap/envelope/'))
+    body = Element('Body', ns=('soap', 'http://schemas.xmlsoap.org/soap/envelope/'))
+    env.append(body)
+    for n in range(leaves):
+        item = Element('item')
+        item.setText(TEXTS[n % len(TEXTS)])
+        body.append(item)
+    return env
+
+
+def best(fn):
+    result = None
+    for n in range(3):
+        started = time.time()
+        fn()
+        elapsed = time.time() - started
+        if result is None or elapsed < result:
+            result = elapsed
+    return result
+
+
+def main(leaves=100000):
+    env = envelope(leaves)
+    texts = [c.text for c in env.getChild('Body').children]
+    escaped = [sax.encoder.encode(t) for t in texts]
+    print('leaves: %d' % leaves)
+    for name, encoder in (('former', Former()), ('current', Encoder())):
+        sax.encoder = encoder
+        print('%-8s plain(): %.3fs  str(): %.3fs  encode: %.3fs  decode: %.3fs' % (
+            name,
+            best(env.plain),
+            best(env.str),
+            best(lambda: [encoder.encode(t) for t in texts]),
+            best(lambda: [encoder.decode(t) for t in escaped])))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
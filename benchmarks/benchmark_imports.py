@@ -0,0 +1,66 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Import download benchmark.
+Loads a WSDL importing a synthetic tree of schemas from a local http
+stub (with latency) downloading the imports one at a time and on
+a (bounded) pool of threads.
+Usage: python benchmark_imports.py [fanout] [depth] [latency(ms)] [threads]
+"""
+
+import sys
+import time
+
+sys.path.insert(0, '../')
+
+from suds.client import Client
+from tests import Server, wsdl, xsd
+
+def documents(fanout, depth):
+    result = {}
+
+    def imports(name, level):
+        if level == depth:
+            return []
+        children = ['%s_%d' % (name, n) for n in range(fanout)]
+        for child in children:
+            result['/%s.xsd' % child] = xsd(child, 't' + child, imports=imports(child, level + 1))
+        return [(c, '%s.xsd' % c) for c in children]
+
+    result['/root.wsdl'] = wsdl(0, imports=imports('s', 0))
+    return result
+
+
+def main(fanout=3, depth=3, latency=20, threads=8):
+    server = Server(documents=documents(fanout, depth), latency=latency / 1000.0)
+    print('documents: %d  latency: %dms' % (len(server.documents), latency))
+    try:
+        for n, prefetch in enumerate((0, threads)):
+            # imported schemas are cached (globally) by url.
+            for name, document in list(server.documents.items()):
+                server.documents['/%d%s' % (n, name)] = document
+            url = server.url('/%d/root.wsdl' % n)
+            started = time.time()
+            client = Client(url, cache=None, prefetch=prefetch)
+            elapsed = time.time() - started
+            print('prefetch=%d: %.3fs (%d types)' % (
+                prefetch, elapsed, len(client.wsdl.schema.types)))
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
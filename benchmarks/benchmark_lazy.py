@@ -0,0 +1,97 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Lazy schema benchmark.
+Creates a client for a WSDL with many (derived) types of which one is
+used by the operation with the schema built eagerly and lazily: the
+load time, the (traced) memory peak and the time of the first call.
+Usage: python benchmark_lazy.py [types] [fields]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, '../')
+
+from suds.client import Client
+from benchmark_wide import WSDL, FIELD
+
+BASE = """      <xs:complexType name="type%d">
+        <xs:sequence>
+%s
+        </xs:sequence>
+      </xs:complexType>"""
+
+DERIVED = """      <xs:complexType name="type%d">
+        <xs:complexContent>
+          <xs:extension base="tns:type%d">
+            <xs:sequence>
+%s
+            </xs:sequence>
+          </xs:extension>
+        </xs:complexContent>
+      </xs:complexType>"""
+
+
+def wsdl(types, fields):
+    result = []
+    for t in range(types):
+        lines = [FIELD % (n, 'xs:string') for n in range(t * fields, (t + 1) * fields)]
+        if t % 10:
+            result.append(DERIVED % (t, t - 1, '\n'.join(lines)))
+        else:
+            result.append(BASE % (t, '\n'.join(lines)))
+    fields = [FIELD % (0, 'tns:type%d' % 5)]
+    document = WSDL % dict(fields='\n'.join(fields))
+    return document.replace('</xs:schema>', '\n'.join(result) + '\n</xs:schema>', 1)
+
+
+def run(url, lazy):
+    tracemalloc.start()
+    started = time.time()
+    client = Client(url, cache=None, nosend=True, lazy=lazy)
+    loaded = time.time() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    started = time.time()
+    wide = client.factory.create('wide')
+    wide.field0 = client.factory.create('type5')
+    client.service.wideList(count=1)
+    called = time.time() - started
+    return (loaded, peak, called)
+
+
+def main(types=2000, fields=5):
+    tmp = tempfile.mkdtemp()
+    try:
+        print('types: %d  fields: %d' % (types, fields))
+        for lazy in (False, True):
+            path = os.path.join(tmp, '%s.wsdl' % lazy)
+            with open(path, 'w') as fp:
+                fp.write(wsdl(types, fields))
+            loaded, peak, called = run('file://' + path, lazy)
+            print('%-5s: load %.3fs  peak %.1f MB  first call %.3fs' % (
+                lazy and 'lazy' or 'eager', loaded, peak / 1048576.0, called))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
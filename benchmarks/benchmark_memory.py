@@ -0,0 +1,91 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Element tree memory (bytes per node) benchmark.
+Parses a large synthetic reply and reports the memory retained by
+the tree and the peak while parsing.
+Usage: python benchmark_memory.py [ducks]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+sys.path.insert(0, '../')
+
+from suds.sax.parser import Parser
+
+HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+   xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+   <soap:Body>
+      <ns2:duckListResponse xmlns:ns2="http://example.com/duck/">"""
+
+DUCK = """
+         <ns2:return id="%d" xsi:type="ns2:duck">
+            <ns2:name>duck %d</ns2:name>
+            <ns2:age>%d</ns2:age>
+            <ns2:info><ns2:key>color</ns2:key><ns2:value>yellow</ns2:value></ns2:info>
+            <ns2:info xsi:nil="true"/>
+         </ns2:return>"""
+
+TAIL = """
+      </ns2:duckListResponse>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+def document(ducks):
+    body = ''.join([DUCK % (n, n, n % 20) for n in range(ducks)])
+    return (HEAD + body + TAIL).encode('utf-8')
+
+
+def count(node):
+    elements = 1
+    attributes = len(node.attributes)
+    for child in node.children:
+        e, a = count(child)
+        elements += e
+        attributes += a
+    return elements, attributes
+
+
+def main(ducks=20000):
+    xml = document(ducks)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = Parser().parse(string=xml).root()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elements, attributes = count(root)
+    retained -= before
+    peak -= before
+    print('document : %.1f MB' % (len(xml) / 1000000.0))
+    print('elements : %d' % elements)
+    print('attributes: %d' % attributes)
+    print('retained : %.1f MB (%d bytes/element)' % (
+        retained / 1000000.0, retained // elements))
+    print('peak     : %.1f MB (%d bytes/element)' % (
+        peak / 1000000.0, peak // elements))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
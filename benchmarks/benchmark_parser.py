@@ -0,0 +1,82 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Parser backend throughput (MB/s) benchmark.
+Usage: python benchmark_parser.py [megabytes]
+"""
+
+import sys
+import time
+
+sys.path.insert(0, '../')
+
+from suds.sax import parser
+from suds.sax.parser import Parser
+
+HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+   xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+   <soap:Body>
+      <ns2:duckListResponse xmlns:ns2="http://example.com/duck/">"""
+
+DUCK = """
+         <ns2:return id="%d" xsi:type="ns2:duck">
+            <ns2:info><ns2:key>name</ns2:key><ns2:value>duck &amp; %d</ns2:value></ns2:info>
+            <ns2:info xsi:nil="true"/>
+         </ns2:return>"""
+
+TAIL = """
+      </ns2:duckListResponse>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+def document(megabytes):
+    ducks = []
+    size = 0
+    n = 0
+    while size < megabytes * 1000000:
+        duck = DUCK % (n, n)
+        ducks.append(duck)
+        size += len(duck)
+        n += 1
+    return (HEAD + ''.join(ducks) + TAIL).encode('utf-8')
+
+
+def main(megabytes=10):
+    xml = document(megabytes)
+    mb = len(xml) / 1000000.0
+    print('document: %.1f MB' % mb)
+    for backend in sorted(Parser.backends):
+        if backend == 'lxml' and parser.etree is None:
+            print('%-6s: lxml not installed' % backend)
+            continue
+        best = None
+        for n in range(3):
+            started = time.time()
+            Parser(backend).parse(string=xml)
+            elapsed = time.time() - started
+            if best is None or elapsed < best:
+                best = elapsed
+        print('%-6s: %6.2f MB/s (%.2fs)' % (backend, mb / best, best))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(float(sys.argv[1]))
+    else:
+        main()
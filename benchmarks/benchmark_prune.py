@@ -0,0 +1,69 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Pruned WSDL benchmark.
+Loads a WSDL of (many) operations each with its own types whole and
+pruned down to a few operations (see the I{operations} option) and
+compares the size of the pickled definitions (the object cache entry)
+and the time to unpickle them.
+Usage: python benchmark_prune.py [operations] [used]
+"""
+
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '../')
+
+from suds.client import Client
+from tests import wsdl
+
+def best(fn):
+    result = None
+    for n in range(3):
+        started = time.time()
+        fn()
+        elapsed = time.time() - started
+        if result is None or elapsed < result:
+            result = elapsed
+    return result
+
+
+def main(operations=500, used=5):
+    fd, path = tempfile.mkstemp(suffix='.wsdl')
+    with os.fdopen(fd, 'w') as fp:
+        fp.write(wsdl(operations))
+    url = 'file://' + path
+    try:
+        print('operations: %d  used: %d' % (operations, used))
+        for label, kwargs in (('whole ', {}), ('pruned', dict(operations=['op%d' % n for n in range(used)]))):
+            started = time.time()
+            client = Client(url, cache=None, **kwargs)
+            loaded = time.time() - started
+            pickled = pickle.dumps(client.wsdl, pickle.HIGHEST_PROTOCOL)
+            unpickled = best(lambda: pickle.loads(pickled))
+            print('%s: load %.3fs  pickled %8d bytes  unpickle %.3fs' % (label, loaded, len(pickled), unpickled))
+            client = pickled = None
+            gc.collect()
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
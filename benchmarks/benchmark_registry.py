@@ -0,0 +1,70 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Shared WSDL registry benchmark.
+Creates clients for the same WSDL with and without the I{shared}
+option and reports the time and the memory held by the clients.
+Usage: python benchmark_registry.py [clients] [types]
+"""
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, '../')
+
+from suds.cache import ObjectCache
+from suds.client import Client
+from benchmark_startup import wsdl
+
+
+def create(url, clients, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    started = time.time()
+    result = [Client(url, **kwargs) for n in range(clients)]
+    elapsed = time.time() - started
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, held
+
+
+def main(clients=20, types=200):
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'types.wsdl')
+        with open(path, 'w') as fp:
+            fp.write(wsdl(types, 20))
+        url = 'file://' + path
+        cache = ObjectCache(os.path.join(tmp, 'cache'), days=1)
+        Client(url, cache=cache, cachingpolicy=1)
+        print('clients: %d  types: %d' % (clients, types))
+        for name, kwargs in (
+                ('cached', dict(cache=cache, cachingpolicy=1)),
+                ('shared', dict(cache=cache, cachingpolicy=1, shared=True))):
+            result, elapsed, held = create(url, clients, **kwargs)
+            print('%s: %.3fs  %.1f MB' % (name, elapsed, held / 1000000.0))
+            del result
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,112 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Client startup benchmark.
+Creates a client for a WSDL with many (wide) types: parsed, from the
+(pickled) object cache and from a compiled service bundle; each in a
+fresh (cold) process.
+Usage: python benchmark_startup.py [types] [fields]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, '../')
+
+from suds.cache import ObjectCache
+from suds.client import Client
+from suds.compile import compile
+from benchmark_wide import WSDL, FIELD
+
+TYPE = """      <xs:complexType name="type%d">
+        <xs:sequence>
+%s
+        </xs:sequence>
+      </xs:complexType>"""
+
+STARTUP = """
+import sys, time
+sys.path.insert(0, '../')
+from suds.client import Client
+from suds.cache import ObjectCache
+started = time.time()
+%s
+client.factory.create('type0')
+sys.stdout.write('%%.3f' %% (time.time() - started))
+"""
+
+PARSED = "client = Client(%r, cache=None)"
+
+DOCUMENTS = "client = Client(%r, cache=ObjectCache(%r, days=1))"
+
+CACHED = "client = Client(%r, cache=ObjectCache(%r, days=1), cachingpolicy=1)"
+
+BUNDLE = "client = Client.from_bundle(%r)"
+
+
+def best(code):
+    result = None
+    for n in range(3):
+        out = subprocess.check_output([sys.executable, '-c', STARTUP % code])
+        elapsed = float(out)
+        if result is None or elapsed < result:
+            result = elapsed
+    return result
+
+
+def wsdl(types, fields):
+    result = []
+    for t in range(types):
+        lines = []
+        for n in range(fields):
+            if t and n == 0:
+                lines.append(FIELD % (n, 'tns:type%d' % (t - 1)))
+            else:
+                lines.append(FIELD % (n, 'xs:string'))
+        result.append(TYPE % (t, '\n'.join(lines)))
+    fields = [FIELD % (0, 'tns:type%d' % (types - 1))]
+    document = WSDL % dict(fields='\n'.join(fields))
+    return document.replace('</xs:schema>', '\n'.join(result) + '\n</xs:schema>', 1)
+
+
+def main(types=500, fields=20):
+    tmp = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp, 'types.wsdl')
+        with open(path, 'w') as fp:
+            fp.write(wsdl(types, fields))
+        url = 'file://' + path
+        documents = os.path.join(tmp, 'documents')
+        Client(url, cache=ObjectCache(documents, days=1))
+        cache = os.path.join(tmp, 'cache')
+        Client(url, cache=ObjectCache(cache, days=1), cachingpolicy=1)
+        bundle = os.path.join(tmp, 'types.bundle')
+        compile(url, bundle)
+        print('types: %d  fields: %d  bundle: %d bytes' % (
+            types, fields, os.path.getsize(bundle)))
+        print('parsed   : %.3fs' % best(PARSED % url))
+        print('documents: %.3fs' % best(DOCUMENTS % (url, documents)))
+        print('cached   : %.3fs' % best(CACHED % (url, cache)))
+        print('bundle   : %.3fs' % best(BUNDLE % bundle))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,165 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Wide complex type benchmark.
+Creates (factory) objects having (200+) fields and unmarshals a reply
+of them using the (name) indexed child lookup and the former linear
+scan.
+Usage: python benchmark_wide.py [fields] [objects]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '../')
+
+from suds.client import Client
+from suds.xsd.sxbase import SchemaObject
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions name="WideService" targetNamespace="http://example.com/wide/"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="http://example.com/wide/">
+  <wsdl:types>
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        elementFormDefault="qualified" targetNamespace="http://example.com/wide/">
+      <xs:element name="wideList" type="tns:wideList"/>
+      <xs:element name="wideListResponse" type="tns:wideListResponse"/>
+      <xs:complexType name="wideList">
+        <xs:sequence>
+          <xs:element name="count" type="xs:int"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="wideListResponse">
+        <xs:sequence>
+          <xs:element maxOccurs="unbounded" name="return" type="tns:wide"/>
+        </xs:sequence>
+      </xs:complexType>
+      <xs:complexType name="wide">
+        <xs:sequence>
+%(fields)s
+        </xs:sequence>
+      </xs:complexType>
+    </xs:schema>
+  </wsdl:types>
+  <wsdl:message name="wideList">
+    <wsdl:part name="parameters" element="tns:wideList"/>
+  </wsdl:message>
+  <wsdl:message name="wideListResponse">
+    <wsdl:part name="parameters" element="tns:wideListResponse"/>
+  </wsdl:message>
+  <wsdl:portType name="Wide">
+    <wsdl:operation name="wideList">
+      <wsdl:input message="tns:wideList"/>
+      <wsdl:output message="tns:wideListResponse"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="WideBinding" type="tns:Wide">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="wideList">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="WideService">
+    <wsdl:port name="WidePort" binding="tns:WideBinding">
+      <soap:address location="http://localhost/wide"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+FIELD = '          <xs:element name="field%d" type="%s" minOccurs="0"/>'
+
+TYPES = ('xs:string', 'xs:int', 'xs:boolean', 'xs:dateTime')
+
+VALUES = ('value', '42', 'true', '2016-01-01T12:00:00')
+
+
+def wsdl(fields):
+    lines = [FIELD % (n, TYPES[n % len(TYPES)]) for n in range(fields)]
+    return WSDL % dict(fields='\n'.join(lines))
+
+
+def reply(fields, objects):
+    item = ''.join(['<ns:field%d>%s</ns:field%d>' % (n, VALUES[n % len(VALUES)], n)
+                    for n in range(fields)])
+    items = ''.join(['<ns:return>%s</ns:return>' % item] * objects)
+    return ('<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+            '<soap:Body><ns:wideListResponse xmlns:ns="http://example.com/wide/">'
+            '%s</ns:wideListResponse></soap:Body></soap:Envelope>' % items)
+
+
+def linear(self, name):
+    """
+    The former get_child(): scan the flattened children.
+    """
+    for child, ancestry in self.children():
+        if child.any() or child.name == name:
+            return (child, ancestry)
+    return (None, [])
+
+
+def best(fn):
+    result = None
+    for n in range(3):
+        started = time.time()
+        fn()
+        elapsed = time.time() - started
+        if result is None or elapsed < result:
+            result = elapsed
+    return result
+
+
+def client(fields):
+    fd, path = tempfile.mkstemp(suffix='.wsdl')
+    with os.fdopen(fd, 'w') as fp:
+        fp.write(wsdl(fields))
+    try:
+        return Client('file://' + path, cache=None)
+    finally:
+        os.remove(path)
+
+
+def main(fields=250, objects=200):
+    c = client(fields)
+    xml = reply(fields, objects)
+
+    def call():
+        result = c.service.wideList(count=objects, __inject={'reply': xml})
+        assert len(result) == objects
+
+    def create():
+        for n in range(objects):
+            c.factory.create('wide')
+
+    print('fields: %d  objects: %d' % (fields, objects))
+    print('create : %.3fs' % best(create))
+    print('indexed: %.3fs' % best(call))
+    indexed = SchemaObject.get_child
+    SchemaObject.get_child = linear
+    try:
+        print('linear : %.3fs' % best(call))
+    finally:
+        SchemaObject.get_child = indexed
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -30,5 +30,9 @@ setup(
     install_requires=[
         "six"
     ],
+    extras_require={
+        "lxml": ["lxml"],
+        "test": ["lxml"],
+    },
     url="https://github.com/xRodney/suds-sw",
 )
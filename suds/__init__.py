@@ -106,6 +106,18 @@ class WebFault(Exception):
         self.document = document
 
 
+class UnstreamableReply(Exception):
+    msg = \
+        """
+        The reply of method (%s) cannot be iterated while it is parsed.
+        Reason: %s
+        Retry without the iterreply option.
+        """
+
+    def __init__(self, name, reason):
+        Exception.__init__(self, self.msg % (name, reason))
+
+
 #
 # Logging
 #
@@ -185,3 +197,4 @@ def objid(obj):
 
 
 import suds.client
+from suds.registry import preload
@@ -0,0 +1,249 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+The I{asyncclient} module provides a suds client whose service
+methods are awaitable (asyncio).  Requires python 3.
+"""
+
+import asyncio
+from copy import deepcopy
+from inspect import isawaitable
+from logging import getLogger
+
+from suds import WebFault, metrics
+from suds.client import Client, Method, SoapClient, ServiceSelector, \
+    RequestContext, Messages
+from suds.options import Options
+from suds.properties import Unskin
+from suds.transport import TransportError
+from suds.transport.asynchttp import AsyncHttpTransport
+
+log = getLogger(__name__)
+
+
+class AsyncClient(Client):
+    """
+    A suds client whose service methods return awaitables, for fanning out
+    many concurrent calls from one event loop.  The WSDL is loaded (once)
+    by the synchronous transport; service methods are sent by the
+    asynchronous transport.
+        >>> client = AsyncClient(url)
+        >>> result = await client.service.hello('world')
+    @ivar asynctransport: The transport used to invoke methods.
+    @type asynctransport: L{suds.transport.asynchttp.AsyncTransport}
+    """
+
+    @classmethod
+    def from_client(cls, client, asynctransport=None):
+        """
+        Create an async client sharing the WSDL (Definitions) and factory
+        of an already constructed client.  The options are copied.
+        @param client: A suds client.
+        @type client: L{Client}
+        @param asynctransport: The transport used to invoke methods.
+        @type asynctransport: L{suds.transport.asynchttp.AsyncTransport}
+        @return: An async client.
+        @rtype: L{AsyncClient}
+        """
+        class Uninitialized(cls):
+            def __init__(self):
+                pass
+        result = Uninitialized()
+        result.options = Options()
+        cp = Unskin(result.options)
+        mp = Unskin(client.options)
+        cp.update(deepcopy(mp))
+        result.wsdl = client.wsdl
+        result.factory = client.factory
+        result.service = ServiceSelector(result, client.wsdl.services)
+        result.sd = client.sd
+        result.messages = Messages()
+        result.asynctransport = result.mktransport(asynctransport)
+        return result
+
+    def __init__(self, url, asynctransport=None, **kwargs):
+        """
+        @param url: The URL for the WSDL.
+        @type url: str
+        @param asynctransport: The transport used to invoke methods.
+            Defaults to an L{AsyncHttpTransport} sharing the options of
+            the (synchronous) transport.
+        @type asynctransport: L{suds.transport.asynchttp.AsyncTransport}
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        """
+        Client.__init__(self, url, **kwargs)
+        self.asynctransport = self.mktransport(asynctransport)
+
+    def mktransport(self, asynctransport):
+        """
+        Get the async transport.  The default transport shares the
+        (transport) options of the synchronous transport so that
+        I{timeout}, I{proxy}, I{headers} and credentials set on the
+        client apply to both.
+        @param asynctransport: A user specified transport or None.
+        @type asynctransport: L{suds.transport.asynchttp.AsyncTransport}
+        @rtype: L{suds.transport.asynchttp.AsyncTransport}
+        """
+        if asynctransport is None:
+            asynctransport = AsyncHttpTransport()
+            asynctransport.options = self.options.transport.options
+        return asynctransport
+
+    @property
+    def methodclass(self):
+        return AsyncMethod
+
+    def clone(self):
+        clone = Client.clone(self)
+        clone.asynctransport = self.mktransport(None)
+        return clone
+
+    async def close(self):
+        """
+        Release the connections held by the async transport.
+        """
+        await self.asynctransport.close()
+
+
+class AsyncMethod(Method):
+    """
+    The I{method} (namespace) object whose invocation is awaitable.
+    """
+
+    async def __call__(self, *args, **kwargs):
+        """
+        Invoke the method.
+        """
+        clientclass = self.clientclass(kwargs)
+        client = clientclass(self.client, self.get_method(*args, **kwargs))
+        try:
+            result = client.invoke(args, kwargs)
+            if isawaitable(result):
+                result = await result
+            return result
+        except WebFault as e:
+            if self.faults():
+                raise
+            return (500, e)
+
+    async def map(self, iterable, workers=8):
+        """
+        Invoke the method for each item in I{iterable}, with no more than
+        I{workers} calls in flight, and get the results in order.
+        A failing item does not abort the batch; the raised exception
+        is returned in place of its result.
+        @param iterable: The arguments of each call: a I{dict} of
+            keyword arguments or a I{list} of positional arguments.
+        @type iterable: iterable
+        @param workers: The maximum number of concurrent calls.
+        @type workers: int
+        @return: The results (or exceptions) in the order of I{iterable}.
+        @rtype: list
+        """
+        semaphore = asyncio.Semaphore(workers)
+        calls = [self.__invoke(semaphore, n, item)
+                 for n, item in enumerate(iterable)]
+        return [result for index, result in await asyncio.gather(*calls)]
+
+    async def imap_unordered(self, iterable, workers=8):
+        """
+        Invoke the method for each item in I{iterable}, with no more than
+        I{workers} calls in flight, and yield the results as they complete.
+        @param iterable: The arguments of each call: a I{dict} of
+            keyword arguments or a I{list} of positional arguments.
+        @type iterable: iterable
+        @param workers: The maximum number of concurrent calls.
+        @type workers: int
+        @return: An async generator of (index, result) where the I{index}
+            is the position of the item in I{iterable}.
+        """
+        semaphore = asyncio.Semaphore(workers)
+        calls = [self.__invoke(semaphore, n, item)
+                 for n, item in enumerate(iterable)]
+        for call in asyncio.as_completed(calls):
+            yield await call
+
+    async def __invoke(self, semaphore, index, item):
+        async with semaphore:
+            try:
+                if isinstance(item, dict):
+                    return (index, await self(**item))
+                else:
+                    return (index, await self(*item))
+            except Exception as e:
+                log.debug('batch item %d failed: %s', index, e)
+                return (index, e)
+
+    def clientclass(self, kwargs):
+        clientclass = Method.clientclass(self, kwargs)
+        if clientclass is SoapClient:
+            return AsyncSoapClient
+        else:
+            return clientclass
+
+
+class AsyncSoapClient(SoapClient):
+    """
+    A lightweight soap based web client sending the message using
+    the (client's) async transport B{**not intended for external use}
+    """
+
+    async def invoke(self, args, kwargs):
+        """
+        Send the required soap message to invoke the specified method
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The result of the method invocation.
+        @rtype: I{builtin}|I{subclass of} L{Object}
+        """
+        binding = self.method.binding.input
+        soapenv = binding.get_message(self.method, args, kwargs)
+        return await self.send(soapenv)
+
+    async def send(self, soapenv):
+        """
+        Send soap message.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: The reply to the sent message.
+        @rtype: I{builtin} or I{subclass of} L{Object}
+        """
+        result = None
+        binding = self.method.binding.input
+        transport = self.client.asynctransport
+        timer = metrics.Timer()
+        try:
+            request = self.prepare(soapenv)
+            if isinstance(request, RequestContext):
+                return request
+            timer.start()
+            reply = await transport.send(request)
+            timer.stop()
+            metrics.log.debug('waited %s on server reply', timer)
+            result = self.received(binding, reply)
+        except TransportError as e:
+            if e.fp is None:
+                # A connection failure: there is no http reply to process.
+                raise
+            if e.httpcode in (202, 204):
+                result = None
+            else:
+                log.error(self.last_sent())
+                result = self.failed(binding, e)
+        return result
@@ -18,14 +18,18 @@
 Provides classes for (WS) SOAP bindings.
 """
 
+from collections import OrderedDict
 from copy import deepcopy
+from io import BytesIO
 from logging import getLogger
+from threading import Lock
 
-from suds import WebFault, TypeNotFound
+from suds import WebFault, TypeNotFound, UnstreamableReply
 from suds.bindings.multiref import MultiRef
 from suds.mx import Content
 from suds.mx.literal import Literal as MxLiteral
-from suds.plugin import PluginContainer
+from suds.mx.template import Template, Uncompilable, shape, mark
+from suds.plugin import PluginContainer, MessagePlugin
 from suds.sax import Namespace
 from suds.sax.document import Document
 from suds.sax.element import Element
@@ -33,8 +37,10 @@ from suds.sax.parser import Parser
 from suds.sudsobject import Factory
 from suds.umx.basic import Basic as UmxBasic
 from suds.umx.typed import Typed as UmxTyped
+from suds.umx.stream import StreamHandler, Reply, Unstreamable
 from suds.xsd.query import TypeQuery, ElementQuery
 from suds.xsd.sxbasic import Element as SchemaElement
+import six
 
 log = getLogger(__name__)
 
@@ -47,23 +53,42 @@ class Binding(object):
     soap messages per the WSDL port binding.
     @cvar replyfilter: The reply filter function.
     @type replyfilter: (lambda s,r: r)
+    @cvar compilable: Whether messages may be I{compiled} into templates.
+    @type compilable: bool
+    @cvar streamable: Whether replies may be unmarshalled while parsed.
+    @type streamable: bool
+    @cvar capacity: The number of compiled message templates kept (the
+        least recently used are discarded).
+    @type capacity: int
     @ivar wsdl: The wsdl.
     @type wsdl: L{suds.wsdl.Definitions}
     @ivar schema: The collective schema contained within the wsdl.
     @type schema: L{xsd.schema.Schema}
     @ivar options: A dictionary options.
     @type options: L{Options}
+    @ivar templates: The compiled message templates (least recently
+        used first): {key: L{Template}}
+    @type templates: I{OrderedDict}
+    @ivar lock: Guards the I{templates}.
+    @type lock: I{threading.Lock}
     """
 
     replyfilter = (lambda s, r: r)
 
+    compilable = True
+
+    streamable = True
+
+    capacity = 64
+
     def __init__(self, wsdl):
         """
         @param wsdl: A wsdl.
         @type wsdl: L{wsdl.Definitions}
         """
         self.wsdl = wsdl
-        self.multiref = MultiRef()
+        self.templates = OrderedDict()
+        self.lock = Lock()
 
     def schema(self):
         return self.wsdl.schema
@@ -114,7 +139,105 @@ class Binding(object):
         @return: The soap envelope.
         @rtype: L{Document}
         """
-
+        options = self.options()
+        if options.compiledmessages and self.compilable:
+            if not (options.wsse or options.soapheaders):
+                message = self.compiled_message(method, args, kwargs)
+                if message is not None:
+                    return message
+        return self.build_message(method, args, kwargs)
+
+    def compiled_message(self, method, args, kwargs):
+        """
+        Get the soap message for the specified method and args rendered
+        from a compiled template.  A template is compiled (once) for each
+        method and I{shape} of the arguments by marshalling the arguments
+        with the leaf values replaced by markers.  The (least recently
+        used) templates beyond the I{capacity} are discarded.  The
+        templates are looked up and compiled under the I{lock} so that
+        the threads (and clients) sharing the binding compile each once.
+        @param method: The method being invoked.
+        @type method: I{service.Method}
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The soap envelope or None when the message (arguments)
+            cannot be compiled.
+        @rtype: L{suds.mx.template.Message}
+        """
+        options = self.options()
+        values = []
+        try:
+            key = (
+                id(method),
+                options.prettyxml,
+                options.prefixes,
+                options.xstq,
+                shape(tuple(args), values),
+                shape(kwargs, values))
+        except Uncompilable as e:
+            log.debug('message not compiled: %s', e)
+            return None
+        with self.lock:
+            templates = self.templates
+            template = templates.pop(key, None)
+            if template is None:
+                template = self.compile_message(method, args, kwargs)
+            templates[key] = template
+            while len(templates) > self.capacity:
+                templates.popitem(last=False)
+        if template is Uncompilable:
+            return None
+        try:
+            return template.render(values, options.parser)
+        except Uncompilable as e:
+            log.debug('message not rendered: %s', e)
+            return None
+
+    def compile_message(self, method, args, kwargs):
+        """
+        Compile the message template for the specified method and args.
+        @param method: The method being invoked.
+        @type method: I{service.Method}
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The template or L{Uncompilable} when the message
+            cannot be compiled.
+        @rtype: L{Template}
+        """
+        slots = []
+        args = mark(tuple(args), slots)
+        kwargs = mark(kwargs, slots)
+        document = self.build_message(method, args, kwargs)
+        pretty = self.options().prettyxml
+        if pretty:
+            text = document.str()
+        else:
+            text = document.plain()
+        try:
+            template = Template.compile(text, slots, pretty)
+            log.debug('message compiled (%d slots)', len(slots))
+            return template
+        except Uncompilable as e:
+            log.debug('message not compiled: %s', e)
+            return Uncompilable
+
+    def build_message(self, method, args, kwargs):
+        """
+        Build the soap message for the specified method, args and
+        soapheaders by marshalling the arguments.
+        @param method: The method being invoked.
+        @type method: I{service.Method}
+        @param args: A list of args for the method invoked.
+        @type args: list
+        @param kwargs: Named (keyword) args for the method invoked.
+        @type kwargs: dict
+        @return: The soap envelope.
+        @rtype: L{Document}
+        """
         content = self.headercontent(method)
         header = self.header(content)
         content = self.bodycontent(method, args, kwargs)
@@ -141,7 +264,12 @@ class Binding(object):
         @rtype: tuple ( L{Element}, L{Object} )
         """
         reply = self.replyfilter(reply)
-        sax = Parser()
+        if self.options().streaming and self.streaming('parsed'):
+            try:
+                return self.stream_reply(method, reply)
+            except Unstreamable as e:
+                log.debug('reply not streamed: %s', e)
+        sax = Parser(self.options().parser)
         replyroot = sax.parse(string=reply)
         plugins = PluginContainer(self.options().plugins)
         plugins.message.parsed(reply=replyroot)
@@ -149,7 +277,7 @@ class Binding(object):
         soapenv.promotePrefixes()
         soapbody = soapenv.getChild('Body')
         self.detect_fault(soapbody)
-        soapbody = self.multiref.process(soapbody)
+        soapbody = MultiRef().process(soapbody)
         nodes = self.replycontent(method, soapbody)
         rtypes = self.returned_types(method)
         if len(rtypes) > 1:
@@ -166,6 +294,136 @@ class Binding(object):
                 return (replyroot, result)
         return (replyroot, None)
 
+    def streaming(self, *hooks):
+        """
+        Get whether replies may be unmarshalled while parsed.
+        Requires that no plugin implements the specified (message) hooks
+        which need the (full) reply.
+        @param hooks: The names of message plugin hooks.
+        @type hooks: [str,..]
+        @rtype: bool
+        """
+        if not self.streamable:
+            return False
+        for plugin in self.options().plugins:
+            if not isinstance(plugin, MessagePlugin):
+                continue
+            for hook in hooks:
+                if getattr(plugin.__class__, hook) is not getattr(MessagePlugin, hook):
+                    return False
+        return True
+
+    def iterable(self, method):
+        """
+        Get whether the reply for the I{method} is to be returned as an
+        iterator (generator) of the unmarshalled items.  Requires the
+        I{iterreply} option and a method returning an (unbounded) list.
+        Not with the I{retxml} option or plugins implementing the
+        I{received}, I{parsed} or I{unmarshalled} hooks which need the
+        (whole) reply.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @rtype: bool
+        """
+        options = self.options()
+        if not options.iterreply or options.retxml:
+            return False
+        rtypes = self.returned_types(method)
+        if len(rtypes) != 1 or not rtypes[0].unbounded():
+            return False
+        return self.streaming('received', 'parsed', 'unmarshalled')
+
+    def get_items(self, method, reply, received=None, chunksize=65536):
+        """
+        Process the I{reply} for the specified I{method} by unmarshalling
+        the reply (list) items while incrementally sax parsing the reply.
+        Each item is yielded as soon as its element has been parsed.
+        @param method: The name of the invoked method.
+        @type method: str
+        @param reply: The reply XML or an input stream (file-like) of it.
+            The stream is closed when done.
+        @type reply: (str|stream)
+        @param received: An (optional) callback passed the reply
+            document (envelope, header, body and fault) when parsed.
+        @type received: callable
+        @param chunksize: The (maximum) number of bytes read (and parsed)
+            at once.  Bytes already received are parsed without waiting
+            for a full chunk.
+        @type chunksize: int
+        @return: A generator of the unmarshalled items.
+        @raise WebFault: When the reply contains a fault.
+        @raise UnstreamableReply: When an item is a multiref (href) or
+            has mixed content.  The items before it have been yielded.
+        """
+        if isinstance(reply, six.text_type):
+            reply = reply.encode('utf-8')
+        if isinstance(reply, six.binary_type):
+            reply = BytesIO(reply)
+        collector = Reply(self.returned_types(method))
+        handler = StreamHandler(
+            self.unmarshaller(), collector, self.replydepth(method))
+        sax = Parser(self.options().parser).open(handler)
+        read = getattr(reply, 'read1', reply.read)
+        try:
+            while True:
+                chunk = read(chunksize)
+                if not chunk:
+                    break
+                sax.feed(chunk)
+                items = collector.items
+                collector.items = []
+                for item in items:
+                    yield item
+            sax.close()
+        except Unstreamable as e:
+            for item in collector.items:
+                yield item
+            raise UnstreamableReply(method.name, e)
+        finally:
+            reply.close()
+        replyroot = handler.nodes[0]
+        soapenv = replyroot.getChild('Envelope')
+        soapenv.promotePrefixes()
+        if received is not None:
+            received(replyroot)
+        self.detect_fault(soapenv.getChild('Body'))
+
+    def stream_reply(self, method, reply):
+        """
+        Process the I{reply} for the specified I{method} by unmarshalling
+        the reply content nodes while sax parsing.  No element tree is
+        built for the content nodes so the returned reply document
+        contains only the envelope, header, body (and fault).
+        @param method: The name of the invoked method.
+        @type method: str
+        @param reply: The reply XML received after invoking the specified method.
+        @type reply: str
+        @return: The unmarshalled reply.
+        @rtype: tuple ( L{Element}, L{Object} )
+        @raise Unstreamable: When the reply cannot be streamed.
+        """
+        collector = Reply(self.returned_types(method))
+        handler = StreamHandler(
+            self.unmarshaller(), collector, self.replydepth(method))
+        sax = Parser(self.options().parser)
+        replyroot = sax.parse(string=reply, handler=handler)
+        soapenv = replyroot.getChild('Envelope')
+        soapenv.promotePrefixes()
+        soapbody = soapenv.getChild('Body')
+        self.detect_fault(soapbody)
+        return (replyroot, collector.result())
+
+    def replydepth(self, method):
+        """
+        Get the number of (wrapper) elements between the soap body
+        and the reply content nodes.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The number of wrapper elements.
+        @rtype: int
+        """
+        raise Exception('not implemented')
+
     def detect_fault(self, body):
         """
         Detect I{hidden} soapenv:Fault element in the soap body.
@@ -189,13 +447,13 @@ class Binding(object):
         @type message: str
         @return: Tuple of the raw parsed message and soap body
         """
-        sax = Parser()
+        sax = Parser(self.options().parser)
         messageroot = sax.parse(string=message)
         soapenv = messageroot.getChild('Envelope')
         soapenv.promotePrefixes()
         soapbody = soapenv.getChild('Body')
         self.detect_fault(soapbody)
-        self.multiref.process(soapbody)
+        MultiRef().process(soapbody)
         return messageroot, soapbody
 
     def parse_message(self, method, messageroot, soapbody=None, input=False):
@@ -332,7 +590,7 @@ class Binding(object):
         @rtype: tuple ( L{Element}, L{Object} )
         """
         reply = self.replyfilter(reply)
-        sax = Parser()
+        sax = Parser(self.options().parser)
         faultroot = sax.parse(string=reply)
         soapenv = faultroot.getChild('Envelope')
         soapbody = soapenv.getChild('Body')
@@ -505,6 +763,11 @@ class Binding(object):
         @return:  A list of parameter definitions
         @rtype: [I{pdef},]
         """
+        prepared = self.prepared(method)
+        key = ('bodypart_types', input)
+        result = prepared.get(key)
+        if result is not None:
+            return result
         result = []
         if input:
             parts = method.soap.input.body.parts
@@ -527,6 +790,7 @@ class Binding(object):
                     result.append((pt.name, pt))
             else:
                 result.append(pt)
+        prepared[key] = result
         return result
 
     def headpart_types(self, method, input=True):
@@ -540,6 +804,11 @@ class Binding(object):
         @return:  A list of parameter definitions
         @rtype: [I{pdef},]
         """
+        prepared = self.prepared(method)
+        key = ('headpart_types', input)
+        result = prepared.get(key)
+        if result is not None:
+            return result
         result = []
         if input:
             headers = method.soap.input.headers
@@ -563,8 +832,37 @@ class Binding(object):
                     result.append((pt.name, pt))
             else:
                 result.append(pt)
+        prepared[key] = result
         return result
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['templates']
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.templates = OrderedDict()
+        self.lock = Lock()
+
+    def prepared(self, method):
+        """
+        Get the I{prepared} message definitions of the method.  The part
+        types and parameter definitions depend only on the WSDL so they
+        are looked up once per method (rather than per call) and memoized
+        on the method.  The returned lists must not be modified.
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The prepared definitions: {key: value}
+        @rtype: dict
+        """
+        prepared = getattr(method, 'prepared', None)
+        if prepared is None:
+            prepared = {}
+            method.prepared = prepared
+        return prepared
+
     def returned_types(self, method):
         """
         Get the L{xsd.sxbase.SchemaObject} returned by the I{method}.
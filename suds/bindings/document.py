@@ -75,6 +75,12 @@ class Document(Binding):
         else:
             return body.children
 
+    def replydepth(self, method):
+        if method.soap.output.body.wrapped:
+            return 1
+        else:
+            return 0
+
     def document(self, wrapper):
         """
         Get the document root.  For I{document/literal}, this is the
@@ -115,6 +121,10 @@ class Document(Binding):
         wrapped = method.soap.input.body.wrapped
         if not wrapped:
             return pts
+        prepared = self.prepared(method)
+        result = prepared.get('param_defs')
+        if result is not None:
+            return result
         result = []
         # wrapped
         for p in pts:
@@ -129,6 +139,7 @@ class Document(Binding):
                         method.name)
                     continue
                 result.append((child.name, child))
+        prepared['param_defs'] = result
         return result
 
     def returned_types(self, method):
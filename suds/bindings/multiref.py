@@ -28,6 +28,8 @@ soapenc = (None, 'http://schemas.xmlsoap.org/soap/encoding/')
 class MultiRef(object):
     """
     Resolves and replaces multirefs.
+    The catalog is the state of a single reply so an instance
+    must not be shared by concurrent calls.
     @ivar nodes: A list of non-multiref nodes.
     @type nodes: list
     @ivar catalog: A dictionary of multiref nodes by id.
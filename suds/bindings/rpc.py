@@ -62,6 +62,9 @@ class RPC(Binding):
     def replycontent(self, method, body):
         return body[0].children
 
+    def replydepth(self, method):
+        return 1
+
     def method(self, method):
         """
         Get the document root.  For I{rpc/(literal|encoded)}, this is the
@@ -83,6 +86,10 @@ class Encoded(RPC):
     RPC/Encoded (section 5)  binding style.
     """
 
+    compilable = False
+
+    streamable = False
+
     def marshaller(self):
         return MxEncoded(self.schema())
 
@@ -55,9 +55,7 @@ class Builder(object):
         md.ordering = self.ordering(resolved)
         history = []
         self.add_attributes(data, resolved)
-        for child, ancestry in type.children():
-            if self.skip_child(child, ancestry):
-                continue
+        for child in self.children(type):
             self.process(data, child, history[:])
         return data
 
@@ -88,35 +86,26 @@ class Builder(object):
             data = value
         if not isinstance(data, list):
             self.add_attributes(data, resolved)
-            for child, ancestry in resolved.children():
-                if self.skip_child(child, ancestry):
-                    continue
+            for child in self.children(resolved):
                 self.process(data, child, history[:])
 
     def add_attributes(self, data, type):
         """ add required attributes """
-        for attr, ancestry in type.attributes():
-            name = '_%s' % attr.name
+        model = type.model()
+        for name, (attr, ancestry) in zip(model.attrnames, model.attributes):
             value = attr.get_default()
             setattr(data, name, value)
 
-    def skip_child(self, child, ancestry):
-        """ get whether or not to skip the specified child """
-        if child.any():
-            return True
-        for x in ancestry:
-            if x.choice():
-                return True
-        return False
-
-    def ordering(self, type):
-        """ get the ordering """
+    def children(self, type):
+        """ get the children not skipped: <any/> or contained by <choice/> """
+        model = type.model()
         result = []
-        for child, ancestry in type.resolve():
-            name = child.name
-            if child.name is None:
+        for (child, ancestry), choice in zip(model.children, model.choice):
+            if choice or child.any():
                 continue
-            if child.isattr():
-                name = '_%s' % child.name
-            result.append(name)
+            result.append(child)
         return result
+
+    def ordering(self, type):
+        """ get the ordering """
+        return list(type.resolve().model().ordering)
@@ -18,10 +18,17 @@
 Contains basic caching classes.
 """
 
+import json
 import os
+import time
+import zlib
 import suds
-from tempfile import mkdtemp
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock, local
+from tempfile import mkdtemp, mkstemp
 from suds.sax.parser import Parser
+from suds.sax.document import Document
 from suds.sax.element import Element
 from datetime import datetime as dt
 from datetime import timedelta
@@ -31,10 +38,123 @@ try:
     import cPickle as pickle
 except:
     import pickle
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
 
 log = getLogger(__name__)
 
 
+class NoLock(object):
+    """
+    The (passthru) lock of a cache entry.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FileLock(object):
+    """
+    An (advisory) inter-process lock held on a lock file.  Not locked
+    on platforms without I{fcntl}.  The lock file may be removed (by
+    the owner of the cache entry it locks): a lock acquired on a file
+    that has since been removed (or replaced) is acquired again.
+    @ivar path: The path of the lock file.
+    @type path: str
+    """
+
+    def __init__(self, path):
+        """
+        @param path: The path of the lock file.
+        @type path: str
+        """
+        self.path = path
+        self.fp = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        try:
+            while True:
+                self.fp = open(self.path, 'a')
+                fcntl.flock(self.fp.fileno(), fcntl.LOCK_EX)
+                if self.current():
+                    break
+                self.fp.close()
+        except:
+            log.debug(self.path, exc_info=1)
+            self.__exit__()
+        return self
+
+    def current(self):
+        """
+        Get whether the locked file is (still) the lock file.
+        @rtype: bool
+        """
+        try:
+            return os.stat(self.path).st_ino == os.fstat(self.fp.fileno()).st_ino
+        except OSError:
+            return False
+
+    def __exit__(self, *exc):
+        if self.fp is not None:
+            self.fp.close()
+            self.fp = None
+
+
+class MemoryLock(object):
+    """
+    The (thread) lock of an object ID of a L{MemoryCache}.  The lock is
+    kept (by the cache) only while it is held or waited for.
+    @ivar cache: The cache.
+    @type cache: L{MemoryCache}
+    @ivar id: The object ID.
+    @type id: str
+    """
+
+    def __init__(self, cache, id):
+        """
+        @param cache: The cache.
+        @type cache: L{MemoryCache}
+        @param id: The object ID.
+        @type id: str
+        """
+        self.cache = cache
+        self.id = id
+        self.lock = None
+
+    def __enter__(self):
+        cache = self.cache
+        with cache.mutex:
+            lock, users = cache.locks.get(self.id, (None, 0))
+            if lock is None:
+                lock = Lock()
+            cache.locks[self.id] = (lock, users + 1)
+        lock.acquire()
+        self.lock = lock
+        return self
+
+    def __exit__(self, *exc):
+        cache = self.cache
+        self.lock.release()
+        self.lock = None
+        with cache.mutex:
+            lock, users = cache.locks[self.id]
+            if users > 1:
+                cache.locks[self.id] = (lock, users - 1)
+            else:
+                del cache.locks[self.id]
+
+
 class Cache(object):
     """
     An object object cache.
@@ -88,6 +208,39 @@ class Cache(object):
         """
         raise Exception('not-implemented')
 
+    def peek(self, id):
+        """
+        Get a object from the cache by ID whether or not it has
+        expired.  An expired object is kept (not purged) so that it
+        may be revalidated and then L{touch}ed or replaced.
+        @param id: The object ID.
+        @type id: str
+        @return: (object, expired); the object is None when not cached.
+        @rtype: (any, bool)
+        """
+        return (self.get(id), False)
+
+    def touch(self, id):
+        """
+        Refresh the age of a (revalidated) object so that it is cached
+        for another I{duration}.
+        @param id: The object ID.
+        @type id: str
+        """
+        pass
+
+    def lock(self, id):
+        """
+        Get the lock of an object ID held while the object is looked
+        up, created and put so that it is created once (by one thread
+        or process) while the others wait for it.
+        @param id: The object ID.
+        @type id: str
+        @return: A lock (context manager).
+        @rtype: L{NoLock}
+        """
+        return NoLock()
+
     def clear(self):
         """
         Clear all objects from the cache.
@@ -199,9 +352,7 @@ class FileCache(Cache):
     def put(self, id, bfr):
         try:
             fn = self.__fn(id)
-            f = self.open(fn, 'wb')
-            f.write(bfr)
-            f.close()
+            self.write(fn, bfr)
             return bfr
         except:
             log.debug(id, exc_info=1)
@@ -210,15 +361,62 @@ class FileCache(Cache):
     def putf(self, id, fp):
         try:
             fn = self.__fn(id)
-            f = self.open(fn, 'wb')
-            f.write(fp.read())
+            self.write(fn, fp.read())
             fp.close()
-            f.close()
             return open(fn)
         except:
             log.debug(id, exc_info=1)
             return fp
 
+    def write(self, fn, bfr):
+        """
+        Write a cache file.  The content is written to a temporary file
+        renamed to I{fn} so that the file is never read partially written.
+        @param fn: The file name.
+        @type fn: str
+        @param bfr: The content.
+        @type bfr: bytes
+        """
+        self.mktmp()
+        fd, tmp = mkstemp(prefix='.%s-' % self.fnprefix, dir=self.location)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(bfr)
+            getattr(os, 'replace', os.rename)(tmp, fn)
+        except:
+            os.remove(tmp)
+            raise
+
+    def lock(self, id):
+        self.mktmp()
+        return FileLock(self.__lockfn(id))
+
+    def peek(self, id):
+        fn = self.__fn(id)
+        try:
+            if not self.expired(fn):
+                return (self.get(id), False)
+            with self.open(fn, 'rb') as fp:
+                return (self.decode(fp.read()), True)
+        except:
+            return (None, False)
+
+    def touch(self, id):
+        try:
+            os.utime(self.__fn(id), None)
+        except:
+            log.debug(id, exc_info=1)
+
+    def decode(self, bfr):
+        """
+        Get the object stored in a cache file.
+        @param bfr: The file content.
+        @type bfr: bytes
+        @return: The object.
+        @rtype: any
+        """
+        return bfr
+
     def get(self, id):
         try:
             f = self.getf(id)
@@ -242,30 +440,43 @@ class FileCache(Cache):
         @param fn: The file name.
         @type fn: str
         """
-        if self.duration[1] < 1:
-            return
-        created = dt.fromtimestamp(os.path.getctime(fn))
-        d = {self.duration[0]: self.duration[1]}
-        expired = created + timedelta(**d)
-        if expired < dt.now():
+        if self.expired(fn):
             log.debug('%s expired, deleted', fn)
             os.remove(fn)
 
+    def expired(self, fn):
+        """
+        Get whether the file has expired based on the I{duration}.  The
+        age of a file is that of its content (modification time) which
+        is refreshed by L{touch}.
+        @param fn: The file name.
+        @type fn: str
+        @rtype: bool
+        """
+        if self.duration[1] < 1:
+            return False
+        created = dt.fromtimestamp(os.path.getmtime(fn))
+        d = {self.duration[0]: self.duration[1]}
+        return created + timedelta(**d) < dt.now()
+
     def clear(self):
         for fn in os.listdir(self.location):
             path = os.path.join(self.location, fn)
             if os.path.isdir(path):
                 continue
+            if fn.endswith('.lock'):
+                # may be held by another process.
+                continue
             if fn.startswith(self.fnprefix):
                 os.remove(path)
                 log.debug('deleted: %s', path)
 
     def purge(self, id):
-        fn = self.__fn(id)
-        try:
-            os.remove(fn)
-        except:
-            pass
+        for fn in (self.__fn(id), self.__lockfn(id)):
+            try:
+                os.remove(fn)
+            except:
+                pass
 
     def open(self, fn, *args):
         """
@@ -284,9 +495,7 @@ class FileCache(Cache):
                 raise Exception()
         except:
             self.clear()
-            f = self.open(path, 'wb')
-            f.write(suds.__version__.encode("utf-8"))
-            f.close()
+            self.write(path, suds.__version__.encode("utf-8"))
 
     def __fn(self, id):
         name = id
@@ -294,12 +503,21 @@ class FileCache(Cache):
         fn = '%s-%s.%s' % (self.fnprefix, name, suffix)
         return os.path.join(self.location, fn)
 
+    def __lockfn(self, id):
+        return '%s.lock' % self.__fn(id)
+
 
 class DocumentCache(FileCache):
     """
-    Provides xml document caching.
+    Provides xml document caching.  The HTTP I{validators} of a
+    document (see L{suds.reader.DocumentReader.download}) are kept in
+    a leading I{<?suds-validators?>} processing instruction.
+    @cvar pi: The start of the validators processing instruction.
+    @type pi: bytes
     """
 
+    pi = b'<?suds-validators '
+
     def fnsuffix(self):
         return 'xml'
 
@@ -308,14 +526,35 @@ class DocumentCache(FileCache):
             fp = FileCache.getf(self, id)
             if fp is None:
                 return None
-            p = Parser()
-            return p.parse(fp)
+            with fp:
+                return self.decode(fp.read())
         except:
             FileCache.purge(self, id)
 
+    def decode(self, bfr):
+        validators = None
+        if bfr.startswith(self.pi):
+            line, bfr = bfr.split(b'\n', 1)
+            validators = json.loads(line[len(self.pi):-2].decode('utf-8'))
+        d = Parser().parse(string=bfr)
+        if validators:
+            d.validators = validators
+        return d
+
     def put(self, id, object):
-        if isinstance(object, Element):
-            FileCache.put(self, id, str(object))
+        if isinstance(object, Document):
+            root = object.root()
+            validators = getattr(object, 'validators', None)
+        elif isinstance(object, Element):
+            root = object
+            validators = None
+        else:
+            return object
+        bfr = root.plain().encode('utf-8')
+        if validators:
+            pi = json.dumps(validators).encode('utf-8')
+            bfr = b''.join((self.pi, pi, b'?>\n', bfr))
+        FileCache.put(self, id, bfr)
         return object
 
 
@@ -324,8 +563,27 @@ class ObjectCache(FileCache):
     Provides pickled object caching.
     @cvar protocol: The pickling protocol.
     @type protocol: int
+    @ivar compression: The (zlib) compression level of the pickled
+        objects; 0 = not compressed.  Compressed and not compressed
+        files are both read.
+    @type compression: int
     """
-    protocol = 2
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location=None, compression=0, **duration):
+        """
+        @param location: The directory for the cached files.
+        @type location: str
+        @param compression: The (zlib) compression level (1-9) of the
+            pickled objects; 0 = not compressed.
+        @type compression: int
+        @param duration: The cached file duration which defines how
+            long the file will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        FileCache.__init__(self, location, **duration)
+        self.compression = compression
 
     def fnsuffix(self):
         return 'px'
@@ -335,12 +593,507 @@ class ObjectCache(FileCache):
             fp = FileCache.getf(self, id)
             if fp is None:
                 return None
-            else:
-                return pickle.load(fp)
+            with fp:
+                return self.decode(fp.read())
         except:
             FileCache.purge(self, id)
 
+    def decode(self, bfr):
+        if bfr[:1] == b'\x78':
+            bfr = zlib.decompress(bfr)
+        return pickle.loads(bfr)
+
     def put(self, id, object):
         bfr = pickle.dumps(object, self.protocol)
+        if self.compression:
+            bfr = zlib.compress(bfr, self.compression)
         FileCache.put(self, id, bfr)
         return object
+
+
+class DurationMixin(object):
+    """
+    The caching duration of the caches other than L{FileCache} using
+    the same units.
+    @cvar units: The duration units.
+    @type units: tuple
+    @ivar duration: The cached object duration which defines how
+        long the object will be cached.
+    @type duration: (unit, value)
+    """
+    units = FileCache.units
+    duration = (None, 0)
+
+    def setduration(self, **duration):
+        """
+        Set the caching duration which defines how long the
+        object will be cached.
+        @param duration: The cached object duration which defines how
+            long the object will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        if len(duration) == 1:
+            arg = list(duration.items())[0]
+            if not arg[0] in self.units:
+                raise Exception('must be: %s' % str(self.units))
+            self.duration = arg
+        return self
+
+    def lifetime(self):
+        """
+        Get the I{duration} as a timedelta.  A month is 30 days.
+        @return: The lifetime or None when cached forever.
+        @rtype: timedelta
+        """
+        unit, value = self.duration
+        if value < 1:
+            return None
+        if unit == 'months':
+            unit, value = ('days', value * 30)
+        return timedelta(**{unit: value})
+
+
+class MemoryCache(DurationMixin, Cache):
+    """
+    An in-memory (LRU) object cache.  Objects are kept pickled so that
+    each get() returns a copy as from the file caches, or (not I{copy})
+    the objects themselves are kept and returned: they are then shared
+    by the callers and must not be modified.  When a I{backend}
+    (file) cache is specified, the memory cache is a (first) tier in
+    front of it: objects not in memory are looked up in the backend and
+    objects are put in both.
+    @ivar size: The maximum number of objects kept in memory.
+    @type size: int
+    @ivar backend: The (optional) second tier cache.
+    @type backend: L{Cache}
+    @ivar copy: Objects are kept pickled and copied by get().
+    @type copy: bool
+    @ivar entries: The cached objects (least recently used first):
+        {id: (created, value, pickled)}; the value is the object, its
+        pickle or the content written by putf().
+    @type entries: I{OrderedDict}
+    @ivar locks: The locks (being) held by object ID:
+        {id: (lock, users)}.  See L{MemoryLock}.
+    @type locks: dict
+    @ivar hits: The number of objects found (in memory).
+    @type hits: int
+    @ivar misses: The number of objects not found (in memory).
+    @type misses: int
+    @ivar evictions: The number of objects evicted (or expired).
+    @type evictions: int
+    """
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, size=100, backend=None, copy=True, **duration):
+        """
+        @param size: The maximum number of objects kept in memory.
+        @type size: int
+        @param backend: The (optional) second tier cache.
+        @type backend: L{Cache}
+        @param copy: Keep the objects pickled and return a copy.
+        @type copy: bool
+        @param duration: The cached object duration which defines how
+            long the object will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        self.size = size
+        self.backend = backend
+        self.copy = copy
+        self.setduration(**duration)
+        self.entries = OrderedDict()
+        self.mutex = Lock()
+        self.locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def expired(self, created):
+        """
+        Get whether an object created at I{created} has expired based
+        on the I{duration}.
+        @param created: When the object was put.
+        @type created: datetime
+        @rtype: bool
+        """
+        lifetime = self.lifetime()
+        if lifetime is None:
+            return False
+        return created + lifetime < dt.now()
+
+    def get(self, id):
+        entry = self.lookup(id)
+        if entry is not None:
+            if entry[2]:
+                return pickle.loads(entry[1])
+            return entry[1]
+        if self.backend is None:
+            return None
+        object = self.backend.get(id)
+        if object is not None:
+            self.store(id, object)
+        return object
+
+    def getf(self, id):
+        entry = self.lookup(id)
+        if entry is not None and not entry[2] and isinstance(entry[1], bytes):
+            return BytesIO(entry[1])
+        if self.backend is None:
+            return None
+        return self.backend.getf(id)
+
+    def put(self, id, object):
+        self.store(id, object)
+        if self.backend is not None:
+            self.backend.put(id, object)
+        return object
+
+    def putf(self, id, fp):
+        bfr = fp.read()
+        fp.close()
+        self.add(id, bfr, False)
+        if self.backend is not None:
+            return self.backend.putf(id, BytesIO(bfr))
+        return BytesIO(bfr)
+
+    def peek(self, id):
+        with self.mutex:
+            entry = self.entries.get(id)
+        if entry is not None and self.expired(entry[0]):
+            if entry[2]:
+                return (pickle.loads(entry[1]), True)
+            return (entry[1], True)
+        if entry is None and self.backend is not None:
+            object, expired = self.backend.peek(id)
+            if object is not None and not expired:
+                self.store(id, object)
+            return (object, expired)
+        return (self.get(id), False)
+
+    def touch(self, id):
+        with self.mutex:
+            entry = self.entries.get(id)
+            if entry is not None:
+                self.entries[id] = (dt.now(),) + entry[1:]
+        if self.backend is not None:
+            self.backend.touch(id)
+
+    def purge(self, id):
+        with self.mutex:
+            self.entries.pop(id, None)
+        if self.backend is not None:
+            self.backend.purge(id)
+
+    def clear(self):
+        with self.mutex:
+            self.entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def lock(self, id):
+        if self.backend is not None:
+            return self.backend.lock(id)
+        return MemoryLock(self, id)
+
+    def stats(self):
+        """
+        Get the cache statistics.
+        @return: {name: value} of: size, hits, misses and evictions.
+        @rtype: dict
+        """
+        with self.mutex:
+            return dict(
+                size=len(self.entries),
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions)
+
+    def lookup(self, id):
+        """
+        Find an (unexpired) entry and make it the most recently used.
+        @param id: The object ID.
+        @type id: str
+        @return: The entry: (created, value, pickled) or None.
+        @rtype: tuple
+        """
+        with self.mutex:
+            entry = self.entries.pop(id, None)
+            if entry is not None and self.expired(entry[0]):
+                log.debug('%s expired, deleted', id)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries[id] = entry
+            self.hits += 1
+            return entry
+
+    def store(self, id, object):
+        """
+        Add an object, pickled when I{copy}.
+        @param id: The object ID.
+        @type id: str
+        @param object: The object to add.
+        @type object: any
+        """
+        if not self.copy:
+            self.add(id, object, False)
+            return
+        try:
+            bfr = pickle.dumps(object, self.protocol)
+        except:
+            log.debug(id, exc_info=1)
+            return
+        self.add(id, bfr, True)
+
+    def add(self, id, value, pickled):
+        """
+        Add an entry evicting the least recently used entries when
+        more than I{size} are kept.
+        @param id: The object ID.
+        @type id: str
+        @param value: The object, its pickle or the content.
+        @type value: any
+        @param pickled: Whether I{value} is pickled.
+        @type pickled: bool
+        """
+        with self.mutex:
+            self.entries.pop(id, None)
+            self.entries[id] = (dt.now(), value, pickled)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+
+class SqliteCache(DurationMixin, Cache):
+    """
+    An object cache stored in a single SQLite database file which may
+    be shared by the processes of a host.  The database is used in
+    I{WAL} mode: readers are not blocked by the (one) writer.  Entries
+    are indexed by when they were put so that expired entries are
+    found (and purged in bulk) without a scan.  Objects are pickled.
+    The objects are created (see L{lock}) one at a time under a single
+    I{<path>.lock} file lock.
+    @ivar path: The path of the database file.
+    @type path: str
+    @ivar timeout: How long (seconds) to wait for a locked database.
+    @type timeout: float
+    @ivar connections: The database connection (per thread).
+    @type connections: I{threading.local}
+    """
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    schema = (
+        'CREATE TABLE IF NOT EXISTS entry ('
+        'id TEXT PRIMARY KEY, created REAL NOT NULL, '
+        'pickled INTEGER NOT NULL, data BLOB NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS entry_created ON entry (created)',
+        'CREATE TABLE IF NOT EXISTS version (version TEXT NOT NULL)',
+    )
+
+    def __init__(self, path, timeout=30.0, **duration):
+        """
+        @param path: The path of the database file.
+        @type path: str
+        @param timeout: How long (seconds) to wait for a locked database.
+        @type timeout: float
+        @param duration: The cached object duration which defines how
+            long the object will be cached.  A duration=0 means forever.
+            The duration may be: (months|weeks|days|hours|minutes|seconds).
+        @type duration: {unit:value}
+        """
+        if sqlite3 is None:
+            raise Exception('SqliteCache requires the sqlite3 module')
+        self.path = path
+        self.timeout = timeout
+        self.setduration(**duration)
+        self.connections = local()
+        self.checkversion()
+
+    def connection(self):
+        """
+        Get the database connection of this thread (and process).
+        @rtype: I{sqlite3.Connection}
+        """
+        pid = os.getpid()
+        connection = getattr(self.connections, 'connection', None)
+        if connection is None or self.connections.pid != pid:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in self.schema:
+                connection.execute(statement)
+            self.connections.connection = connection
+            self.connections.pid = pid
+        return connection
+
+    def cutoff(self):
+        """
+        Get the time (seconds since the epoch) entries put before have
+        expired based on the I{duration}.
+        @return: The cutoff or None when cached forever.
+        @rtype: float
+        """
+        lifetime = self.lifetime()
+        if lifetime is None:
+            return None
+        return time.time() - lifetime.total_seconds()
+
+    def lookup(self, id):
+        """
+        Find an (unexpired) entry.
+        @param id: The object ID.
+        @type id: str
+        @return: (pickled, data) or None.
+        @rtype: tuple
+        """
+        cutoff = self.cutoff()
+        try:
+            if cutoff is None:
+                row = self.connection().execute(
+                    'SELECT pickled, data FROM entry WHERE id = ?',
+                    (id,)).fetchone()
+            else:
+                row = self.connection().execute(
+                    'SELECT pickled, data FROM entry WHERE id = ? AND created > ?',
+                    (id, cutoff)).fetchone()
+        except:
+            log.debug(id, exc_info=1)
+            return None
+        return row
+
+    def get(self, id):
+        row = self.lookup(id)
+        if row is None:
+            return None
+        if not row[0]:
+            return bytes(row[1])
+        try:
+            return pickle.loads(bytes(row[1]))
+        except:
+            self.purge(id)
+
+    def getf(self, id):
+        row = self.lookup(id)
+        if row is None or row[0]:
+            return None
+        return BytesIO(bytes(row[1]))
+
+    def put(self, id, object):
+        try:
+            bfr = pickle.dumps(object, self.protocol)
+            self.store(id, bfr, True)
+        except:
+            log.debug(id, exc_info=1)
+        return object
+
+    def putf(self, id, fp):
+        bfr = fp.read()
+        fp.close()
+        try:
+            self.store(id, bfr, False)
+        except:
+            log.debug(id, exc_info=1)
+        return BytesIO(bfr)
+
+    def store(self, id, bfr, pickled):
+        """
+        Insert (or replace) an entry.
+        @param id: The object ID.
+        @type id: str
+        @param bfr: The (pickled) object.
+        @type bfr: bytes
+        @param pickled: Whether I{bfr} is pickled.
+        @type pickled: bool
+        """
+        self.connection().execute(
+            'INSERT OR REPLACE INTO entry (id, created, pickled, data) '
+            'VALUES (?, ?, ?, ?)',
+            (id, time.time(), int(pickled), sqlite3.Binary(bfr)))
+
+    def peek(self, id):
+        try:
+            row = self.connection().execute(
+                'SELECT created, pickled, data FROM entry WHERE id = ?',
+                (id,)).fetchone()
+            if row is None:
+                return (None, False)
+            cutoff = self.cutoff()
+            expired = cutoff is not None and row[0] <= cutoff
+            if not row[1]:
+                return (bytes(row[2]), expired)
+            return (pickle.loads(bytes(row[2])), expired)
+        except:
+            log.debug(id, exc_info=1)
+            return (None, False)
+
+    def touch(self, id):
+        try:
+            self.connection().execute(
+                'UPDATE entry SET created = ? WHERE id = ?', (time.time(), id))
+        except:
+            log.debug(id, exc_info=1)
+
+    def purge(self, id):
+        try:
+            self.connection().execute('DELETE FROM entry WHERE id = ?', (id,))
+        except:
+            log.debug(id, exc_info=1)
+
+    def clear(self):
+        self.connection().execute('DELETE FROM entry')
+
+    def expire(self):
+        """
+        Purge (in bulk) the expired entries.
+        @return: The number of entries purged.
+        @rtype: int
+        """
+        cutoff = self.cutoff()
+        if cutoff is None:
+            return 0
+        cursor = self.connection().execute(
+            'DELETE FROM entry WHERE created <= ?', (cutoff,))
+        return cursor.rowcount
+
+    def lock(self, id):
+        return FileLock('%s.lock' % self.path)
+
+    def stats(self):
+        """
+        Get the cache statistics.
+        @return: {name: value} of: size (entries), expired (entries)
+            and bytes (of the cached data).
+        @rtype: dict
+        """
+        connection = self.connection()
+        size, total = connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM entry').fetchone()
+        cutoff = self.cutoff()
+        if cutoff is None:
+            expired = 0
+        else:
+            expired = connection.execute(
+                'SELECT COUNT(*) FROM entry WHERE created <= ?', (cutoff,)).fetchone()[0]
+        return dict(size=size, expired=expired, bytes=total)
+
+    def checkversion(self):
+        """
+        Clear the cache written by another version of suds.
+        """
+        connection = self.connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT version FROM version').fetchone()
+            if row is None or row[0] != suds.__version__:
+                connection.execute('DELETE FROM entry')
+                connection.execute('DELETE FROM version')
+                connection.execute(
+                    'INSERT INTO version (version) VALUES (?)', (suds.__version__,))
+            connection.execute('COMMIT')
+        except:
+            connection.execute('ROLLBACK')
+            raise
@@ -21,6 +21,7 @@ See I{README.txt}
 
 from copy import deepcopy
 from logging import getLogger
+from threading import local
 
 import six
 from six.moves.http_cookiejar import CookieJar
@@ -36,6 +37,7 @@ from suds.options import Options
 from suds.plugin import PluginContainer
 from suds.properties import Unskin
 from suds.reader import DefinitionsReader
+from suds.registry import registry
 from suds.resolver import PathResolver
 from suds.sax.parser import Parser
 from suds.servicedefinition import ServiceDefinition
@@ -59,8 +61,11 @@ class Client(object):
     @type factory: L{Factory}
     @ivar sd: The service definition
     @type sd: L{ServiceDefinition}
-    @ivar messages: The last sent/received messages.
-    @type messages: str[2]
+    @ivar messages: The last sent/received messages (per thread).
+    @type messages: L{Messages}
+    @ivar startup_profile: The profile of the construction (when
+        created with the I{profile} option), else None.
+    @type startup_profile: L{metrics.Profile}
     """
     @classmethod
     def items(cls, sobject):
@@ -104,22 +109,108 @@ class Client(object):
         @param kwargs: keyword arguments.
         @see: L{Options}
         """
+        self.__options(kwargs)
+        self.startup_profile = None
+        if self.options.profile:
+            profile = metrics.Profile(url, self.options.tracememory)
+            with profile, metrics.phase('client'):
+                self.__load(url)
+            self.__count(profile)
+            self.startup_profile = profile
+            metrics.log.debug('client for (%s) created:\n%s', url, profile)
+        else:
+            self.__load(url)
+
+    def __load(self, url):
+        """
+        Load the WSDL (or open the shared WSDL) and set up the client.
+        @param url: The URL for the WSDL.
+        @type url: str
+        """
+        if self.options.shared:
+            with metrics.phase('wsdl'):
+                wsdl, sd = registry.open(url, self.options, self)
+        else:
+            reader = DefinitionsReader(self.options, Definitions)
+            with metrics.phase('wsdl'):
+                wsdl, sd = reader.open(url), None
+        self.__open(wsdl, sd)
+
+    def __count(self, profile):
+        """
+        Count the objects loaded in the (startup) profile.
+        @param profile: The profile.
+        @type profile: L{metrics.Profile}
+        """
+        counts = profile.counts
+        counts['documents'] = len(profile.documents)
+        counts['nodes'] = sum(d['nodes'] for d in profile.documents)
+        schema = self.wsdl.schema
+        if schema is not None:
+            for name in ('types', 'elements', 'attributes', 'groups', 'agrps'):
+                counts[name] = len(getattr(schema, name))
+        counts['messages'] = len(self.wsdl.messages)
+        counts['bindings'] = len(self.wsdl.bindings)
+        counts['methods'] = sum(len(p.methods) for s in self.wsdl.services for p in s.ports)
+
+    @classmethod
+    def from_bundle(cls, path, **kwargs):
+        """
+        Create a client from a (compiled) service bundle file.  The
+        WSDL is not read, parsed or resolved.
+        @param path: The path of the bundle file.
+        @type path: str
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        @see: L{suds.compile}
+        @return: A client.
+        @rtype: L{Client}
+        """
+        from suds.compile import Bundle
+        bundle = Bundle.load(path)
+        class Uninitialized(cls):
+            def __init__(self):
+                pass
+        client = Uninitialized()
+        client.__options(kwargs)
+        client.startup_profile = None
+        wsdl = bundle.wsdl
+        wsdl.options = client.options
+        for imp in wsdl.imports:
+            imp.imported.options = client.options
+        client.__open(wsdl, bundle.sd)
+        return client
+
+    def __options(self, kwargs):
+        """
+        Create the (default) options and set the specified options.
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        """
         options = Options()
         options.transport = HttpAuthenticated()
         self.options = options
         options.cache = ObjectCache(days=1)
         self.set_options(**kwargs)
-        reader = DefinitionsReader(options, Definitions)
-        self.wsdl = reader.open(url)
-        plugins = PluginContainer(options.plugins)
+
+    def __open(self, wsdl, sd=None):
+        """
+        Set up the client for the loaded WSDL.
+        @param wsdl: The WSDL object.
+        @type wsdl: L{Definitions}
+        @param sd: The (already built) service definitions.
+        @type sd: [L{ServiceDefinition},..]
+        """
+        self.wsdl = wsdl
+        plugins = PluginContainer(self.options.plugins)
         plugins.init.initialized(wsdl=self.wsdl)
         self.factory = Factory(self.wsdl)
         self.service = ServiceSelector(self, self.wsdl.services)
-        self.sd = []
-        for s in self.wsdl.services:
-            sd = ServiceDefinition(self.wsdl, s)
-            self.sd.append(sd)
-        self.messages = dict(tx=None, rx=None)
+        if sd is None:
+            with metrics.phase('service_definitions'):
+                sd = [ServiceDefinition(self.wsdl, s) for s in self.wsdl.services]
+        self.sd = sd
+        self.messages = Messages()
 
     def set_options(self, **kwargs):
         """
@@ -165,6 +256,14 @@ class Client(object):
         """
         return self.messages.get('rx')
 
+    @property
+    def methodclass(self):
+        """
+        The class of the I{execution wrapper} used to invoke methods.
+        @rtype: L{Method}
+        """
+        return Method
+
     def clone(self):
         """
         Get a shallow clone of this object.
@@ -173,7 +272,7 @@ class Client(object):
         @return: A shallow clone.
         @rtype: L{Client}
         """
-        class Uninitialized(Client):
+        class Uninitialized(self.__class__):
             def __init__(self):
                 pass
         clone = Uninitialized()
@@ -185,7 +284,7 @@ class Client(object):
         clone.factory = self.factory
         clone.service = ServiceSelector(clone, self.wsdl.services)
         clone.sd = self.sd
-        clone.messages = dict(tx=None, rx=None)
+        clone.messages = Messages()
         return clone
 
     def __str__(self):
@@ -202,6 +301,27 @@ class Client(object):
         return ''.join(s)
 
 
+class Messages(local):
+    """
+    The last sent (tx) and received (rx) messages.  Tracked per thread
+    so that concurrent calls on one client don't see each other's
+    messages.
+    """
+
+    def __init__(self):
+        self.tx = None
+        self.rx = None
+
+    def get(self, key):
+        return getattr(self, key)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
 class Factory(object):
     """
     A factory for instantiating types defined in the wsdl
@@ -520,7 +640,7 @@ class MethodSelector(object):
         if m is None:
             qn = '.'.join((self.__qn, name))
             raise MethodNotFound(qn)
-        return Method(self.__client, m)
+        return self.__client.methodclass(self.__client, m)
 
 
 class Method(object):
@@ -578,13 +698,13 @@ class Method(object):
         methods = [m for m in self.methods if m.soap.input.name == input_name]
         if not methods:
             raise MethodNotFound(self.methods[0].name, "accepting message '%s'" % input_name)
-        return Method(self.client, methods)
+        return self.__class__(self.client, methods)
 
     def returning_message(self, output_name):
         methods = [m for m in self.methods if m.soap.output.name == output_name]
         if not methods:
             raise MethodNotFound(self.methods[0].name, "returning message '%s'" % output_name)
-        return Method(self.client, methods)
+        return self.__class__(self.client, methods)
 
     def __methods_accepting_args(self, arg_names):
         methods = [m for m in self.methods if Method.__part_names(m).issuperset(arg_names)]
@@ -593,10 +713,10 @@ class Method(object):
         return methods
 
     def accepting_args(self, *arg_names):
-        return Method(self.client, self.__methods_accepting_args(set(arg_names)))
+        return self.__class__(self.client, self.__methods_accepting_args(set(arg_names)))
 
     def __getitem__(self, item):
-        return Method(self.client, [self.methods[item]])
+        return self.__class__(self.client, [self.methods[item]])
 
     def __call__(self, *args, **kwargs):
         """
@@ -612,6 +732,80 @@ class Method(object):
         else:
             return client.invoke(args, kwargs)
 
+    def map(self, iterable, workers=8):
+        """
+        Invoke the method for each item in I{iterable} on a bounded pool
+        of worker threads and get the results in order.
+        A failing item does not abort the batch; the raised exception
+        (eg: L{WebFault}) is returned in place of its result.
+            >>> ids = [dict(id=n) for n in range(1000)]
+            >>> results = client.service.lookup.map(ids)
+        @param iterable: The arguments of each call: a I{dict} of
+            keyword arguments or a I{list} of positional arguments.
+        @type iterable: iterable
+        @param workers: The number of worker threads.
+        @type workers: int
+        @return: The results (or exceptions) in the order of I{iterable}.
+        @rtype: list
+        """
+        results = {}
+        for index, result in self.imap_unordered(iterable, workers):
+            results[index] = result
+        return [results[i] for i in range(len(results))]
+
+    def imap_unordered(self, iterable, workers=8):
+        """
+        Invoke the method for each item in I{iterable} on a bounded pool
+        of worker threads and yield the results as they complete.
+        The I{iterable} is consumed lazily so that no more than a few
+        calls per worker are pending at any time.
+        A failing item does not abort the batch; the raised exception
+        is yielded in place of its result.
+        @param iterable: The arguments of each call: a I{dict} of
+            keyword arguments or a I{list} of positional arguments.
+        @type iterable: iterable
+        @param workers: The number of worker threads.
+        @type workers: int
+        @return: A generator of (index, result) where the I{index} is
+            the position of the item in I{iterable}.
+        @rtype: generator
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, \
+            FIRST_COMPLETED
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = set()
+        try:
+            for index, item in enumerate(iterable):
+                pending.add(executor.submit(self.__invoke, index, item))
+                if len(pending) < workers * 2:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def __invoke(self, index, item):
+        """
+        Invoke the method for a batch item.
+        @return: (index, result|exception)
+        @rtype: tuple
+        """
+        try:
+            if isinstance(item, dict):
+                return (index, self(**item))
+            else:
+                return (index, self(*item))
+        except Exception as e:
+            log.debug('batch item %d failed: %s', index, e)
+            return (index, e)
+
     def faults(self):
         """ get faults option """
         return self.client.options.faults
@@ -627,6 +821,9 @@ class Method(object):
 class SoapClient(object):
     """
     A lightweight soap based web client B{**not intended for external use}
+    A soap client is created for each invocation and is the context of
+    the call; the client (and its options and WSDL) is only read so that
+    one client may be used by many threads.
     @ivar service: The target method.
     @type service: L{Service}
     @ivar method: A target method.
@@ -635,6 +832,8 @@ class SoapClient(object):
     @type options: dict
     @ivar cookiejar: A cookie jar.
     @type cookiejar: libcookie.CookieJar
+    @ivar messages: The sent/received messages of this call.
+    @type messages: dict
     """
 
     def __init__(self, client, method):
@@ -648,6 +847,7 @@ class SoapClient(object):
         self.method = method
         self.options = client.options
         self.cookiejar = CookieJar()
+        self.messages = dict(tx=None, rx=None)
 
     def invoke(self, args, kwargs):
         """
@@ -687,39 +887,18 @@ class SoapClient(object):
         @rtype: I{builtin} or I{subclass of} L{Object}
         """
         result = None
-        location = self.location()
         binding = self.method.binding.input
         transport = self.options.transport
-        retxml = self.options.retxml
-        nosend = self.options.nosend
-        prettyxml = self.options.prettyxml
         timer = metrics.Timer()
-        log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
         try:
-            self.last_sent(soapenv)
-            plugins = PluginContainer(self.options.plugins)
-            plugins.message.marshalled(envelope=soapenv.root())
-            if prettyxml:
-                soapenv = soapenv.str()
-            else:
-                soapenv = soapenv.plain()
-            soapenv = soapenv.encode('utf-8')
-            ctx = plugins.message.sending(envelope=soapenv)
-            soapenv = ctx.envelope
-            if nosend:
-                return RequestContext(self, binding, soapenv)
-            request = Request(location, soapenv)
-            request.headers = self.headers()
+            request = self.prepare(soapenv)
+            if isinstance(request, RequestContext):
+                return request
             timer.start()
             reply = transport.send(request)
             timer.stop()
             metrics.log.debug('waited %s on server reply', timer)
-            ctx = plugins.message.received(reply=reply.message)
-            reply.message = ctx.reply
-            if retxml:
-                result = reply.message
-            else:
-                result = self.succeeded(binding, reply.message)
+            result = self.received(binding, reply)
         except TransportError as e:
             if e.httpcode in (202, 204):
                 result = None
@@ -728,6 +907,60 @@ class SoapClient(object):
                 result = self.failed(binding, e)
         return result
 
+    def prepare(self, soapenv):
+        """
+        Prepare the transport request for the soap message.
+        @param soapenv: A soap envelope to send.
+        @type soapenv: L{Document}
+        @return: The request to be sent or a L{RequestContext}
+            when the I{nosend} option is specified.
+        @rtype: L{Request}
+        """
+        location = self.location()
+        binding = self.method.binding.input
+        log.debug('sending to (%s)\nmessage:\n%s', location, soapenv)
+        self.last_sent(soapenv)
+        plugins = PluginContainer(self.options.plugins)
+        if self.options.plugins:
+            plugins.message.marshalled(envelope=soapenv.root())
+        if self.options.prettyxml:
+            soapenv = soapenv.str()
+        else:
+            soapenv = soapenv.plain()
+        soapenv = soapenv.encode('utf-8')
+        ctx = plugins.message.sending(envelope=soapenv)
+        soapenv = ctx.envelope
+        if self.options.nosend:
+            return RequestContext(self, binding, soapenv)
+        request = Request(location, soapenv)
+        request.headers = self.headers()
+        request.stream = binding.iterable(self.method)
+        return request
+
+    def received(self, binding, reply):
+        """
+        Process the transport reply.
+        A reply returned as an iterator (see I{iterreply}) is not passed
+        to the I{received} plugin hook.  Such replies are never requested
+        with the I{retxml} option or plugins implementing that hook;
+        the (whole) reply is read and processed as usual instead.
+        @param binding: The binding to be used to process the reply.
+        @type binding: L{bindings.binding.Binding}
+        @param reply: The transport reply.
+        @type reply: L{suds.transport.Reply}
+        @return: The method result.
+        @rtype: I{builtin}, L{Object}
+        """
+        if binding.iterable(self.method):
+            return self.succeeded(binding, reply.message)
+        plugins = PluginContainer(self.options.plugins)
+        ctx = plugins.message.received(reply=reply.message)
+        reply.message = ctx.reply
+        if self.options.retxml:
+            return reply.message
+        else:
+            return self.succeeded(binding, reply.message)
+
     def headers(self):
         """
         Get http headers or the http/https request.
@@ -755,7 +988,9 @@ class SoapClient(object):
         """
         log.debug('http succeeded:\n%s', reply)
         plugins = PluginContainer(self.options.plugins)
-        if len(reply) > 0:
+        if binding.iterable(self.method):
+            result = binding.get_items(self.method, reply, self.last_received)
+        elif len(reply) > 0:
             reply, result = binding.get_reply(self.method, reply)
             self.last_received(reply)
         else:
@@ -796,19 +1031,19 @@ class SoapClient(object):
 
     def last_sent(self, d=None):
         key = 'tx'
-        messages = self.client.messages
         if d is None:
-            return messages.get(key)
+            return self.messages.get(key)
         else:
-            messages[key] = d
+            self.messages[key] = d
+            self.client.messages[key] = d
 
     def last_received(self, d=None):
         key = 'rx'
-        messages = self.client.messages
         if d is None:
-            return messages.get(key)
+            return self.messages.get(key)
         else:
-            messages[key] = d
+            self.messages[key] = d
+            self.client.messages[key] = d
 
 
 class SimClient(SoapClient):
@@ -847,7 +1082,7 @@ class SimClient(SoapClient):
             if fault is not None:
                 return self.__fault(fault)
             raise Exception('(reply|fault) expected when msg=None')
-        sax = Parser()
+        sax = Parser(self.options.parser)
         msg = sax.parse(string=msg)
         return self.send(msg)
 
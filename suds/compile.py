@@ -0,0 +1,175 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Compiles a WSDL into a (versioned) I{service bundle} file: the loaded
+and resolved WSDL (Definitions) including the schema, bindings and
+methods with the (otherwise lazily built) content models and lookup
+tables, and the service definitions.  A client is created from the
+bundle by L{suds.client.Client.from_bundle} without reading, parsing
+or resolving the WSDL.
+    >>> from suds.compile import compile
+    >>> compile(url, 'service.bundle')
+    >>> client = Client.from_bundle('service.bundle')
+Or from the command line:
+    python -m suds.compile <url> <path>
+"""
+
+import gc
+import os
+import sys
+from logging import getLogger
+try:
+    import cPickle as pickle
+except:
+    import pickle
+
+import suds
+
+log = getLogger(__name__)
+
+
+class Bundle(object):
+    """
+    A service bundle.
+    @cvar magic: The first line of a bundle file.
+    @type magic: bytes
+    @cvar format: The bundle (file) format version.
+    @type format: int
+    @ivar url: The URL of the compiled WSDL.
+    @type url: str
+    @ivar wsdl: The WSDL object.
+    @type wsdl: L{suds.wsdl.Definitions}
+    @ivar sd: The service definitions.
+    @type sd: [L{suds.servicedefinition.ServiceDefinition},..]
+    """
+
+    magic = b'suds-bundle'
+    format = 3
+
+    @classmethod
+    def header(cls):
+        """
+        Get the header (line) of a bundle file written by this version
+        of suds.  A bundle is loaded only by the version that wrote it.
+        @rtype: bytes
+        """
+        header = '%s %d %s\n' % (cls.magic.decode('ascii'), cls.format, suds.__version__)
+        return header.encode('ascii')
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a bundle file.  The (cyclic) garbage collector is paused
+        while the graph is unpickled: it would otherwise be run many
+        times over the (large number of) objects being created.
+        @param path: The path of the bundle file.
+        @type path: str
+        @return: The loaded bundle.
+        @rtype: L{Bundle}
+        @raise Exception: When not a bundle written by this version.
+        """
+        with open(path, 'rb') as fp:
+            header = fp.readline()
+            if header != cls.header():
+                raise Exception('"%s" is not a (compatible) service bundle' % path)
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(fp)
+            finally:
+                if enabled:
+                    gc.enable()
+
+    def __init__(self, url, wsdl, sd):
+        """
+        @param url: The URL of the compiled WSDL.
+        @type url: str
+        @param wsdl: The WSDL object.
+        @type wsdl: L{suds.wsdl.Definitions}
+        @param sd: The service definitions.
+        @type sd: [L{suds.servicedefinition.ServiceDefinition},..]
+        """
+        self.url = url
+        self.wsdl = wsdl
+        self.sd = sd
+
+    def warm(self):
+        """
+        Build the (lazily built) content models, lookup tables and
+        prepared methods so that they are saved with the bundle.
+        @see: L{suds.wsdl.Definitions.warm}
+        """
+        self.wsdl.warm()
+
+    def dump(self, path):
+        """
+        Write the bundle file.  The file is written to a temporary
+        file which is then renamed so that a bundle being loaded is
+        never seen partially written.
+        @param path: The path of the bundle file.
+        @type path: str
+        """
+        self.warm()
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            with open(tmp, 'wb') as fp:
+                fp.write(self.header())
+                pickle.dump(self, fp, pickle.HIGHEST_PROTOCOL)
+            getattr(os, 'replace', os.rename)(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        log.debug('bundle for (%s) written: %s', self.url, path)
+
+
+def compile(url, path, **kwargs):
+    """
+    Compile the WSDL at the I{url} into a bundle file.
+    @param url: The URL for the WSDL.
+    @type url: str
+    @param path: The path of the bundle file.
+    @type path: str
+    @param kwargs: The options used to load the WSDL.
+    @see: L{suds.options.Options}
+    @return: The bundle.
+    @rtype: L{Bundle}
+    """
+    from suds.client import Client
+    kwargs.setdefault('cache', None)
+    client = Client(url, **kwargs)
+    bundle = Bundle(url, client.wsdl, client.sd)
+    bundle.dump(path)
+    return bundle
+
+
+def main(args=None):
+    """
+    The command line: compile <url> <path>
+    """
+    if args is None:
+        args = sys.argv[1:]
+    if len(args) != 2:
+        sys.stderr.write('usage: python -m suds.compile <url> <path>\n')
+        return 2
+    url, path = args
+    if '://' not in url:
+        url = 'file://' + os.path.abspath(url)
+    compile(url, path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
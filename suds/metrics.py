@@ -19,12 +19,25 @@ The I{metrics} module defines classes and other resources
 designed for collecting and reporting performance metrics.
 """
 
+import json
 import time
+from collections import OrderedDict
 from logging import getLogger
 from math import modf
+from threading import Lock, local
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
 
 log = getLogger(__name__)
 
+wall = getattr(time, 'perf_counter', time.time)
+try:
+    cpu = time.process_time
+except AttributeError:
+    cpu = time.clock
+
 
 class Timer(object):
 
@@ -60,3 +73,320 @@ class Timer(object):
             return '%d.%.3d (seconds)' % jmod(m)
         m = modf(duration / 60)
         return '%d.%.3d (minutes)' % jmod(m)
+
+
+class Phase(object):
+    """
+    A phase of a L{Profile}: the total time of its runs.
+    @ivar path: The names of the enclosing phases and of the phase
+        joined by '/'.
+    @type path: str
+    @ivar depth: The number of enclosing phases.
+    @type depth: int
+    @ivar calls: The number of runs.
+    @type calls: int
+    @ivar wall: The (total) wall time in seconds.
+    @type wall: float
+    @ivar cpu: The (total) process CPU time in seconds.
+    @type cpu: float
+    """
+
+    def __init__(self, path):
+        """
+        @param path: The path of the phase.
+        @type path: str
+        """
+        self.path = path
+        self.depth = path.count('/')
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def name(self):
+        """
+        The name of the phase.
+        @rtype: str
+        """
+        return self.path.rsplit('/', 1)[-1]
+
+    def dict(self):
+        """
+        Get the phase as a (JSON serializable) dictionary.
+        @rtype: dict
+        """
+        return OrderedDict((
+            ('path', self.path),
+            ('calls', self.calls),
+            ('wall', self.wall),
+            ('cpu', self.cpu)))
+
+
+class Running(object):
+    """
+    A run of a phase (context).
+    """
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profile.stack()
+        stack.append(self.name)
+        self.phase = self.profile.get('/'.join(stack))
+        self.started = (wall(), cpu())
+        return self
+
+    def __exit__(self, *exc):
+        stopped = (wall(), cpu())
+        self.profile.stack().pop()
+        self.profile.add(self.phase, stopped[0] - self.started[0], stopped[1] - self.started[1])
+
+
+class NotRunning(object):
+    """
+    A phase (context) run while no profile is active.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+NOT_RUNNING = NotRunning()
+
+
+class Profile(object):
+    """
+    A (startup) profile: the wall and CPU time of the (nested) phases
+    run while it is active (see L{phase}), the documents read (see
+    L{document}) and counts of the objects loaded.  When I{trace}d, the
+    peak of the memory allocated while active is traced by I{tracemalloc}
+    (when available) which slows down the phases being timed.  The peak
+    is traced only when tracemalloc is started by the profile: the
+    tracing (and peak) of a caller is never reset.  Phases are run
+    in the threads the profile is active in: the thread it is entered
+    in and those it is L{attach}ed to.
+        >>> with Profile(url) as profile:
+        >>>     ...
+        >>> print(profile)
+        >>> profile.json()
+    @cvar active: The active profile (per thread).
+    @type active: I{threading.local}
+    @ivar url: The URL profiled.
+    @type url: str
+    @ivar phases: The phases by path (in the order first run).
+    @type phases: {path: L{Phase}}
+    @ivar documents: The documents read: I{url}, I{source}
+        (download|cache), I{bytes} downloaded and (XML) I{nodes}.
+    @type documents: [dict,..]
+    @ivar counts: The number of objects loaded by name.
+    @type counts: {str: int}
+    @ivar wall: The wall time in seconds.
+    @type wall: float
+    @ivar cpu: The process CPU time in seconds.
+    @type cpu: float
+    @ivar peak: The peak of the (traced) memory allocated in bytes or
+        None when not traced.
+    @type peak: int
+    @ivar trace: Trace the memory allocated.
+    @type trace: bool
+    """
+
+    active = local()
+
+    @classmethod
+    def current(cls):
+        """
+        Get the profile active in this thread.
+        @rtype: L{Profile}
+        """
+        return getattr(cls.active, 'profile', None)
+
+    def __init__(self, url=None, trace=False):
+        """
+        @param url: The URL profiled.
+        @type url: str
+        @param trace: Trace the memory allocated (by I{tracemalloc}).
+        @type trace: bool
+        """
+        self.url = url
+        self.phases = OrderedDict()
+        self.documents = []
+        self.counts = OrderedDict()
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak = None
+        self.trace = (trace and tracemalloc is not None)
+        self.tracing = False
+        self.lock = Lock()
+        self.stacks = local()
+
+    def stack(self):
+        """
+        The names of the phases running in this thread.
+        @rtype: [str,..]
+        """
+        stack = getattr(self.stacks, 'names', None)
+        if stack is None:
+            stack = []
+            self.stacks.names = stack
+        return stack
+
+    def get(self, path):
+        """
+        Get (or add) a phase.
+        @param path: The path of the phase.
+        @type path: str
+        @rtype: L{Phase}
+        """
+        with self.lock:
+            phase = self.phases.get(path)
+            if phase is None:
+                phase = Phase(path)
+                self.phases[path] = phase
+            return phase
+
+    def add(self, phase, elapsed, used):
+        """
+        Add a run of a phase.
+        @param phase: The phase.
+        @type phase: L{Phase}
+        @param elapsed: The wall time in seconds.
+        @type elapsed: float
+        @param used: The CPU time in seconds.
+        @type used: float
+        """
+        with self.lock:
+            phase.calls += 1
+            phase.wall += elapsed
+            phase.cpu += used
+
+    def attach(self):
+        """
+        Get a context in which the profile is active in the (other)
+        thread it is entered in.
+        @rtype: L{Attached}
+        """
+        return Attached(self)
+
+    def dict(self):
+        """
+        Get the profile as a (JSON serializable) dictionary.
+        @rtype: dict
+        """
+        return OrderedDict((
+            ('url', self.url),
+            ('wall', self.wall),
+            ('cpu', self.cpu),
+            ('peak', self.peak),
+            ('phases', [p.dict() for p in self.phases.values()]),
+            ('documents', self.documents),
+            ('counts', self.counts)))
+
+    def json(self, **kwargs):
+        """
+        Get the profile as JSON.
+        @param kwargs: Passed to I{json.dumps()}.
+        @return: The JSON document.
+        @rtype: str
+        """
+        return json.dumps(self.dict(), **kwargs)
+
+    def __enter__(self):
+        self.previous = Profile.current()
+        Profile.active.profile = self
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        self.started = (wall(), cpu())
+        return self
+
+    def __exit__(self, *exc):
+        stopped = (wall(), cpu())
+        self.wall = stopped[0] - self.started[0]
+        self.cpu = stopped[1] - self.started[1]
+        if self.tracing:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.tracing = False
+        Profile.active.profile = self.previous
+
+    def __str__(self):
+        lines = ['%-56s %6s %9s %9s' % ('phase', 'calls', 'wall(s)', 'cpu(s)')]
+        for p in self.phases.values():
+            name = '%s%s' % ('  ' * p.depth, p.name())
+            lines.append('%-56s %6d %9.3f %9.3f' % (name, p.calls, p.wall, p.cpu))
+        lines.append('%-56s %6s %9.3f %9.3f' % ('total', '', self.wall, self.cpu))
+        downloaded = sum(d['bytes'] or 0 for d in self.documents)
+        lines.append('documents: %d (%d bytes downloaded)' % (len(self.documents), downloaded))
+        if self.counts:
+            lines.append('counts: %s' % ', '.join('%s=%d' % c for c in self.counts.items()))
+        if self.peak is not None:
+            lines.append('peak allocated: %d bytes' % self.peak)
+        return '\n'.join(lines)
+
+
+class Attached(object):
+    """
+    A profile made active in another thread (context).
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def __enter__(self):
+        self.previous = Profile.current()
+        Profile.active.profile = self.profile
+        return self
+
+    def __exit__(self, *exc):
+        Profile.active.profile = self.previous
+
+
+def phase(name):
+    """
+    Get a context running a phase of the profile active in this
+    thread (a no-op when none is active).
+        >>> with phase('parse'):
+        >>>     ...
+    @param name: The name of the phase.
+    @type name: str
+    @rtype: L{Running}
+    """
+    profile = Profile.current()
+    if profile is None:
+        return NOT_RUNNING
+    return Running(profile, name)
+
+
+def document(url, source, size, root):
+    """
+    Record a document read in the profile active in this thread (if
+    any).
+    @param url: The url of the document.
+    @type url: str
+    @param source: Where the document was read from (download|cache).
+    @type source: str
+    @param size: The number of bytes downloaded.
+    @type size: int
+    @param root: The root of the document.
+    @type root: L{suds.sax.element.Element}
+    """
+    profile = Profile.current()
+    if profile is None:
+        return
+    nodes = 0
+    pending = [root] if root is not None else []
+    while pending:
+        node = pending.pop()
+        nodes += 1
+        pending.extend(node)
+    with profile.lock:
+        profile.documents.append(OrderedDict((
+            ('url', url),
+            ('source', source),
+            ('bytes', size),
+            ('nodes', nodes))))
@@ -22,6 +22,7 @@ from logging import getLogger
 from suds import TypeNotFound
 from suds.mx import Content, Object
 from suds.mx.core import Core
+from suds.mx.template import Slot
 from suds.mx.typer import Typer
 from suds.resolver import GraphResolver, Frame
 from suds.sax.element import Element
@@ -230,6 +231,9 @@ class Typed(Core):
         v = content.value
         if v is None:
             return
+        if isinstance(v, Slot):
+            v.bind(content)
+            return self
         if isinstance(v, dict):
             cls = content.real.name
             content.value = Factory.object(cls, v)
@@ -264,15 +268,7 @@ class Typed(Core):
         @return: An ordered list of attribute names.
         @rtype: list
         """
-        result = []
-        for child, ancestry in type.resolve():
-            name = child.name
-            if child.name is None:
-                continue
-            if child.isattr():
-                name = '_%s' % child.name
-            result.append(name)
-        return result
+        return list(type.resolve().model().ordering)
 
 
 class Literal(Typed):
@@ -0,0 +1,273 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Provides classes for I{compiled} (templated) message marshalling.
+A message is marshalled once per argument I{shape} with each leaf value
+replaced by a L{Slot} marker.  The serialized message is split on the
+markers into a L{Template} that later messages with the same shape
+fill with their (translated and escaped) leaf values; skipping the
+element tree, prefix normalization and serialization.
+"""
+
+import re
+import datetime as dt
+from copy import copy
+from decimal import Decimal
+from logging import getLogger
+from suds import tostr, sax
+from suds.sax.document import Document
+from suds.sax.parser import Parser
+from suds.sax.text import Text, Raw
+from suds.sudsobject import Object, Property
+import six
+
+log = getLogger(__name__)
+
+anytype = ('anyType', 'http://www.w3.org/2001/XMLSchema')
+
+leaves = (float, bool, Decimal, dt.date, dt.time) + six.integer_types
+
+
+class Uncompilable(Exception):
+    """
+    The arguments (or message) cannot be templated.
+    """
+    pass
+
+
+class Slot(Text):
+    """
+    A leaf value marker.
+    @ivar index: The leaf index.
+    @type index: int
+    @ivar sxtype: The XSD type used to translate the value;
+        set by the marshaller.
+    @type sxtype: L{suds.xsd.sxbase.SchemaObject}
+    @ivar bound: Whether the marshaller has bound the slot.
+    @type bound: bool
+    @ivar attribute: Whether the slot is an attribute value.
+    @type attribute: bool
+    """
+
+    pattern = re.compile(u'\ue000([0-9]+)\ue001')
+
+    def __new__(cls, index):
+        result = Text.__new__(cls, u'\ue000%d\ue001' % index)
+        result.index = index
+        result.sxtype = None
+        result.bound = False
+        result.attribute = False
+        return result
+
+    def bind(self, content):
+        """
+        Bind the slot to the marshalled content.  Values of I{anyType}
+        content are typed (xsi:type) by the python value so these
+        slots are left unbound.
+        @param content: The content being marshalled.
+        @type content: L{suds.mx.Content}
+        """
+        if content.type.type == anytype or content.real.any():
+            return
+        self.sxtype = content.real
+        self.bound = True
+        self.attribute = content.tag.startswith('_')
+
+
+def shape(value, values):
+    """
+    Get the (hashable) I{shape} of a value and collect its leaf values.
+    The shape captures everything other than the leaf values that
+    affects the marshalled message: classes, keys, list lengths and
+    which values are None or empty.
+    @param value: An argument value.
+    @type value: any
+    @param values: The list of collected leaf values.
+    @type values: list
+    @return: The shape.
+    @rtype: tuple
+    @raise Uncompilable: When the value contains types that
+        cannot be templated (eg: raw XML).
+    """
+    if value is None:
+        return None
+    if isinstance(value, Property):
+        raise Uncompilable(value)
+    if isinstance(value, Object):
+        md = value.__metadata__
+        sxtype = getattr(md, 'sxtype', None)
+        items = tuple([(k, shape(v, values)) for k, v in value])
+        return (value.__class__, id(sxtype), items)
+    if isinstance(value, dict):
+        items = tuple([(k, shape(v, values)) for k, v in value.items()])
+        return (dict, items)
+    if isinstance(value, (list, tuple)):
+        return (value.__class__, tuple([shape(v, values) for v in value]))
+    if isinstance(value, six.string_types):
+        if not len(value):
+            return (value.__class__, '')
+        values.append(value)
+        if isinstance(value, Text):
+            return (value.__class__, value.escaped, value.lang)
+        return value.__class__
+    if isinstance(value, leaves):
+        values.append(value)
+        return value.__class__
+    raise Uncompilable(value)
+
+
+def mark(value, slots):
+    """
+    Get a copy of the value with each leaf value replaced by a L{Slot}.
+    Leaves are visited in the same order as by L{shape}.
+    @param value: An argument value.
+    @type value: any
+    @param slots: The list of created slots.
+    @type slots: list
+    @return: The marked copy.
+    @rtype: any
+    """
+    if value is None:
+        return None
+    if isinstance(value, Object):
+        marked = copy(value)
+        for k, v in value:
+            setattr(marked, k, mark(v, slots))
+        return marked
+    if isinstance(value, dict):
+        marked = {}
+        for k, v in value.items():
+            marked[k] = mark(v, slots)
+        return marked
+    if isinstance(value, (list, tuple)):
+        return value.__class__([mark(v, slots) for v in value])
+    if isinstance(value, six.string_types) and not len(value):
+        return value
+    slot = Slot(len(slots))
+    slots.append(slot)
+    return slot
+
+
+class Template(object):
+    """
+    A compiled message template.
+    @ivar chunks: The static (serialized) message chunks.
+    @type chunks: [str,..]
+    @ivar slots: The slots in the order they appear in the message.
+    @type slots: [L{Slot},..]
+    @ivar pretty: Whether the template is I{pretty} xml.
+    @type pretty: bool
+    """
+
+    @classmethod
+    def compile(cls, text, slots, pretty):
+        """
+        Compile the message marshalled with marked arguments.
+        @param text: The serialized message.
+        @type text: str
+        @param slots: The slots created by L{mark}.
+        @type slots: [L{Slot},..]
+        @param pretty: Whether the I{text} is I{pretty} xml.
+        @type pretty: bool
+        @return: The template.
+        @rtype: L{Template}
+        @raise Uncompilable: When a slot has not been bound by the
+            marshaller or is not rendered exactly once.
+        """
+        parts = Slot.pattern.split(text)
+        chunks = parts[0::2]
+        order = [slots[int(n)] for n in parts[1::2]]
+        if len(set([s.index for s in order])) != len(order):
+            raise Uncompilable('slot rendered more than once')
+        for slot in order:
+            if not slot.bound:
+                raise Uncompilable('slot (%d) not bound' % slot.index)
+        return cls(chunks, order, pretty)
+
+    def __init__(self, chunks, slots, pretty):
+        self.chunks = chunks
+        self.slots = slots
+        self.pretty = pretty
+
+    def render(self, values, parser=None):
+        """
+        Render the message by filling the slots with the leaf values.
+        @param values: The leaf values collected by L{shape}.
+        @type values: list
+        @param parser: The name of the parser backend used to build the
+            element tree of the message (when requested).
+        @type parser: str
+        @return: The message.
+        @rtype: L{Message}
+        @raise Uncompilable: When an attribute value looks like a
+            I{qname} which (may) need its prefix normalized.
+        """
+        chunks = self.chunks
+        s = [chunks[0]]
+        n = 1
+        for slot in self.slots:
+            value = values[slot.index]
+            if not isinstance(value, Text):
+                value = slot.sxtype.translate(value, False)
+                value = tostr(value)
+            if slot.attribute and ':' in value:
+                raise Uncompilable(value)
+            if not isinstance(value, Text):
+                value = sax.encoder.encode(value)
+            elif not (value.escaped or isinstance(value, Raw)):
+                value = sax.encoder.encode(value)
+            s.append(value)
+            s.append(chunks[n])
+            n += 1
+        return Message(''.join(s), self.pretty, parser)
+
+
+class Message(Document):
+    """
+    A soap message rendered from a L{Template}.  The element tree is
+    only built (parsed) when requested by L{root}; after which the
+    message is serialized from the tree so that changes made to it
+    (eg: by plugins) are honored.
+    @ivar text: The rendered message.
+    @type text: str
+    @ivar pretty: Whether the I{text} is I{pretty} xml.
+    @type pretty: bool
+    @ivar parser: The name of the parser backend.
+    @type parser: str
+    """
+
+    def __init__(self, text, pretty, parser=None):
+        Document.__init__(self)
+        self.text = text
+        self.pretty = pretty
+        self.parser = parser
+        self.parsed = None
+
+    def root(self):
+        if self.parsed is None:
+            document = Parser(self.parser).parse(string=self.text.encode('utf-8'))
+            self.parsed = document.root()
+        return self.parsed
+
+    def str(self):
+        if self.pretty and self.parsed is None:
+            return self.text
+        return Document(self.root()).str()
+
+    def plain(self):
+        if not self.pretty and self.parsed is None:
+            return self.text
+        return Document(self.root()).plain()
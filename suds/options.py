@@ -23,6 +23,7 @@ from suds.wsse import Security
 from suds.xsd.doctor import Doctor
 from suds.transport import Transport
 from suds.cache import Cache, NoCache
+from suds.store import DocumentStore
 import six
 
 
@@ -105,6 +106,88 @@ class Options(Skin):
             instead of sending it.
                 - type: I{bool}
                 - default: False
+        - B{compiledmessages} - Compile (and cache) a message template for
+            each method and I{shape} of the arguments.  Messages sent with
+            arguments of the same shape are rendered by filling the leaf
+            values into the template rather than marshalled.  Not used with
+            I{wsse}, I{soapheaders} or rpc/encoded bindings.
+                - type: I{bool}
+                - default: False
+        - B{streaming} - Unmarshal the reply content while it is (sax)
+            parsed rather than from a parsed element tree.  The
+            I{last_received} document contains only the envelope, header,
+            body and fault.  Not used with rpc/encoded bindings, multiref
+            or mixed content replies or plugins implementing I{parsed}.
+                - type: I{bool}
+                - default: False
+        - B{iterreply} - Methods returning an (unbounded) list return a
+            generator yielding each item as soon as it has been parsed
+            from the (http) reply stream.  The I{last_received} document
+            is set (and faults raised) when the generator is exhausted.
+            The I{replyfilter} is not applied and faults are raised even
+            with I{faults}=False.  A multiref (href) or mixed content item
+            raises L{suds.UnstreamableReply} once the items before it have
+            been yielded.  Not used with rpc/encoded bindings, I{retxml} or
+            plugins implementing I{received}, I{parsed} or I{unmarshalled};
+            the whole reply is returned (and passed to the plugins) as
+            usual instead.  Not to be confused with I{streaming} which
+            still returns the whole (unmarshalled) reply.
+                - type: I{bool}
+                - default: False
+        - B{parser} - The XML parser backend.
+                - type: I{str}
+                  - sax = The python xml.sax parser.
+                  - expat = The expat parser (without the sax layer).
+                  - lxml = The lxml parser (requires lxml).
+                - default: sax
+        - B{prefetch} - The number of threads used to download the
+            documents imported (or included) by the WSDL concurrently
+            while it is loaded.  The schemas are still built in the
+            document order.  0 = download each when it is imported.
+            Enable it (e.g. I{prefetch=4}) for a WSDL importing many
+            documents from a remote (slow) server.
+                - type: I{int}
+                - default: 0
+        - B{shared} - Share the loaded WSDL (schema) with the other
+            clients of the process created with this option for the
+            same URL, I{doctor}, I{autoblend}, I{plugins}, I{operations}
+            and I{lazy} (see L{suds.registry}).  The shared WSDL must
+            not be modified.
+                - type: I{bool}
+                - default: False
+        - B{lazy} - Build the content of each (top level) schema type,
+            element, group and attribute when it is first used rather
+            than when the WSDL is loaded.  Only the index of the top
+            level names (per namespace) is built by the load.  References
+            not found (invalid schemas) are reported when first used.
+                - type: I{bool}
+                - default: False
+        - B{operations} - The names of the operations used by the client.
+            The WSDL is pruned down to these operations when loaded: the
+            other operations, the messages and the schema types, elements,
+            groups and attributes they alone use are dropped (and not
+            cached).  The default (None) keeps all of the operations.
+                - type: I{list}
+                - default: None
+        - B{profile} - Profile the construction of the client: the wall
+            and CPU time of each phase of the load, the documents read
+            (and bytes downloaded) and the number of objects loaded.
+            See L{suds.client.Client.startup_profile} and
+            L{suds.metrics.Profile}.
+                - type: I{bool}
+                - default: False
+        - B{tracememory} - Also trace the peak of the memory allocated
+            by the profiled construction (see I{profile}) with
+            I{tracemalloc}, which slows the load down.  Not traced when
+            tracemalloc is already tracing.
+                - type: I{bool}
+                - default: False
+        - B{store} - The document store the WSDL and the documents it
+            imports are read from before the transport is used: a
+            L{suds.store.CatalogStore} of local (or archived) copies of
+            the documents.  The built-in document store when None.
+                - type: L{suds.store.DocumentStore}
+                - default: None
     """
     def __init__(self, **kwargs):
         domain = __name__
@@ -126,5 +209,16 @@ class Options(Skin):
             Definition('cachingpolicy', int, 0),
             Definition('plugins', (list, tuple), []),
             Definition('nosend', bool, False),
+            Definition('compiledmessages', bool, False),
+            Definition('streaming', bool, False),
+            Definition('iterreply', bool, False),
+            Definition('parser', six.string_types, 'sax'),
+            Definition('prefetch', int, 0),
+            Definition('shared', bool, False),
+            Definition('lazy', bool, False),
+            Definition('operations', (list, tuple), None),
+            Definition('profile', bool, False),
+            Definition('tracememory', bool, False),
+            Definition('store', DocumentStore, None),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
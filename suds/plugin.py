@@ -19,7 +19,6 @@ The plugin module provides classes for implementation
 of suds plugins.
 """
 
-import collections
 from logging import getLogger
 
 log = getLogger(__name__)
@@ -250,7 +249,7 @@ class Method(object):
         for plugin in self.domain.plugins:
             try:
                 method = getattr(plugin, self.name, None)
-                if method and isinstance(method, collections.Callable):
+                if method and callable(method):
                     method(ctx)
             except Exception as pe:
                 log.exception(pe)
@@ -127,6 +127,9 @@ class Endpoint(object):
         return hash(self.target)
 
     def __getattr__(self, name):
+        if name == 'target':
+            # not yet initialized (copy/unpickle).
+            raise AttributeError(name)
         return getattr(self.target, name)
 
 
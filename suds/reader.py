@@ -19,12 +19,15 @@ Contains xml document reader classes.
 """
 
 
+from suds import metrics
 from suds.sax.parser import Parser
-from suds.transport import Request
+from suds.transport import Request, TransportError
 from suds.cache import NoCache
 from suds.store import DocumentStore
 from suds.plugin import PluginContainer
+from contextlib import contextmanager
 from logging import getLogger
+from threading import local, Lock
 import six
 import hashlib
 
@@ -35,10 +38,18 @@ log = getLogger(__name__)
 class Reader(object):
     """
     The reader provides integration with cache.
+    @cvar conditionals: The HTTP validator headers and the headers
+        of the conditional request they are sent back with.
+    @type conditionals: ((str, str),..)
     @ivar options: An options object.
     @type options: I{Options}
     """
 
+    conditionals = (
+        ('ETag', 'If-None-Match'),
+        ('Last-Modified', 'If-Modified-Since'),
+    )
+
     def __init__(self, options):
         """
         @param options: An options object.
@@ -58,6 +69,85 @@ class Reader(object):
             h = hashlib.md5(name.encode("utf-8")).hexdigest()
         return '%s-%s' % (h, x)
 
+    def fetch(self, url, validators=None):
+        """
+        Open the document at the I{url} by the document store (the
+        I{store} option or the built-in L{DocumentStore}) or the
+        transport.  When I{validators} are specified, the request is
+        conditional (I{If-None-Match} and I{If-Modified-Since}).
+        @param url: A document url.
+        @type url: str
+        @param validators: The HTTP validators of the cached document:
+            {header: value} of I{ETag} and I{Last-Modified}.
+        @type validators: dict
+        @return: (fp, validators) of the (changed) document; fp is None
+            when the document has not been modified.
+        @rtype: (file-like, dict)
+        """
+        store = self.options.store or DocumentStore()
+        fp = store.open(url)
+        if fp is not None:
+            return (fp, None)
+        request = Request(url)
+        if validators:
+            for header, conditional in self.conditionals:
+                if header in validators:
+                    request.headers[conditional] = validators[header]
+        try:
+            fp = self.options.transport.open(request)
+        except TransportError as e:
+            if e.httpcode == 304:
+                log.debug('(%s) not modified', url)
+                return (None, validators)
+            raise
+        return (fp, self.validators(fp))
+
+    def stored(self, url):
+        """
+        Get whether the document at the I{url} is read from the document
+        store (the I{store} option or the built-in L{DocumentStore})
+        rather than by the transport.
+        @param url: A document url.
+        @type url: str
+        @rtype: bool
+        """
+        store = self.options.store or DocumentStore()
+        fp = store.open(url)
+        if fp is None:
+            return False
+        fp.close()
+        return True
+
+    def modified(self, url):
+        """
+        Notification that the (cached) document at the I{url} has
+        changed.  The schema imported from it is forgotten.
+        @param url: A document url.
+        @type url: str
+        """
+        from suds.xsd.schema import forget
+        log.debug('(%s) modified', url)
+        forget(url)
+
+    def validators(self, fp):
+        """
+        Get the HTTP validators of an opened document.
+        @param fp: The opened document.
+        @type fp: file-like
+        @return: {header: value} of I{ETag} and I{Last-Modified} or
+            None when the reply has neither.
+        @rtype: dict
+        """
+        headers = getattr(fp, 'headers', None)
+        if headers is None:
+            return None
+        validators = {}
+        for header, conditional in self.conditionals:
+            value = headers.get(header)
+            if value:
+                validators[header] = value
+        return validators or None
+
 
 class DocumentReader(Reader):
     """
@@ -79,31 +169,96 @@ class DocumentReader(Reader):
         """
         cache = self.cache()
         id = self.mangle(url, 'document')
-        d = cache.get(id)
-        if d is None:
-            d = self.download(url)
-            cache.put(id, d)
+        with metrics.phase('read'), cache.lock(id):
+            with metrics.phase('cache.get'):
+                d, expired = cache.peek(id)
+            if expired:
+                d = self.revalidate(cache, id, url, d)
+            elif d is not None:
+                metrics.document(url, 'cache', None, d.root())
+            if d is None:
+                with metrics.phase('prefetch.wait'):
+                    d = Prefetch.fetched(url)
+                if d is None:
+                    d = self.download(url)
+                with metrics.phase('cache.put'):
+                    cache.put(id, d)
+        Sources.record(url, getattr(d, 'validators', None))
         self.plugins.document.parsed(url=url, document=d.root())
         return d
 
-    def download(self, url):
+    def revalidate(self, cache, id, url, d):
+        """
+        Revalidate an expired (cached) document by a conditional
+        request using the HTTP validators it was downloaded with.  When
+        not modified, its age is refreshed; else the changed document
+        (downloaded by the same request) replaces it.
+        @param cache: The cache.
+        @type cache: L{Cache}
+        @param id: The cached document ID.
+        @type id: str
+        @param url: A document url.
+        @type url: str
+        @param d: The expired document.
+        @type d: I{Document}
+        @return: The valid document or None when it cannot be
+            revalidated (and must be downloaded).
+        @rtype: I{Document}
+        """
+        validators = getattr(d, 'validators', None)
+        if not validators:
+            return None
+        fresh = self.download(url, validators)
+        if fresh is None:
+            cache.touch(id)
+            return d
+        self.modified(url)
+        cache.put(id, fresh)
+        return fresh
+
+    def download(self, url, validators=None):
         """
-        Download the docuemnt.
+        Download the docuemnt.  The HTTP validators of the reply (if
+        any) are kept as the I{validators} of the document.
         @param url: A document url.
         @type url: str.
-        @return: A file pointer to the docuemnt.
-        @rtype: file-like
+        @param validators: The validators of a cached document for a
+            conditional request.
+        @type validators: dict
+        @return: The parsed document or None when (conditional and)
+            not modified.
+        @rtype: I{Document}
         """
-        store = DocumentStore()
-        fp = store.open(url)
-        if fp is None:
-            fp = self.options.transport.open(Request(url))
-        content = fp.read()
-        fp.close()
+        with metrics.phase('download'):
+            fp, validators = self.fetch(url, validators)
+            if fp is None:
+                return None
+            content = fp.read()
+            fp.close()
+        return self.parse(url, content, validators)
+
+    def parse(self, url, content, validators=None):
+        """
+        Parse the downloaded document.
+        @param url: A document url.
+        @type url: str.
+        @param content: The document content.
+        @type content: bytes
+        @param validators: The validators of the reply (kept as the
+            I{validators} of the document).
+        @type validators: dict
+        @return: The parsed document.
+        @rtype: I{Document}
+        """
+        size = len(content)
         ctx = self.plugins.document.loaded(url=url, document=content)
         content = ctx.document
-        sax = Parser()
-        return sax.parse(string=content)
+        sax = Parser(self.options.parser)
+        with metrics.phase('parse'):
+            d = sax.parse(string=content)
+        d.validators = validators
+        metrics.document(url, 'download', size, d.root())
+        return d
 
     def cache(self):
         """
@@ -117,6 +272,233 @@ class DocumentReader(Reader):
             return NoCache()
 
 
+class Prefetch(object):
+    """
+    Downloads the documents referenced (imported or included) by a
+    document on a bounded pool of threads ahead of the (sequential)
+    loading which picks them up by URL through L{DocumentReader.open}.
+    The referenced documents are discovered as each document is parsed
+    so that the whole import graph is fetched concurrently while the
+    objects are still built in the original (deterministic) order.
+    A document that cannot be fetched is left to the loading which
+    downloads it again and reports the error as before.
+    Only the outermost prefetch of a thread is active; the loading of
+    the documents it fetched is covered by it.
+    @cvar active: The active prefetch (per thread).
+    @type active: I{threading.local}
+    @ivar options: An options object.
+    @type options: I{Options}
+    @ivar references: A function returning the URLs referenced by a
+        document: fn(url, root).
+    @type references: callable
+    @ivar futures: The pending (or completed) downloads by URL.
+    @type futures: dict
+    """
+
+    active = local()
+
+    @classmethod
+    def fetched(cls, url):
+        """
+        Get the document downloaded for the I{url} by the active
+        prefetch (or handed over by L{handover}).  Waits for a download
+        in progress.  Each document is handed out once.
+        @param url: A document url.
+        @type url: str
+        @return: The parsed document or None when not fetched.
+        @rtype: I{Document}
+        """
+        documents = getattr(cls.active, 'documents', None)
+        if documents:
+            d = documents.pop(url, None)
+            if d is not None:
+                return d
+        prefetch = getattr(cls.active, 'prefetch', None)
+        if prefetch is None:
+            return None
+        with prefetch.lock:
+            future = prefetch.futures.pop(url, None)
+        if future is None:
+            return None
+        return future.result()
+
+    @classmethod
+    @contextmanager
+    def handover(cls, documents):
+        """
+        Hand the documents already downloaded (eg: by a revalidation)
+        to the loading done within the context in this thread, which
+        picks them up by L{fetched} rather than downloading them again.
+        @param documents: The parsed documents by URL.
+        @type documents: {url: I{Document}}
+        """
+        previous = getattr(cls.active, 'documents', None)
+        cls.active.documents = documents
+        try:
+            yield
+        finally:
+            cls.active.documents = previous
+
+    def __init__(self, options, references):
+        """
+        @param options: An options object.
+        @type options: I{Options}
+        @param references: A function returning the URLs referenced
+            by a document: fn(url, root).
+        @type references: callable
+        """
+        self.options = options
+        self.references = references
+        self.futures = {}
+        self.seen = set()
+        self.lock = Lock()
+        self.executor = None
+        self.profile = None
+
+    def start(self, url, root):
+        """
+        Start downloading the documents referenced by the document.
+        Nothing is done when another prefetch is active in this thread
+        or the I{prefetch} option is disabled.
+        @param url: The url of the document.
+        @type url: str
+        @param root: The root of the document.
+        @type root: L{Element}
+        @return: self
+        @rtype: L{Prefetch}
+        """
+        if self.options.prefetch < 1:
+            return self
+        if getattr(self.active, 'prefetch', None) is not None:
+            return self
+        from concurrent.futures import ThreadPoolExecutor
+        self.executor = ThreadPoolExecutor(max_workers=self.options.prefetch)
+        self.active.prefetch = self
+        self.profile = metrics.Profile.current()
+        self.seen.add(url)
+        self.submit(url, root)
+        return self
+
+    def stop(self):
+        """
+        Stop the prefetch.  Pending downloads are cancelled and the
+        documents not picked up are discarded.
+        """
+        if self.executor is None:
+            return
+        self.active.prefetch = None
+        with self.lock:
+            executor = self.executor
+            futures = list(self.futures.values())
+            self.executor = None
+            self.futures = {}
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+    def submit(self, url, root):
+        """
+        Schedule the download of the (not yet seen) documents
+        referenced by the document.
+        @param url: The url of the document.
+        @type url: str
+        @param root: The root of the document.
+        @type root: L{Element}
+        """
+        for ref in self.references(url, root):
+            with self.lock:
+                if ref in self.seen or self.executor is None:
+                    continue
+                self.seen.add(ref)
+                self.futures[ref] = self.executor.submit(self.fetch, ref)
+
+    def fetch(self, url):
+        """
+        Download (and parse) the document at the I{url} and schedule
+        the documents it references.  Documents found in the cache are
+        not downloaded (and not handed out); expired documents are left
+        to be revalidated by L{DocumentReader.open}.  The download is
+        recorded by the (startup) profile active when started.
+        @param url: A document url.
+        @type url: str
+        @return: The parsed document or None.
+        @rtype: I{Document}
+        """
+        if self.profile is None:
+            return self.download(url)
+        with self.profile.attach(), metrics.phase('prefetch'):
+            return self.download(url)
+
+    def download(self, url):
+        """
+        Download (and parse) the document at the I{url} for L{fetch}.
+        @param url: A document url.
+        @type url: str
+        @return: The parsed document or None.
+        @rtype: I{Document}
+        """
+        reader = DocumentReader(self.options)
+        try:
+            d, expired = reader.cache().peek(reader.mangle(url, 'document'))
+            if d is not None:
+                self.submit(url, d.root())
+                return None
+            d = reader.download(url)
+        except Exception as e:
+            log.debug('prefetch (%s) failed: %s', url, e)
+            return None
+        self.submit(url, d.root())
+        return d
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class Sources(object):
+    """
+    Records the documents opened (by L{DocumentReader.open}) while a
+    WSDL object is built with their HTTP validators so that the cached
+    object may be revalidated by L{DefinitionsReader.revalidate}.
+    Only the outermost recording of a thread is active.
+    @cvar active: The active recording (per thread).
+    @type active: I{threading.local}
+    @ivar validators: The validators by document URL.
+    @type validators: {url: dict}
+    """
+
+    active = local()
+
+    @classmethod
+    def record(cls, url, validators):
+        """
+        Record a document opened by the active recording (if any).
+        @param url: A document url.
+        @type url: str
+        @param validators: The validators of the document.
+        @type validators: dict
+        """
+        sources = getattr(cls.active, 'sources', None)
+        if sources is not None:
+            sources.validators[url] = validators
+
+    def __init__(self):
+        self.validators = {}
+        self.outermost = False
+
+    def __enter__(self):
+        if getattr(self.active, 'sources', None) is None:
+            self.active.sources = self
+            self.outermost = True
+        return self
+
+    def __exit__(self, *exc):
+        if self.outermost:
+            self.active.sources = None
+
+
 class DefinitionsReader(Reader):
     """
     The WSDL definitions reader provides an integration
@@ -151,15 +533,70 @@ class DefinitionsReader(Reader):
         @rtype: I{Definitions}
         """
         cache = self.cache()
-        id = self.mangle(url, 'wsdl')
-        d = cache.get(id)
-        if d is None:
-            d = self.fn(url, self.options)
-            cache.put(id, d)
-        else:
-            d.options = self.options
-            for imp in d.imports:
-                imp.imported.options = self.options
+        name = url
+        if self.options.operations is not None:
+            # pruned definitions are cached apart from the whole WSDL.
+            name = '%s#%s' % (url, ','.join(sorted(self.options.operations)))
+        id = self.mangle(name, 'wsdl')
+        with cache.lock(id):
+            with metrics.phase('cache.get'):
+                d, expired = cache.peek(id)
+            fetched = {}
+            if expired:
+                with metrics.phase('revalidate'):
+                    d = self.revalidate(cache, id, d, fetched)
+            if d is None:
+                with Sources() as sources, Prefetch.handover(fetched), \
+                        metrics.phase('definitions'):
+                    d = self.fn(url, self.options)
+                d.sources = sources.validators
+                with metrics.phase('cache.put'):
+                    cache.put(id, d)
+                return d
+        d.options = self.options
+        for imp in d.imports:
+            imp.imported.options = self.options
+        return d
+
+    def revalidate(self, cache, id, d, fetched):
+        """
+        Revalidate an expired (cached) WSDL object by conditional
+        requests for each of the documents it was built from (but the
+        documents read from the document store).  When none has been
+        modified, its age is refreshed.  It is rebuilt only when one of
+        them has changed (or cannot be revalidated).  The changed
+        document (downloaded by the conditional request) is added to
+        the I{fetched} documents for the rebuild.
+        @param cache: The cache.
+        @type cache: L{Cache}
+        @param id: The cached object ID.
+        @type id: str
+        @param d: The expired WSDL object.
+        @type d: I{Definitions}
+        @param fetched: The documents downloaded: {url: I{Document}}
+        @type fetched: dict
+        @return: The valid WSDL object or None when it must be rebuilt.
+        @rtype: I{Definitions}
+        """
+        sources = getattr(d, 'sources', None)
+        if not sources:
+            return None
+        for url, validators in sources.items():
+            if self.stored(url):
+                continue
+            if not validators:
+                return None
+            fp, validators = self.fetch(url, validators)
+            if fp is not None:
+                try:
+                    content = fp.read()
+                finally:
+                    fp.close()
+                self.modified(url)
+                reader = DocumentReader(self.options)
+                fetched[url] = reader.parse(url, content, validators)
+                return None
+        cache.touch(id)
         return d
 
     def cache(self):
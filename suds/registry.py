@@ -0,0 +1,256 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Contains the (process wide) registry of the WSDL definitions shared
+by clients created with the I{shared} option.  A server forking worker
+processes L{preload}s the WSDL definitions in the master so that the
+workers share them (copy on write) and create their clients without
+loading:
+    >>> import suds
+    >>> suds.preload([url])
+    >>> # fork the workers ...
+    >>> client = Client(url, shared=True)
+"""
+
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock, RLock
+import gc
+import weakref
+
+import six
+
+from suds.reader import DefinitionsReader
+from suds.servicedefinition import ServiceDefinition
+from suds.wsdl import Definitions
+
+log = getLogger(__name__)
+
+
+class Entry(object):
+    """
+    A registered (loaded) WSDL.
+    @ivar key: The registry key.
+    @type key: tuple
+    @ivar wsdl: The loaded (shared) definitions.
+    @type wsdl: L{suds.wsdl.Definitions}
+    @ivar sd: The (shared) service definitions.
+    @type sd: [L{ServiceDefinition},..]
+    @ivar clients: Weak references to the clients using the definitions.
+    @type clients: set
+    @ivar lock: Held while the definitions are loaded.
+    @type lock: I{threading.Lock}
+    @ivar pinned: The definitions were preloaded and are never evicted.
+    @type pinned: bool
+    """
+
+    def __init__(self, key):
+        """
+        @param key: The registry key.
+        @type key: tuple
+        """
+        self.key = key
+        self.wsdl = None
+        self.sd = None
+        self.clients = set()
+        self.lock = Lock()
+        self.pinned = False
+
+    def refcount(self):
+        """
+        The number of (live) clients using the definitions.
+        @rtype: int
+        """
+        return len(self.clients)
+
+
+class Registry(object):
+    """
+    A process wide registry of loaded WSDL definitions keyed by URL and
+    the options affecting how it is loaded (I{doctor}, I{autoblend},
+    I{plugins}, I{operations} and I{lazy}).  Each client is given a
+    L{suds.wsdl.Definitions.view} of the one (shared) definitions: the schema and WSDL objects are
+    loaded and held once; the client options are not part of the
+    shared graph.  Definitions are reference counted by the clients
+    using them; the least recently used definitions no longer used by
+    any client (and not preloaded) are evicted when more than I{capacity}
+    are registered.
+    The shared definitions must not be modified (by clients or plugins).
+    @ivar capacity: The number of definitions kept.
+    @type capacity: int
+    @ivar entries: The registered entries (least recently used first).
+    @type entries: {key: L{Entry}}
+    @ivar lock: Guards the I{entries}.  Reentrant since a client may be
+        released (garbage collected) while it is held.
+    @type lock: I{threading.RLock}
+    """
+
+    def __init__(self, capacity=16):
+        """
+        @param capacity: The number of definitions kept.
+        @type capacity: int
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.lock = RLock()
+
+    def key(self, url, options):
+        """
+        Get the registry key for the URL and options.
+        @param url: The URL for the WSDL.
+        @type url: str
+        @param options: An options object.
+        @type options: L{suds.options.Options}
+        @rtype: tuple
+        """
+        operations = options.operations
+        if operations is not None:
+            operations = tuple(sorted(operations))
+        return (url, options.doctor, options.autoblend, tuple(options.plugins),
+                operations, options.lazy)
+
+    def open(self, url, options, client):
+        """
+        Open the WSDL for a client.  The definitions are loaded (by a
+        L{DefinitionsReader}) when not registered.
+        @param url: The URL for the WSDL.
+        @type url: str
+        @param options: The client options.
+        @type options: L{suds.options.Options}
+        @param client: The client.
+        @type client: L{suds.client.Client}
+        @return: A view of the (shared) definitions and the (shared)
+            service definitions.
+        @rtype: (L{suds.wsdl.Definitions}, [L{ServiceDefinition},..])
+        """
+        key = self.key(url, options)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = Entry(key)
+                self.entries[key] = entry
+            else:
+                self.entries[key] = self.entries.pop(key)
+        with entry.lock:
+            if entry.wsdl is None:
+                reader = DefinitionsReader(options, Definitions)
+                wsdl = reader.open(url)
+                entry.sd = [ServiceDefinition(wsdl, s) for s in wsdl.services]
+                entry.wsdl = wsdl
+                log.debug('wsdl at (%s) registered', url)
+            wsdl = entry.wsdl
+        with self.lock:
+            entry.clients.add(weakref.ref(client, self.__released(entry)))
+            self.evict()
+        return (wsdl.view(options), entry.sd)
+
+    def pin(self, url, options):
+        """
+        Pin the (loaded) definitions for the URL and options so that
+        they are never evicted.
+        @param url: The URL for the WSDL.
+        @type url: str
+        @param options: The client options.
+        @type options: L{suds.options.Options}
+        @return: The pinned entry.
+        @rtype: L{Entry}
+        """
+        with self.lock:
+            entry = self.entries[self.key(url, options)]
+            entry.pinned = True
+        return entry
+
+    def invalidate(self, url=None):
+        """
+        Remove the definitions for the URL (all when None) from the
+        registry.  Clients using them are not affected; clients created
+        afterwards load the WSDL again.
+        @param url: The URL for the WSDL.
+        @type url: str
+        """
+        with self.lock:
+            for key in list(self.entries.keys()):
+                if url is None or key[0] == url:
+                    del self.entries[key]
+
+    def evict(self):
+        """
+        Evict the least recently used (and unused) definitions when
+        more than I{capacity} are registered.  Definitions being loaded
+        (not yet used) are kept.  Called with the lock held.
+        """
+        overflow = len(self.entries) - self.capacity
+        for key, entry in list(self.entries.items()):
+            if overflow <= 0:
+                break
+            if entry.pinned or entry.refcount() or entry.lock.locked():
+                continue
+            self.entries.pop(key, None)
+            overflow -= 1
+            log.debug('wsdl at (%s) evicted', key[0])
+
+    def __released(self, entry):
+        """
+        Get the callback for the weak reference to a client.
+        """
+        def released(ref):
+            with self.lock:
+                entry.clients.discard(ref)
+                self.evict()
+        return released
+
+
+registry = Registry()
+
+
+def preload(urls, freeze=True, **kwargs):
+    """
+    Preload the WSDL definitions for clients created (after a fork) with
+    the I{shared} option.  The definitions are loaded, registered
+    (pinned) and fully built: the otherwise lazily built content
+    models, resolved types and prepared methods (see
+    L{suds.wsdl.Definitions.warm}) are built, once all of the WSDLs are
+    loaded, so that they are not written (copied) by each worker
+    process.  The objects are then moved to the permanent generation of
+    the garbage collector (I{gc.freeze}, python 3.7+) so that the
+    collections of the workers do not write them either.
+    @param urls: The URLs for the WSDLs.
+    @type urls: str|[str,..]
+    @param freeze: Freeze the objects in the garbage collector.
+    @type freeze: bool
+    @param kwargs: The options used to load (and then to create the
+        clients for) the WSDLs.
+    @see: L{suds.options.Options}
+    @return: The preloaded definitions.
+    @rtype: [L{suds.wsdl.Definitions},..]
+    """
+    from suds.client import Client
+    if isinstance(urls, six.string_types):
+        urls = [urls]
+    kwargs['shared'] = True
+    result = []
+    for url in urls:
+        client = Client(url, **kwargs)
+        entry = registry.pin(url, client.options)
+        result.append(entry.wsdl)
+    for url, wsdl in zip(urls, result):
+        wsdl.warm()
+        log.debug('wsdl at (%s) preloaded', url)
+    if freeze:
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+    return result
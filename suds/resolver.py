@@ -25,7 +25,6 @@ from suds import Repr
 from suds.sax import splitPrefix, Namespace
 from suds.sudsobject import Object
 from suds.xsd import qualify
-from suds.xsd.query import BlindQuery
 
 log = getLogger(__name__)
 
@@ -57,8 +56,7 @@ class Resolver(object):
         """
         log.debug('searching schema for (%s)', name)
         qref = qualify(name, self.schema.root, self.schema.tns)
-        query = BlindQuery(qref)
-        result = query.execute(self.schema)
+        result = self.schema.lookup().find(qref)
         if result is None:
             log.error('(%s) not-found', name)
             return None
@@ -74,6 +72,9 @@ class PathResolver(Resolver):
     The path may contain (.) dot notation to specify nested types.
     @ivar wsdl: A wsdl object.
     @type wsdl: L{wsdl.Definitions}
+    @ivar found: The (memoized) types found by path:
+        {(path, resolved): (generation, type)}
+    @type found: dict
     """
 
     def __init__(self, wsdl, ps='.'):
@@ -87,6 +88,7 @@ class PathResolver(Resolver):
         self.wsdl = wsdl
         self.altp = re.compile('({)(.+)(})(.+)')
         self.splitp = re.compile('({.+})*[^\%s]+' % ps[0])
+        self.found = {}
 
     def find(self, path, resolved=True):
         """
@@ -102,6 +104,10 @@ class PathResolver(Resolver):
         @return: The found schema I{type}
         @rtype: L{xsd.sxbase.SchemaObject}
         """
+        key = (path, resolved)
+        found = self.found.get(key)
+        if found is not None and found[0] == self.schema.generation.value:
+            return found[1]
         result = None
         parts = self.split(path)
         try:
@@ -112,6 +118,7 @@ class PathResolver(Resolver):
                 result = self.leaf(result, parts)
             if resolved:
                 result = result.resolve(nobuiltin=True)
+            self.found[key] = (self.schema.generation.value, result)
         except PathResolver.BadPath:
             log.error('path: "%s", not-found' % path)
         return result
@@ -128,8 +135,7 @@ class PathResolver(Resolver):
         name = parts[0]
         log.debug('searching schema for (%s)', name)
         qref = self.qualify(parts[0])
-        query = BlindQuery(qref)
-        result = query.execute(self.schema)
+        result = self.schema.lookup().find(qref)
         if result is None:
             log.error('(%s) not-found', name)
             raise PathResolver.BadPath(name)
@@ -373,8 +379,7 @@ class NodeResolver(TreeResolver):
         """ blindly query the schema by name """
         log.debug('searching schema for (%s)', name)
         qref = qualify(name, node, node.namespace())
-        query = BlindQuery(qref)
-        result = query.execute(self.schema)
+        result = self.schema.lookup().find(qref)
         return (result, [])
 
     def known(self, node):
@@ -383,8 +388,7 @@ class NodeResolver(TreeResolver):
         if ref is None:
             return None
         qref = qualify(ref, node, node.namespace())
-        query = BlindQuery(qref)
-        return query.execute(self.schema)
+        return self.schema.lookup().find(qref)
 
 
 class GraphResolver(TreeResolver):
@@ -446,8 +450,7 @@ class GraphResolver(TreeResolver):
             qref = qualify(name, schema.root, schema.tns)
         else:
             qref = qualify(name, wsdl.root, wsdl.tns)
-        query = BlindQuery(qref)
-        result = query.execute(schema)
+        result = schema.lookup().find(qref)
         return (result, [])
 
     def wsdl(self):
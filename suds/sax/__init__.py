@@ -30,6 +30,7 @@ containing the prefix and the URI.  Eg: I{('tns', 'http://myns')}
 """
 
 from suds.sax.enc import Encoder
+from six.moves import intern as _intern
 import six
 
 #
@@ -53,6 +54,21 @@ def splitPrefix(name):
         return (None, name)
 
 
+def intern(s):
+    """
+    Intern a (node) name or namespace URI so that the many elements
+    and attributes having the same names share a single string.
+    Only (exact) I{str} values are interned; others are returned as-is.
+    @param s: A name, URI or None.
+    @type s: str
+    @return: The interned string.
+    @rtype: str
+    """
+    if s.__class__ is str:
+        return _intern(s)
+    return s
+
+
 class Namespace(object):
     """
     The namespace class represents XML namespaces.
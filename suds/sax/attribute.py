@@ -19,7 +19,7 @@ Provides XML I{attribute} classes.
 """
 
 from logging import getLogger
-from suds.sax import splitPrefix, Namespace
+from suds.sax import splitPrefix, Namespace, intern
 from suds.sax.text import Text
 import six
 
@@ -38,6 +38,9 @@ class Attribute(object):
     @ivar value: The attribute's value
     @type value: str
     """
+
+    __slots__ = ('parent', 'prefix', 'name', 'value')
+
     def __init__(self, name, value=None):
         """
         @param name: The attribute's name with I{optional} namespace prefix.
@@ -46,7 +49,9 @@ class Attribute(object):
         @type value: str
         """
         self.parent = None
-        self.prefix, self.name = splitPrefix(name)
+        prefix, name = splitPrefix(name)
+        self.prefix = intern(prefix)
+        self.name = intern(name)
         self.setValue(value)
 
     def clone(self, parent=None):
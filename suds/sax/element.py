@@ -19,7 +19,7 @@ Provides XML I{element} classes.
 """
 
 from logging import getLogger
-from suds.sax import Namespace, splitPrefix
+from suds.sax import Namespace, splitPrefix, intern
 from suds.sax.text import Text
 from suds.sax.attribute import Attribute
 import six
@@ -27,6 +27,46 @@ import six
 log = getLogger(__name__)
 
 
+class Empty(list):
+    """
+    An immutable empty list shared by the (many) elements having no
+    children or attributes.  The element replaces it with a list of its
+    own when the first child or attribute is added or when the list
+    itself is requested.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError('shared empty list is read-only')
+
+    append = extend = insert = remove = pop = __readonly
+    sort = reverse = clear = __readonly
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = __readonly
+
+    def __reduce__(self):
+        return (Empty, ())
+
+
+class Unmapped(dict):
+    """
+    An immutable empty namespace prefix mapping shared by the (many)
+    elements that do not declare prefixes.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError('shared empty mapping is read-only')
+
+    __setitem__ = __delitem__ = __readonly
+    clear = pop = popitem = setdefault = update = __readonly
+
+    def __reduce__(self):
+        return (Unmapped, ())
+
+
+empty = Empty()
+
+unmapped = Unmapped()
+
+
 class Element(object):
     """
     An XML element object.
@@ -38,13 +78,16 @@ class Element(object):
     @type name: str
     @ivar expns: An explicit namespace (xmlns="...").
     @type expns: (I{prefix}, I{name})
-    @ivar nsprefixes: A mapping of prefixes to namespaces.
+    @ivar nsprefixes: A mapping of prefixes to namespaces; created
+        when first requested.
     @type nsprefixes: dict
-    @ivar attributes: A list of XML attributes.
+    @ivar attributes: A list of XML attributes; created when first
+        requested or when an attribute is added.
     @type attributes: [I{Attribute},]
     @ivar text: The element's I{text} content.
     @type text: str
-    @ivar children: A list of child elements.
+    @ivar children: A list of child elements; created when first
+        requested or when a child is added.
     @type children: [I{Element},]
     @cvar matcher: A collection of I{lambda} for string matching.
     @cvar specialprefixes: A dictionary of builtin-special prefixes.
@@ -59,6 +102,9 @@ class Element(object):
 
     specialprefixes = {Namespace.xmlns[0]: Namespace.xmlns[1]}
 
+    __slots__ = ('prefix', 'name', 'expns', '_nsprefixes', '_attributes',
+                 'text', 'parent', '_children', 'charbuffer')
+
     @classmethod
     def buildPath(self, parent, path):
         """
@@ -90,8 +136,8 @@ class Element(object):
 
         self.rename(name)
         self.expns = None
-        self.nsprefixes = {}
-        self.attributes = []
+        self._nsprefixes = unmapped
+        self._attributes = empty
         self.text = None
         if parent is not None:
             if isinstance(parent, Element):
@@ -100,9 +146,39 @@ class Element(object):
                 raise Exception('parent (%s) not-valid', parent.__class__.__name__)
         else:
             self.parent = None
-        self.children = []
+        self._children = empty
         self.applyns(ns)
 
+    @property
+    def nsprefixes(self):
+        if self._nsprefixes is unmapped:
+            self._nsprefixes = {}
+        return self._nsprefixes
+
+    @nsprefixes.setter
+    def nsprefixes(self, value):
+        self._nsprefixes = value
+
+    @property
+    def attributes(self):
+        if self._attributes is empty:
+            self._attributes = []
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, value):
+        self._attributes = value
+
+    @property
+    def children(self):
+        if self._children is empty:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
     def rename(self, name):
         """
         Rename the element.
@@ -112,7 +188,9 @@ class Element(object):
         if name is None:
             raise Exception('name (%s) not-valid' % name)
         else:
-            self.prefix, self.name = splitPrefix(name)
+            prefix, name = splitPrefix(name)
+            self.prefix = intern(prefix)
+            self.name = intern(name)
 
     def setPrefix(self, p, u=None):
         """
@@ -161,11 +239,11 @@ class Element(object):
         @rtype: I{Element}
         """
         root = Element(self.qname(), parent, self.namespace())
-        for a in self.attributes:
+        for a in self._attributes:
             root.append(a.clone(self))
-        for c in self.children:
+        for c in self._children:
             root.append(c.clone(self))
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             root.addPrefix(item[0], item[1])
         return root
 
@@ -177,8 +255,8 @@ class Element(object):
         @rtype: L{Element}
         """
         if self.parent is not None:
-            if self in self.parent.children:
-                self.parent.children.remove(self)
+            if self in self.parent._children:
+                self.parent._children.remove(self)
             self.parent = None
         return self
 
@@ -208,7 +286,7 @@ class Element(object):
         """
         try:
             attr = self.getAttribute(name)
-            self.attributes.remove(attr)
+            self._attributes.remove(attr)
         except:
             pass
         return self
@@ -321,11 +399,15 @@ class Element(object):
             objects = (objects,)
         for child in objects:
             if isinstance(child, Element):
-                self.children.append(child)
+                if self._children is empty:
+                    self._children = []
+                self._children.append(child)
                 child.parent = self
                 continue
             if isinstance(child, Attribute):
-                self.attributes.append(child)
+                if self._attributes is empty:
+                    self._attributes = []
+                self._attributes.append(child)
                 child.parent = self
                 continue
             raise Exception('append %s not-valid' % child.__class__.__name__)
@@ -345,7 +427,9 @@ class Element(object):
         objects = (objects,)
         for child in objects:
             if isinstance(child, Element):
-                self.children.insert(index, child)
+                if self._children is empty:
+                    self._children = []
+                self._children.insert(index, child)
                 child.parent = self
             else:
                 raise Exception('append %s not-valid' % child.__class__.__name__)
@@ -362,7 +446,7 @@ class Element(object):
         if isinstance(child, Element):
             return child.detach()
         if isinstance(child, Attribute):
-            self.attributes.remove(child)
+            self._attributes.remove(child)
         return None
 
     def replaceChild(self, child, content):
@@ -373,14 +457,14 @@ class Element(object):
         @param content: An element or collection of elements.
         @type content: L{Element} or [L{Element},]
         """
-        if child not in self.children:
+        if child not in self._children:
             raise Exception('child not-found')
-        index = self.children.index(child)
+        index = self._children.index(child)
         self.remove(child)
         if not isinstance(content, (list, tuple)):
             content = (content,)
         for node in content:
-            self.children.insert(index, node.detach())
+            self._children.insert(index, node.detach())
             node.parent = self
             index += 1
 
@@ -402,7 +486,7 @@ class Element(object):
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for a in self.attributes:
+        for a in self._attributes:
             if a.match(name, ns):
                 return a
         return default
@@ -425,7 +509,7 @@ class Element(object):
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        for c in self.children:
+        for c in self._children:
             if c.match(name, ns):
                 return c
         return default
@@ -487,7 +571,7 @@ class Element(object):
                 ns = None
             else:
                 ns = self.resolvePrefix(prefix)
-        return [c for c in self.children if c.match(name, ns)]
+        return [c for c in self._children if c.match(name, ns)]
 
     def detachChildren(self):
         """
@@ -496,7 +580,7 @@ class Element(object):
         @rtype: [L{Element},...]
         """
         detached = self.children
-        self.children = []
+        self._children = empty
         for child in detached:
             child.parent = None
         return detached
@@ -517,8 +601,8 @@ class Element(object):
         """
         n = self
         while n is not None:
-            if prefix in n.nsprefixes:
-                return (prefix, n.nsprefixes[prefix])
+            if prefix in n._nsprefixes:
+                return (prefix, n._nsprefixes[prefix])
             if prefix in self.specialprefixes:
                 return (prefix, self.specialprefixes[prefix])
             n = n.parent
@@ -548,9 +632,9 @@ class Element(object):
         @rtype: L{Element}
         @note: This method traverses down the entire branch!
         """
-        if p in self.nsprefixes:
-            self.nsprefixes[p] = u
-        for c in self.children:
+        if p in self._nsprefixes:
+            self._nsprefixes[p] = u
+        for c in self._children:
             c.updatePrefix(p, u)
         return self
 
@@ -562,8 +646,8 @@ class Element(object):
         @return: self
         @rtype: L{Element}
         """
-        if prefix in self.nsprefixes:
-            del self.nsprefixes[prefix]
+        if prefix in self._nsprefixes:
+            del self._nsprefixes[prefix]
         return self
 
     def findPrefix(self, uri, default=None):
@@ -578,7 +662,7 @@ class Element(object):
         @return: A mapped prefix.
         @rtype: str
         """
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             if item[1] == uri:
                 prefix = item[0]
                 return prefix
@@ -604,7 +688,7 @@ class Element(object):
         @rtype: [str,...]
         """
         result = []
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             if self.matcher[match](item[1], uri):
                 prefix = item[0]
                 result.append(prefix)
@@ -625,19 +709,19 @@ class Element(object):
         @return: self
         @rtype: L{Element}
         """
-        for c in self.children:
+        for c in self._children:
             c.promotePrefixes()
         if self.parent is None:
             return
-        for p, u in list(self.nsprefixes.items()):
-            if p in self.parent.nsprefixes:
-                pu = self.parent.nsprefixes[p]
+        for p, u in list(self._nsprefixes.items()):
+            if p in self.parent._nsprefixes:
+                pu = self.parent._nsprefixes[p]
                 if pu == u:
-                    del self.nsprefixes[p]
+                    del self._nsprefixes[p]
                 continue
             if p != self.parent.prefix:
                 self.parent.nsprefixes[p] = u
-                del self.nsprefixes[p]
+                del self._nsprefixes[p]
         return self
 
     def refitPrefixes(self):
@@ -647,14 +731,14 @@ class Element(object):
         @return: self
         @rtype: L{Element}
         """
-        for c in self.children:
+        for c in self._children:
             c.refitPrefixes()
         if self.prefix is not None:
             ns = self.resolvePrefix(self.prefix)
             if ns[1] is not None:
                 self.expns = ns[1]
         self.prefix = None
-        self.nsprefixes = {}
+        self._nsprefixes = unmapped
         return self
 
     def normalizePrefixes(self):
@@ -677,8 +761,8 @@ class Element(object):
         @return: True when element has not children.
         @rtype: boolean
         """
-        noattrs = not len(self.attributes)
-        nochildren = not len(self.children)
+        noattrs = not len(self._attributes)
+        nochildren = not len(self._children)
         notext = (self.text is None)
         nocontent = (nochildren and notext)
         if content:
@@ -746,7 +830,7 @@ class Element(object):
         result = []
         result.append('%s<%s' % (tab, self.qname()))
         result.append(self.nsdeclarations())
-        for a in [six.text_type(a) for a in self.attributes]:
+        for a in [six.text_type(a) for a in self._attributes]:
             result.append(' %s' % a)
         if self.isempty():
             result.append('/>')
@@ -754,10 +838,10 @@ class Element(object):
         result.append('>')
         if self.hasText():
             result.append(self.text.escape())
-        for c in self.children:
+        for c in self._children:
             result.append('\n')
             result.append(c.str(indent + 1))
-        if len(self.children):
+        if len(self._children):
             result.append('\n%s' % tab)
         result.append('</%s>' % self.qname())
         result = ''.join(result)
@@ -772,7 +856,7 @@ class Element(object):
         result = []
         result.append('<%s' % self.qname())
         result.append(self.nsdeclarations())
-        for a in [six.text_type(a) for a in self.attributes]:
+        for a in [six.text_type(a) for a in self._attributes]:
             result.append(' %s' % a)
         if self.isempty():
             result.append('/>')
@@ -780,7 +864,7 @@ class Element(object):
         result.append('>')
         if self.hasText():
             result.append(self.text.escape())
-        for c in self.children:
+        for c in self._children:
             result.append(c.plain())
         result.append('</%s>' % self.qname())
         result = ''.join(result)
@@ -803,7 +887,7 @@ class Element(object):
             if self.expns is not None:
                 d = ' xmlns="%s"' % self.expns
                 s.append(d)
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             (p, u) = item
             if self.parent is not None:
                 ns = self.parent.resolvePrefix(p)
@@ -840,7 +924,7 @@ class Element(object):
         @rtype: [L{Element},..]
         """
         branch = [self]
-        for c in self.children:
+        for c in self._children:
             branch += c.branch()
         return branch
 
@@ -866,7 +950,7 @@ class Element(object):
         @rtype: L{Element}
         """
         visitor(self)
-        for c in self.children:
+        for c in self._children:
             c.walk(visitor)
         return self
 
@@ -875,12 +959,12 @@ class Element(object):
         Prune the branch of empty nodes.
         """
         pruned = []
-        for c in self.children:
+        for c in self._children:
             c.prune()
             if c.isempty(False):
                 pruned.append(c)
         for p in pruned:
-            self.children.remove(p)
+            self._children.remove(p)
 
     def __childrenAtPath(self, parts):
         result = []
@@ -907,14 +991,14 @@ class Element(object):
         return result
 
     def __len__(self):
-        return len(self.children)
+        return len(self._children)
 
     def __getitem__(self, index):
         if isinstance(index, six.string_types):
             return self.get(index)
         else:
-            if index < len(self.children):
-                return self.children[index]
+            if index < len(self._children):
+                return self._children[index]
             else:
                 return None
 
@@ -922,9 +1006,26 @@ class Element(object):
         if isinstance(index, six.string_types):
             self.set(index, value)
         else:
-            if index < len(self.children) and \
+            if index < len(self._children) and \
                     isinstance(value, Element):
-                self.children.insert(index, value)
+                self._children.insert(index, value)
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        for k in Element.__slots__:
+            if hasattr(self, k):
+                state[k] = getattr(self, k)
+        return state
+
+    def __setstate__(self, state):
+        for k, v in state.items():
+            setattr(self, k, v)
+        if not len(self._children):
+            self._children = empty
+        if not len(self._attributes):
+            self._attributes = empty
+        if not len(self._nsprefixes):
+            self._nsprefixes = unmapped
 
     def __eq__(self, rhs):
         return rhs is not None and \
@@ -964,7 +1065,7 @@ class NodeIterator(object):
         @type parent: L{Element}
         """
         self.pos = 0
-        self.children = parent.children
+        self.children = parent._children
 
     def next(self):
         """
@@ -1040,7 +1141,7 @@ class PrefixNormalizer(object):
         @rtype: set
         """
         s = set()
-        for ns in n.nsprefixes.items():
+        for ns in n._nsprefixes.items():
             if self.permit(ns):
                 s.add(ns[1])
         return s
@@ -1083,7 +1184,7 @@ class PrefixNormalizer(object):
         @param n: A node.
         @type n: L{Element}
         """
-        for a in n.attributes:
+        for a in n._attributes:
             self.refitAddr(a)
 
     def refitAddr(self, a):
@@ -1118,7 +1219,7 @@ class PrefixNormalizer(object):
         Refit (normalize) all of the nsprefix mappings.
         """
         for n in self.branch:
-            n.nsprefixes = {}
+            n._nsprefixes = unmapped
         n = self.node
         for u, p in self.prefixes.items():
             n.addPrefix(p, u)
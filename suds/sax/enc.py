@@ -25,12 +25,21 @@ import six
 class Encoder(object):
     """
     An XML special character encoder/decoder.
+    Strings containing an I{&} are encoded in a single pass by the
+    combined (precompiled) I{encoding} pattern and the I{escapes}
+    table; others by C{str.replace} of only the special characters
+    present.
     @cvar encodings: A mapping of special characters encoding.
     @type encodings: [(str,str)]
     @cvar decodings: A mapping of special characters decoding.
     @type decodings: [(str,str)]
     @cvar special: A list of special characters
     @type special: [char]
+    @cvar encoding: The combined I{encodings} pattern.  An I{&} that
+        starts an entity is not matched (not re-escaped).
+    @type encoding: I{re.Pattern}
+    @cvar escapes: The special character replacement table.
+    @type escapes: dict
     """
 
     encodings = \
@@ -40,6 +49,12 @@ class Encoder(object):
     special = \
         ('&', '<', '>', '"', "'")
 
+    encoding = re.compile('|'.join([x[0] for x in encodings]))
+    escapes = dict(zip(special, [x[1] for x in encodings]))
+
+    def escape(self, match):
+        return self.escapes[match.group()]
+
     def needsEncoding(self, s):
         """
         Get whether string I{s} contains special characters.
@@ -59,12 +74,16 @@ class Encoder(object):
         Encode special characters found in string I{s}.
         @param s: A string to encode.
         @type s: str
-        @return: The encoded string.
+        @return: The encoded string; I{s} when nothing is encoded.
         @rtype: str
         """
-        if isinstance(s, six.string_types) and self.needsEncoding(s):
-            for x in self.encodings:
-                s = re.sub(x[0], x[1], s)
+        if not isinstance(s, six.string_types):
+            return s
+        if '&' in s:
+            return self.encoding.sub(self.escape, s)
+        for c in self.special:
+            if c in s:
+                s = s.replace(c, self.escapes[c])
         return s
 
     def decode(self, s):
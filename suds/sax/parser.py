@@ -28,15 +28,21 @@ containing the prefix and the URI.  Eg: I{('tns', 'http://myns')}
 
 from logging import getLogger
 from suds import metrics
+from suds.sax import intern
 from suds.sax.document import Document
 from suds.sax.element import Element
 from suds.sax.text import Text
 from suds.sax.attribute import Attribute
-from xml.sax import make_parser, InputSource, ContentHandler
+from xml.parsers import expat
+from xml.sax import make_parser, ContentHandler
 from xml.sax.handler import feature_external_ges
-from io import BytesIO
 import six
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
 log = getLogger(__name__)
 
 
@@ -48,32 +54,72 @@ class Handler(ContentHandler):
 
     def startElement(self, name, attrs):
         top = self.top()
-        node = Element(six.text_type(name))
-        for a in attrs.getNames():
-            n = six.text_type(a)
-            v = six.text_type(attrs.getValue(a))
-            attribute = Attribute(n, v)
-            if self.mapPrefix(node, attribute):
-                continue
-            node.append(attribute)
-        node.charbuffer = []
+        node = self.element(name, attrs)
         top.append(node)
         self.push(node)
 
+    def element(self, name, attrs):
+        """
+        Build the element for a I{start} event.  The I{xmlns}
+        attributes are mapped to namespace prefixes.
+        @param name: The (qualified) element name.
+        @type name: str
+        @param attrs: The (qualified) attribute names and values;
+            either sax I{Attributes} or a I{dict}.
+        @type attrs: dict
+        @return: The element.
+        @rtype: L{Element}
+        """
+        node = Element(name)
+        attributes = []
+        for n, v in attrs.items():
+            if self.xmlns(node, n, v):
+                continue
+            attribute = Attribute(n, v)
+            attribute.parent = node
+            attributes.append(attribute)
+        if attributes:
+            node.attributes = attributes
+        node.charbuffer = []
+        return node
+
+    def xmlns(self, node, name, value):
+        """
+        Map an I{xmlns} attribute to the (default) namespace or a
+        namespace prefix of the node.
+        @param node: The element.
+        @type node: L{Element}
+        @param name: The (qualified) attribute name.
+        @type name: str
+        @param value: The attribute value.
+        @type value: str
+        @return: True when mapped; the attribute is not to be added.
+        @rtype: bool
+        """
+        if name == 'xmlns':
+            if len(value):
+                node.expns = intern(value)
+            return True
+        if name.startswith('xmlns:'):
+            node.addPrefix(intern(name[6:]), intern(value))
+            return True
+        return False
+
     def mapPrefix(self, node, attribute):
-        skip = False
-        if attribute.name == 'xmlns':
-            if len(attribute.value):
-                node.expns = six.text_type(attribute.value)
-            skip = True
-        elif attribute.prefix == 'xmlns':
-            prefix = attribute.name
-            node.nsprefixes[prefix] = six.text_type(attribute.value)
-            skip = True
-        return skip
+        """
+        Map an I{xmlns} attribute to the (default) namespace or a
+        namespace prefix of the node.
+        @param node: The element.
+        @type node: L{Element}
+        @param attribute: An attribute.
+        @type attribute: L{Attribute}
+        @return: True when mapped; the attribute is not to be added.
+        @rtype: bool
+        """
+        return self.xmlns(
+            node, attribute.qname(), six.text_type(attribute.value))
 
     def endElement(self, name):
-        name = six.text_type(name)
         current = self.top()
         if len(current.charbuffer):
             current.text = Text(u''.join(current.charbuffer))
@@ -87,9 +133,7 @@ class Handler(ContentHandler):
             raise Exception('malformed document')
 
     def characters(self, content):
-        text = six.text_type(content)
-        node = self.top()
-        node.charbuffer.append(text)
+        self.nodes[-1].charbuffer.append(content)
 
     def push(self, node):
         self.nodes.append(node)
@@ -99,42 +143,290 @@ class Handler(ContentHandler):
         return self.nodes.pop()
 
     def top(self):
-        return self.nodes[len(self.nodes) - 1]
+        return self.nodes[-1]
+
+
+class Backend(object):
+    """
+    An (incremental) XML parser backend that reports the parse events
+    to a L{Handler}: startElement(), endElement() and characters()
+    using qualified names with the I{xmlns} declarations reported as
+    attributes.
+    @ivar handler: The handler.
+    @type handler: L{Handler}
+    """
+
+    def __init__(self, handler):
+        """
+        @param handler: The handler.
+        @type handler: L{Handler}
+        """
+        self.handler = handler
+
+    def feed(self, data):
+        """
+        Parse (more) XML.
+        @param data: Part of the XML document.
+        @type data: bytes
+        """
+        raise Exception('not-implemented')
+
+    def close(self):
+        """
+        Finish parsing the document.
+        """
+        raise Exception('not-implemented')
+
+    def parse(self, file):
+        """
+        Parse the document read from a file.
+        @param file: A python I{file-like} object.
+        @type file: I{file-like} object.
+        """
+        while True:
+            data = file.read(65536)
+            if not data:
+                break
+            self.feed(data)
+        self.close()
+
+
+class SaxBackend(Backend):
+    """
+    The (python) xml.sax backend.
+    """
+
+    def __init__(self, handler):
+        Backend.__init__(self, handler)
+        self.parser = make_parser()
+        self.parser.setFeature(feature_external_ges, 0)
+        self.parser.setContentHandler(handler)
+
+    def feed(self, data):
+        self.parser.feed(data)
+
+    def close(self):
+        self.parser.close()
+
+    def parse(self, file):
+        self.parser.parse(file)
+
+
+class ExpatBackend(Backend):
+    """
+    The (direct) expat backend.  The handler is called by the
+    expat parser without the overhead of the sax layer.
+    """
+
+    def __init__(self, handler):
+        Backend.__init__(self, handler)
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = handler.startElement
+        self.parser.EndElementHandler = handler.endElement
+        self.parser.CharacterDataHandler = handler.characters
+
+    def feed(self, data):
+        self.parser.Parse(data, False)
+
+    def close(self):
+        self.parser.Parse(b'', True)
+
+
+class LxmlBackend(Backend):
+    """
+    The (optional) lxml backend.  Prefixes of (qualified) attribute
+    names are looked up by namespace so the prefix may differ from the
+    document when a namespace is mapped to more than one prefix.
+    Elements are cleared once reported to keep memory flat.  Entities
+    are not resolved by lxml: (internal) entity references are replaced
+    by their (declared) value and external entities are skipped, as by
+    the sax and expat backends.
+    @ivar declared: The namespaces declared for the next element.
+    @type declared: [(prefix, uri),..]
+    @ivar scopes: The stack of in-scope {uri: prefix} mappings.
+    @type scopes: [dict,..]
+    @ivar entities: The values of the internal entities (by name) once
+        an entity reference is found.
+    @type entities: dict
+    """
+
+    xmlns = {'http://www.w3.org/XML/1998/namespace': 'xml'}
+
+    def __init__(self, handler):
+        if etree is None:
+            raise Exception('parser backend (lxml) requires lxml')
+        Backend.__init__(self, handler)
+        self.parser = etree.XMLPullParser(
+            events=('start-ns', 'start', 'end'),
+            no_network=True,
+            load_dtd=False,
+            resolve_entities=False)
+        self.declared = []
+        self.scopes = [self.xmlns]
+        self.entities = None
+
+    def feed(self, data):
+        self.parser.feed(data)
+        self.events()
+
+    def close(self):
+        self.parser.close()
+        self.events()
+
+    def events(self):
+        handler = self.handler
+        scopes = self.scopes
+        for event, item in self.parser.read_events():
+            if event == 'start':
+                attrs = {}
+                scope = scopes[-1]
+                if self.declared:
+                    scope = dict(scope)
+                    for prefix, uri in self.declared:
+                        if prefix:
+                            attrs['xmlns:%s' % prefix] = uri
+                            scope[uri] = prefix
+                        else:
+                            attrs['xmlns'] = uri
+                    self.declared = []
+                scopes.append(scope)
+                for name, value in item.attrib.items():
+                    attrs[self.qname(scope, name)] = value
+                handler.startElement(self.tag(item), attrs)
+            elif event == 'end':
+                text = [item.text or '']
+                for child in item:
+                    if child.tag is etree.Entity:
+                        text.append(self.entity(child))
+                    text.append(child.tail or '')
+                text = u''.join(text)
+                if text:
+                    handler.characters(text)
+                scopes.pop()
+                handler.endElement(self.tag(item))
+                item.clear(keep_tail=True)
+            else:
+                self.declared.append(item)
+
+    def entity(self, node):
+        """
+        Get the replacement text of an (unresolved) entity reference.
+        @param node: An entity (reference) node.
+        @type node: I{etree._Entity}
+        @return: The value of an internal entity, else an empty string.
+        @rtype: str
+        """
+        if self.entities is None:
+            self.entities = {}
+            dtd = node.getroottree().docinfo.internalDTD
+            if dtd is not None:
+                for declared in dtd.iterentities():
+                    if declared.system_url is None and declared.content is not None:
+                        self.entities[declared.name] = declared.content
+        return self.entities.get(node.name, '')
+
+    def qname(self, scope, name):
+        """
+        Get the (prefixed) name of an attribute.  The prefix is the one
+        bound to the namespace in the I{scope}.
+        """
+        if name[0] != '{':
+            return name
+        uri, name = name[1:].split('}', 1)
+        prefix = scope.get(uri)
+        if prefix is None:
+            return name
+        return ':'.join((prefix, name))
+
+    def tag(self, item):
+        """
+        Get the (prefixed) name of an element.  The prefix is the one
+        the element is written with: none for the default namespace,
+        even when the namespace is also bound to a prefix.
+        """
+        name = item.tag
+        if name[0] == '{':
+            name = name.split('}', 1)[1]
+        if item.prefix is None:
+            return name
+        return ':'.join((item.prefix, name))
 
 
 class Parser(object):
-    """ SAX Parser """
+    """
+    SAX Parser
+    @cvar backends: The parser backends by name.
+    @type backends: {str: L{Backend}}
+    @ivar backend: The name of the parser backend.
+    @type backend: str
+    """
+
+    backends = {
+        'sax': SaxBackend,
+        'expat': ExpatBackend,
+        'lxml': LxmlBackend,
+    }
+
+    def __init__(self, backend=None):
+        """
+        @param backend: The name of the parser backend (sax|expat|lxml).
+            Defaults to I{sax}.
+        @type backend: str
+        """
+        if backend is None:
+            backend = 'sax'
+        self.backend = backend
 
     @classmethod
     def saxparser(cls):
-        p = make_parser()
-        p.setFeature(feature_external_ges, 0)
+        """
+        Get a (python) xml.sax parser, with external entities disabled,
+        and the handler building the document.
+        @return: (parser, handler)
+        @rtype: (I{xml.sax.xmlreader.XMLReader}, L{Handler})
+        """
         h = Handler()
-        p.setContentHandler(h)
-        return (p, h)
+        return (SaxBackend(h).parser, h)
+
+    def open(self, handler=None):
+        """
+        Open an incremental parser.
+        @param handler: An optional sax handler (L{Handler} subclass).
+        @type handler: L{Handler}
+        @return: The parser backend.
+        @rtype: L{Backend}
+        """
+        backend = self.backends.get(self.backend)
+        if backend is None:
+            raise Exception('parser backend (%s) not-found' % self.backend)
+        if handler is None:
+            handler = Handler()
+        return backend(handler)
 
-    def parse(self, file=None, string=None):
+    def parse(self, file=None, string=None, handler=None):
         """
         SAX parse XML text.
         @param file: Parse a python I{file-like} object.
         @type file: I{file-like} object.
         @param string: Parse string XML.
         @type string: str
+        @param handler: An optional sax handler (L{Handler} subclass).
+        @type handler: L{Handler}
         """
         timer = metrics.Timer()
         timer.start()
-        sax, handler = self.saxparser()
+        backend = self.open(handler)
         if file is not None:
-            sax.parse(file)
+            backend.parse(file)
             timer.stop()
             metrics.log.debug('sax (%s) duration: %s', file, timer)
-            return handler.nodes[0]
+            return backend.handler.nodes[0]
         if string is not None:
             if isinstance(string, six.text_type):
                 string = string.encode("utf-8")
-            source = InputSource(None)
-            source.setByteStream(BytesIO(string))
-            sax.parse(source)
+            backend.feed(string)
+            backend.close()
             timer.stop()
             metrics.log.debug('%s\nsax duration: %s', string, timer)
-            return handler.nodes[0]
+            return backend.handler.nodes[0]
@@ -55,6 +55,8 @@ class Text(text_type):
         """
         if not self.escaped:
             post = sax.encoder.encode(self)
+            if post is self:
+                return self
             escaped = (post != self)
             return Text(post, lang=self.lang, escaped=escaped)
         return self
@@ -20,8 +20,19 @@ with the suds lib.  Also, contains classes for accessing
 these documents.
 """
 
-from six import StringIO
+import hashlib
+import mmap
+import os
+import posixpath
+import struct
+import tarfile
+import zipfile
+import zlib
+from threading import Lock
+from six import BytesIO, StringIO, text_type
+from six.moves import urllib
 from logging import getLogger
+from suds.plugin import DocumentPlugin
 
 log = getLogger(__name__)
 
@@ -591,3 +602,408 @@ class DocumentStore(object):
             return parts
         else:
             return (None, url)
+
+
+class Catalog(object):
+    """
+    An (OASIS XML Catalog style) mapping of the (remote) URLs of
+    documents to their locations in a L{CatalogStore}: I{uri} (and
+    I{system}) entries mapping a URL and I{rewriteURI} (and
+    I{rewriteSystem}) rules replacing the (longest) matching prefix of
+    a URL.  Locations are relative to the store directory or archive.
+        <catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+          <uri name="http://example.com/service?wsdl" uri="service.wsdl"/>
+          <rewriteURI uriStartString="http://example.com/xsd/" rewritePrefix="xsd/"/>
+        </catalog>
+    @cvar ns: The catalog namespace.
+    @type ns: str
+    @ivar uris: The locations by URL.
+    @type uris: {url: location}
+    @ivar rewrites: The rewrite rules: (URL prefix, location prefix).
+    @type rewrites: [(str, str),..]
+    """
+
+    ns = 'urn:oasis:names:tc:entity:xmlns:xml:catalog'
+
+    @classmethod
+    def parse(cls, content):
+        """
+        Parse a catalog document.
+        @param content: The catalog (XML) document.
+        @type content: bytes
+        @return: The catalog.
+        @rtype: L{Catalog}
+        """
+        from suds.sax.parser import Parser
+        catalog = cls()
+        root = Parser().parse(string=content).root()
+        for child in root.getChildren():
+            if child.name == 'uri':
+                catalog.add(child.get('name'), child.get('uri'))
+            elif child.name == 'system':
+                catalog.add(child.get('systemId'), child.get('uri'))
+            elif child.name == 'rewriteURI':
+                catalog.rewrite(child.get('uriStartString'), child.get('rewritePrefix'))
+            elif child.name == 'rewriteSystem':
+                catalog.rewrite(child.get('systemIdStartString'), child.get('rewritePrefix'))
+        return catalog
+
+    def __init__(self):
+        self.uris = {}
+        self.rewrites = []
+
+    def add(self, url, location):
+        """
+        Map a URL to a location.
+        @param url: A document URL.
+        @type url: str
+        @param location: The location of the document.
+        @type location: str
+        """
+        self.uris[url] = location
+
+    def rewrite(self, prefix, location):
+        """
+        Add a rule rewriting the URLs starting with the I{prefix}.
+        @param prefix: A URL prefix.
+        @type prefix: str
+        @param location: The location prefix replacing it.
+        @type location: str
+        """
+        self.rewrites.append((prefix, location))
+
+    def resolve(self, url):
+        """
+        Get the location of the document at the I{url}: the location it
+        is mapped to, else rewritten by the rule of the longest
+        matching prefix.
+        @param url: A document URL.
+        @type url: str
+        @return: The location or None when not in the catalog.
+        @rtype: str
+        """
+        location = self.uris.get(url)
+        if location is not None:
+            return location
+        matched = None
+        for prefix, replacement in self.rewrites:
+            if not url.startswith(prefix):
+                continue
+            if matched is None or len(prefix) > len(matched[0]):
+                matched = (prefix, replacement)
+        if matched is None:
+            return None
+        return matched[1] + url[len(matched[0]):]
+
+    def str(self):
+        """
+        Get the catalog (XML) document.
+        @rtype: str
+        """
+        from suds.sax.element import Element
+        root = Element('catalog', ns=(None, self.ns))
+        for url in sorted(self.uris):
+            entry = Element('uri')
+            entry.set('name', url)
+            entry.set('uri', self.uris[url])
+            root.append(entry)
+        for prefix, location in self.rewrites:
+            entry = Element('rewriteURI')
+            entry.set('uriStartString', prefix)
+            entry.set('rewritePrefix', location)
+            root.append(entry)
+        return '<?xml version="1.0" encoding="UTF-8"?>\n%s\n' % root.str()
+
+
+def normalized(location):
+    """
+    Normalize the location of a document in a store (directory or
+    archive).  Only relative locations within the store are valid.
+    @param location: A (/ separated) location.
+    @type location: str
+    @return: The normalized location.
+    @rtype: str
+    @raise Exception: When absolute or outside of the store.
+    """
+    path = posixpath.normpath(location.replace('\\', '/'))
+    drive = os.path.splitdrive(location)[0]
+    if drive or posixpath.isabs(path) or path == '..' or path.startswith('../'):
+        raise Exception('"%s" is not a location within the store' % location)
+    return path
+
+
+class Archive(object):
+    """
+    A (read only) zip or (not compressed) tar archive of documents.
+    The archive is indexed when opened and mapped into memory (mmap):
+    the members are read from the mapping and are not extracted.
+    Only I{stored} and I{deflated} (not encrypted) zip members are
+    supported.  The archive is closed by L{close} or as a context
+    manager.
+    @ivar path: The path of the archive.
+    @type path: str
+    @ivar map: The mapped archive.
+    @type map: I{mmap.mmap}
+    @ivar members: The (data) offset, size and compression of the
+        members by name.
+    @type members: {name: (int, int, int)}
+    """
+
+    def __init__(self, path):
+        """
+        @param path: The path of the archive.
+        @type path: str
+        """
+        self.path = path
+        self.members = {}
+        with open(path, 'rb') as fp:
+            self.map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if zipfile.is_zipfile(path):
+            self.index_zip()
+        else:
+            self.index_tar()
+        log.debug('archive (%s) mapped: %d members', path, len(self.members))
+
+    def index_zip(self):
+        """
+        Index the members of a zip archive.  The data of a member
+        follows its local header (and the name and extra field).
+        """
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.filename.endswith('/'):
+                    continue
+                if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                    raise Exception('"%s" in "%s" is not stored or deflated' % (info.filename, self.path))
+                if info.flag_bits & 0x1:
+                    raise Exception('"%s" in "%s" is encrypted' % (info.filename, self.path))
+                offset = info.header_offset
+                n, m = struct.unpack('<HH', self.map[offset + 26:offset + 30])
+                offset += 30 + n + m
+                self.members[info.filename] = (offset, info.compress_size, info.compress_type)
+
+    def index_tar(self):
+        """
+        Index the (regular file) members of a tar archive.
+        """
+        try:
+            archive = tarfile.open(self.path, 'r:')
+        except tarfile.ReadError:
+            raise Exception('"%s" is not a zip or (not compressed) tar archive' % self.path)
+        with archive:
+            for info in archive.getmembers():
+                if info.isfile():
+                    self.members[info.name] = (info.offset_data, info.size, zipfile.ZIP_STORED)
+
+    def read(self, name):
+        """
+        Read a member.
+        @param name: The name of the member.
+        @type name: str
+        @return: The content of the member.
+        @rtype: bytes
+        @raise KeyError: When not a member.
+        """
+        offset, size, compression = self.members[name]
+        content = self.map[offset:offset + size]
+        if compression == zipfile.ZIP_DEFLATED:
+            content = zlib.decompress(content, -15)
+        return content
+
+    def close(self):
+        """
+        Close (unmap) the archive.
+        """
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CatalogStore(DocumentStore):
+    """
+    A document store reading the documents mapped by a L{Catalog} from
+    a local directory or (zip or tar) L{Archive} so that a WSDL and
+    the documents it imports are loaded without the network.  The
+    built-in I{suds} documents are found as by the L{DocumentStore}.
+    The documents not in the catalog are read by the transport unless
+    the store is I{strict}.  Used by the I{store} option.
+        >>> store = CatalogStore('wsdl.zip', strict=True)
+        >>> client = Client(url, store=store)
+    The store is read only and shared by the (cloned) clients.  The
+    documents are read only from within the store directory (or
+    archive).  The archive is closed by L{close} or as a context
+    manager.
+    @ivar catalog: The catalog.
+    @type catalog: L{Catalog}
+    @ivar directory: The store directory (else None).
+    @type directory: str
+    @ivar archive: The store archive (else None).
+    @type archive: L{Archive}
+    @ivar strict: Documents not in the catalog are not read by the
+        transport (and fail to load).
+    @type strict: bool
+    """
+
+    def __init__(self, location, catalog=None, strict=False):
+        """
+        @param location: The path of the store directory or archive.
+        @type location: str
+        @param catalog: The catalog; read from the I{catalog.xml} of the
+            store when None.
+        @type catalog: L{Catalog}
+        @param strict: Documents not in the catalog are not read by the
+            transport.
+        @type strict: bool
+        """
+        if os.path.isdir(location):
+            self.directory = location
+            self.archive = None
+        else:
+            self.directory = None
+            self.archive = Archive(location)
+        if catalog is None:
+            catalog = Catalog.parse(self.read('catalog.xml'))
+        self.catalog = catalog
+        self.strict = strict
+
+    def open(self, url):
+        """
+        Open a document at the specified url.
+        @param url: A document URL.
+        @type url: str
+        @return: A file pointer to the document or None when not in the
+            store.
+        @rtype: file-like
+        @raise Exception: When (I{strict} and) not in the catalog.
+        """
+        fp = DocumentStore.open(self, url)
+        if fp is not None:
+            return fp
+        location = self.catalog.resolve(url)
+        if location is None:
+            if self.strict:
+                raise Exception('"%s" not in document catalog' % url)
+            return None
+        log.debug('(%s) read from: %s', url, location)
+        return BytesIO(self.read(location))
+
+    def read(self, location):
+        """
+        Read a document in the store.
+        @param location: The location of the document.
+        @type location: str
+        @return: The document.
+        @rtype: bytes
+        @raise Exception: When not a location within the store.
+        """
+        name = normalized(location)
+        if self.archive is not None:
+            try:
+                return self.archive.read(name)
+            except KeyError:
+                raise Exception('"%s" not in "%s"' % (location, self.archive.path))
+        path = os.path.join(self.directory, *name.split('/'))
+        with open(path, 'rb') as fp:
+            return fp.read()
+
+    def close(self):
+        """
+        Close the store (archive).
+        """
+        if self.archive is not None:
+            self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __deepcopy__(self, memo={}):
+        return self
+
+
+class Recorder(DocumentPlugin):
+    """
+    A document plugin recording the documents loaded (downloaded) by a
+    (live) load into a directory with their L{Catalog} for a
+    L{CatalogStore}.  The documents read from the cache are not loaded
+    (and not recorded): record with no cache.
+        >>> recorder = Recorder('wsdl')
+        >>> client = Client(url, cache=None, plugins=[recorder])
+        >>> recorder.save('wsdl.zip')
+    @ivar directory: The directory the documents are written to.
+    @type directory: str
+    @ivar catalog: The catalog of the documents recorded.
+    @type catalog: L{Catalog}
+    """
+
+    def __init__(self, directory):
+        """
+        @param directory: The directory the documents are written to.
+        @type directory: str
+        """
+        self.directory = directory
+        self.catalog = Catalog()
+        self.lock = Lock()
+
+    def loaded(self, context):
+        url = context.url
+        if DocumentStore().split(url)[0] == DocumentStore.protocol:
+            return
+        content = context.document
+        if isinstance(content, text_type):
+            content = content.encode('utf-8')
+        location = self.location(url)
+        path = os.path.join(self.directory, *location.split('/'))
+        with self.lock:
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as fp:
+                fp.write(content)
+            self.catalog.add(url, location)
+        log.debug('(%s) recorded: %s', url, location)
+
+    def location(self, url):
+        """
+        Get the location a document is recorded at: the host and path
+        of its URL (and a digest of the query).
+        @param url: A document URL.
+        @type url: str
+        @rtype: str
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path
+        if not path or path.endswith('/'):
+            path += 'index.xml'
+        if parts.query:
+            root, ext = os.path.splitext(path)
+            digest = hashlib.md5(parts.query.encode('utf-8')).hexdigest()[:8]
+            path = '%s-%s%s' % (root, digest, ext or '.xml')
+        names = [parts.netloc.replace(':', '_')] + path.split('/')
+        return '/'.join([n for n in names if n not in ('', '.', '..')])
+
+    def save(self, archive=None):
+        """
+        Write the catalog (I{catalog.xml}) of the documents recorded to
+        the directory and (optionally) a zip archive of the directory.
+        @param archive: The path of the zip archive.
+        @type archive: str
+        @return: The catalog.
+        @rtype: L{Catalog}
+        """
+        with self.lock:
+            content = self.catalog.str().encode('utf-8')
+            with open(os.path.join(self.directory, 'catalog.xml'), 'wb') as fp:
+                fp.write(content)
+            if archive is not None:
+                with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    zf.writestr('catalog.xml', content)
+                    for location in sorted(set(self.catalog.uris.values())):
+                        path = os.path.join(self.directory, *location.split('/'))
+                        zf.write(path, location)
+        return self.catalog
@@ -37,6 +37,9 @@ class Request(object):
     @type message: str
     @ivar headers: The http headers to be used for the request.
     @type headers: dict
+    @ivar stream: Whether the reply message may be returned as an
+        (open) input stream rather than read.
+    @type stream: bool
     """
 
     def __init__(self, url, message=None):
@@ -54,6 +57,7 @@ class Request(object):
         self.url = url
         self.headers = {}
         self.message = message
+        self.stream = False
 
     def __str__(self):
         s = []
@@ -69,8 +73,9 @@ class Reply(object):
     A transport reply
     @ivar code: The http code returned.
     @type code: int
-    @ivar message: The message to be sent in a POST request.
-    @type message: str
+    @ivar message: The reply message; an input stream when
+        requested by L{Request.stream}.
+    @type message: (str|stream)
     @ivar headers: The http headers to be used for the request.
     @type headers: dict
     """
@@ -93,7 +98,10 @@ class Reply(object):
         s.append('CODE: %s' % self.code)
         s.append('HEADERS: %s' % self.headers)
         s.append('MESSAGE:')
-        s.append(self.message.decode("utf-8"))
+        if isinstance(self.message, six.binary_type):
+            s.append(self.message.decode("utf-8"))
+        else:
+            s.append('<stream>')
         return '\n'.join(s)
 
 
@@ -0,0 +1,455 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Contains the asynchronous (asyncio) transport interface and
+an HTTP implementation.  Requires python 3.7.
+"""
+
+import asyncio
+import base64
+import ssl
+import time
+from io import BytesIO
+from http.client import parse_headers, RemoteDisconnected
+from http.cookiejar import CookieJar
+from urllib.parse import urlsplit
+from urllib.request import Request as U2Request
+from suds.transport import TransportError, Reply
+from suds.properties import Unskin
+from logging import getLogger
+
+log = getLogger(__name__)
+
+# The errors of a reused connection that the server closed while idle,
+# raised while sending the request ...
+SEND_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+# ... or in place of the status line of the response.
+STATUS_ERRORS = (RemoteDisconnected,)
+
+
+class AsyncTransport(object):
+    """
+    The asynchronous transport I{interface}; the counterpart of
+    L{suds.transport.Transport} whose methods are coroutines.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        from suds.transport.options import Options
+        self.options = Options()
+        del Options
+
+    async def open(self, request):
+        """
+        Open the url in the specified request.
+        @param request: A transport request.
+        @type request: L{suds.transport.Request}
+        @return: An input stream.
+        @rtype: stream
+        @raise TransportError: On all transport errors.
+        """
+        raise Exception('not-implemented')
+
+    async def send(self, request):
+        """
+        Send soap message.  Implementations are expected to handle:
+            - proxies
+            - I{http} headers
+            - cookies
+            - sending message
+            - brokering exceptions into L{TransportError}
+        @param request: A transport request.
+        @type request: L{suds.transport.Request}
+        @return: The reply
+        @rtype: L{Reply}
+        @raise TransportError: On all transport errors.
+        """
+        raise Exception('not-implemented')
+
+    async def close(self):
+        """
+        Release resources (connections) held by the transport.
+        """
+        pass
+
+
+class Response(object):
+    """
+    A received http response.
+    @ivar status: The http status code.
+    @type status: int
+    @ivar reason: The http reason phrase.
+    @type reason: str
+    @ivar headers: The http headers.
+    @type headers: L{http.client.HTTPMessage}
+    @ivar body: The response body.
+    @type body: bytes
+    @ivar reusable: Whether the connection may be reused.
+    @type reusable: bool
+    """
+
+    def __init__(self, status, reason, headers, body, reusable):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.reusable = reusable
+
+    def info(self):
+        return self.headers
+
+
+class Connection(object):
+    """
+    An open (keep-alive) connection.
+    @ivar reader: The stream reader.
+    @type reader: L{asyncio.StreamReader}
+    @ivar writer: The stream writer.
+    @type writer: L{asyncio.StreamWriter}
+    @ivar loop: The event loop the streams are bound to.
+    @ivar stamp: When the connection became idle.
+    @type stamp: float
+    """
+
+    def __init__(self, reader, writer, loop):
+        self.reader = reader
+        self.writer = writer
+        self.loop = loop
+        self.stamp = time.time()
+
+    def usable(self, loop, timeout):
+        """
+        Get whether the idle connection may be reused.
+        @param loop: The current event loop.
+        @param timeout: The idle timeout (seconds).
+        @type timeout: float
+        @rtype: bool
+        """
+        if self.loop is not loop:
+            return False
+        if time.time() - self.stamp > timeout:
+            return False
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return True
+
+    def close(self):
+        if not self.loop.is_closed():
+            self.writer.close()
+
+
+class AsyncHttpTransport(AsyncTransport):
+    """
+    HTTP transport using asyncio streams.  Provides keep-alive connections,
+    cookies, (http) proxies and basic authentication, honoring the
+    same transport options as L{suds.transport.http.HttpTransport}.
+    Credentials are sent preemptively.
+    @ivar cookiejar: The cookie jar.
+    @type cookiejar: L{CookieJar}
+    @ivar idle: The idle connections: {key: [L{Connection},..]}
+    @type idle: dict
+    """
+
+    def __init__(self, **kwargs):
+        """
+        @param kwargs: Keyword arguments.
+            - B{proxy} - An http proxy to be specified on requests.
+                 The proxy is defined as {protocol:proxy,}
+                    - type: I{dict}
+                    - default: {}
+            - B{timeout} - Set the url open timeout (seconds).
+                    - type: I{float}
+                    - default: 90
+            - B{username} - The username used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{password} - The password used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{unverified_context} - Use an unverified context for the
+                 connection, i.e. disabling HTTPS certificate validation.
+                    - type: I{bool}
+                    - default: False
+            - B{max_per_host} - The maximum number of idle connections
+                 kept per host.
+                    - type: I{int}
+                    - default: 4
+            - B{idle_timeout} - The number of seconds an idle connection
+                 is kept before it is closed.
+                    - type: I{float}
+                    - default: 60
+        """
+        AsyncTransport.__init__(self)
+        Unskin(self.options).update(kwargs)
+        self.cookiejar = CookieJar()
+        self.idle = {}
+
+    async def open(self, request):
+        log.debug('opening (%s)', request.url)
+        response = await self.request('GET', request, None)
+        if not 200 <= response.status < 300:
+            raise TransportError(
+                response.reason, response.status, BytesIO(response.body))
+        return BytesIO(response.body)
+
+    async def send(self, request):
+        log.debug('sending:\n%s', request)
+        response = await self.request('POST', request, request.message)
+        if not 200 <= response.status < 300:
+            raise TransportError(
+                response.reason, response.status, BytesIO(response.body))
+        result = Reply(200, dict(response.headers.items()), response.body)
+        log.debug('received:\n%s', result)
+        return result
+
+    async def close(self):
+        idle = self.idle
+        self.idle = {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    async def request(self, method, request, body):
+        """
+        Perform an http request, handling cookies and credentials.
+        @param method: The http method.
+        @type method: str
+        @param request: A transport request.
+        @type request: L{suds.transport.Request}
+        @param body: The request body.
+        @type body: bytes
+        @return: The response.
+        @rtype: L{Response}
+        @raise TransportError: On connection failures.
+        """
+        u2request = U2Request(request.url, body, request.headers)
+        self.cookiejar.add_cookie_header(u2request)
+        headers = dict(u2request.header_items())
+        self.addcredentials(headers)
+        request.headers.update(headers)
+        try:
+            response = await asyncio.wait_for(
+                self.exchange(method, request.url, headers, body),
+                self.options.timeout)
+        except asyncio.TimeoutError:
+            raise TransportError('timed out', None)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            raise TransportError(str(e), None)
+        self.cookiejar.extract_cookies(response, u2request)
+        return response
+
+    def addcredentials(self, headers):
+        credentials = (self.options.username, self.options.password)
+        if None in credentials:
+            return
+        encoded = base64.b64encode(':'.join(credentials).encode('utf-8'))
+        headers['Authorization'] = 'Basic %s' % encoded.decode('ascii')
+
+    async def exchange(self, method, url, headers, body):
+        """
+        Send the request and read the response on a pooled connection.
+        A request is retried once on a new connection only when the
+        reused connection turns out to have been closed by the server
+        while idle (see L{AsyncHttpTransport.roundtrip}).  Any other
+        error, notably a timeout, is raised without resending.
+        @return: The response.
+        @rtype: L{Response}
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = parts.path or '/'
+        if parts.query:
+            target = '%s?%s' % (target, parts.query)
+        proxy = self.options.proxy.get(scheme)
+        if proxy and scheme == 'http':
+            target = url
+        key = (scheme, host, port)
+        headers = dict(headers)
+        headers.setdefault('Host', parts.netloc)
+        headers['Content-Length'] = str(len(body or b''))
+        headers['Connection'] = 'keep-alive'
+        lines = ['%s %s HTTP/1.1' % (method, target)]
+        lines.extend(['%s: %s' % h for h in headers.items()])
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        conn = self.checkout(key)
+        if conn is not None:
+            response = await self.roundtrip(
+                key, conn, method, head, body, reused=True)
+            if response is not None:
+                return response
+        conn = await self.connect(scheme, host, port, proxy)
+        return await self.roundtrip(key, conn, method, head, body)
+
+    async def roundtrip(self, key, conn, method, head, body, reused=False):
+        """
+        Send the request on the specified connection and read the response.
+        @param reused: The connection was taken from the pool.
+        @type reused: bool
+        @return: The response, or None when the reused connection was
+            found closed by the server before any of the response arrived:
+            the request could not be sent (L{SEND_ERRORS}) or no status
+            line was received (L{STATUS_ERRORS}).
+        @rtype: L{Response}
+        """
+        sent = False
+        try:
+            conn.writer.write(head)
+            if body:
+                conn.writer.write(body)
+            await conn.writer.drain()
+            sent = True
+            response = await self.read(conn.reader, method)
+        except SEND_ERRORS as e:
+            conn.close()
+            if reused and (isinstance(e, STATUS_ERRORS) or not sent):
+                log.debug('reused connection to (%s) closed: %s', key[1], e)
+                return None
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        if response.reusable:
+            self.checkin(key, conn)
+        else:
+            conn.close()
+        return response
+
+    async def connect(self, scheme, host, port, proxy):
+        """
+        Open a new connection, tunnelling through the proxy for https.
+        @return: The connection.
+        @rtype: L{Connection}
+        """
+        loop = asyncio.get_running_loop()
+        context = None
+        if scheme == 'https':
+            if self.options.unverified_context:
+                context = ssl._create_unverified_context()
+            else:
+                context = ssl.create_default_context()
+        if not proxy:
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=context)
+            return Connection(reader, writer, loop)
+        location = proxy.split('://')[-1].rstrip('/')
+        phost, sep, pport = location.partition(':')
+        if context is None:
+            reader, writer = await asyncio.open_connection(phost, int(pport or 80))
+            return Connection(reader, writer, loop)
+        # The tunnel is opened on a bare transport wrapped by the loop
+        # (StreamWriter.start_tls() requires python 3.11) and with no
+        # StreamWriter which would close it when collected.
+        reader = asyncio.StreamReader()
+        transport, protocol = await loop.create_connection(
+            lambda: asyncio.StreamReaderProtocol(reader), phost, int(pport or 80))
+        tunnel = '%s:%d' % (host, port)
+        head = 'CONNECT %s HTTP/1.1\r\nHost: %s\r\n\r\n' % (tunnel, tunnel)
+        try:
+            transport.write(head.encode('latin-1'))
+            response = await self.read(reader, 'CONNECT')
+            if response.status != 200:
+                raise TransportError(
+                    response.reason, response.status, BytesIO(response.body))
+            reader = asyncio.StreamReader()
+            protocol = asyncio.StreamReaderProtocol(reader)
+            transport = await loop.start_tls(
+                transport, protocol, context, server_hostname=host)
+        except BaseException:
+            transport.close()
+            raise
+        protocol.connection_made(transport)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        return Connection(reader, writer, loop)
+
+    async def read(self, reader, method):
+        """
+        Read an http response.
+        @param reader: The stream reader.
+        @type reader: L{asyncio.StreamReader}
+        @param method: The http method of the request.
+        @type method: str
+        @return: The response.
+        @rtype: L{Response}
+        """
+        line = await reader.readline()
+        if not line:
+            raise RemoteDisconnected('connection closed by server')
+        parts = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        version, status = parts[0], int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ''
+        head = []
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            head.append(line)
+        headers = parse_headers(BytesIO(b''.join(head)))
+        reusable = version == 'HTTP/1.1'
+        connection = headers.get('Connection', '').lower()
+        if connection == 'close':
+            reusable = False
+        elif connection == 'keep-alive':
+            reusable = True
+        if method in ('HEAD', 'CONNECT') or status in (204, 304) or status < 200:
+            return Response(status, reason, headers, b'', reusable)
+        if headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                body.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(body)
+        elif headers.get('Content-Length') is not None:
+            body = await reader.readexactly(int(headers['Content-Length']))
+        else:
+            body = await reader.read()
+            reusable = False
+        return Response(status, reason, headers, body, reusable)
+
+    def checkout(self, key):
+        """
+        Get an idle connection for the key.
+        @return: A connection or None.
+        @rtype: L{Connection}
+        """
+        loop = asyncio.get_running_loop()
+        connections = self.idle.get(key, [])
+        while connections:
+            conn = connections.pop()
+            if conn.usable(loop, self.options.idle_timeout):
+                return conn
+            conn.close()
+        return None
+
+    def checkin(self, key, conn):
+        """
+        Return a connection to the idle pool.
+        """
+        connections = self.idle.setdefault(key, [])
+        if len(connections) < self.options.max_per_host:
+            conn.stamp = time.time()
+            connections.append(conn)
+        else:
+            conn.close()
@@ -55,7 +55,7 @@ class HttpTransport(Transport):
         try:
             url = request.url
             log.debug('opening (%s)', url)
-            u2request = urllib.request.Request(url)
+            u2request = urllib.request.Request(url, headers=request.headers)
             self.proxy = self.options.proxy
             return self.u2open(u2request)
         except urllib.error.HTTPError as e:
@@ -74,7 +74,10 @@ class HttpTransport(Transport):
             log.debug('sending:\n%s', request)
             fp = self.u2open(u2request)
             self.getcookies(fp, u2request)
-            result = Reply(200, fp.headers.__dict__, fp.read())
+            if request.stream:
+                result = Reply(200, fp.headers.__dict__, fp)
+            else:
+                result = Reply(200, fp.headers.__dict__, fp.read())
             log.debug('received:\n%s', result)
         except urllib.error.HTTPError as e:
             if e.code in (202, 204):
@@ -47,6 +47,14 @@ class Options(Skin):
              connection, i.e. disabling HTTPS certificate validation.
                 - type: I{bool}
                 - default: False
+        - B{max_per_host} - The maximum number of idle (keep-alive)
+             connections kept per host by pooling transports.
+                - type: I{int}
+                - default: 4
+        - B{idle_timeout} - The number of seconds an idle (keep-alive)
+             connection is kept by pooling transports before it is closed.
+                - type: I{float}
+                - default: 60
     """
     def __init__(self, **kwargs):
         domain = __name__
@@ -56,6 +64,8 @@ class Options(Skin):
             Definition('headers', dict, {}),
             Definition('username', six.string_types, None),
             Definition('password', six.string_types, None),
-            Definition('unverified_context', bool, False)
+            Definition('unverified_context', bool, False),
+            Definition('max_per_host', int, 4),
+            Definition('idle_timeout', (int, float), 60),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
@@ -0,0 +1,372 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Contains classes for a persistent (keep-alive) connection pooling
+HTTP transport implementation.
+"""
+
+from six.moves import urllib
+from six.moves import http_client
+from suds.transport.http import HttpTransport
+from suds.transport.https import HttpAuthenticated
+from threading import Lock
+from select import select
+from logging import getLogger
+import time
+
+log = getLogger(__name__)
+
+# The errors of a reused connection that the server closed while idle,
+# raised while sending the request ...
+SEND_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+# ... or in place of the status line of the response.
+STATUS_ERRORS = (http_client.RemoteDisconnected, http_client.BadStatusLine)
+
+
+class ConnectionPool(object):
+    """
+    A thread safe pool of idle (keep-alive) http connections.
+    Connections are keyed by (scheme, host, tunnel host).
+    @ivar maxsize: The maximum number of idle connections kept per key.
+    @type maxsize: int
+    @ivar timeout: The number of seconds an idle connection is kept.
+    @type timeout: float
+    @ivar idle: The idle connections: {key: [(connection, stamp),..]}
+    @type idle: dict
+    """
+
+    def __init__(self, maxsize=4, timeout=60):
+        """
+        @param maxsize: The maximum number of idle connections kept per key.
+        @type maxsize: int
+        @param timeout: The number of seconds an idle connection is kept.
+        @type timeout: float
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = Lock()
+
+    def get(self, key):
+        """
+        Get an idle connection.  Expired and stale connections are closed.
+        @param key: The connection key.
+        @type key: tuple
+        @return: An idle connection or None when none is available.
+        @rtype: L{http_client.HTTPConnection}
+        """
+        now = time.time()
+        dead = []
+        result = None
+        self.lock.acquire()
+        try:
+            connections = self.idle.get(key, [])
+            while connections:
+                conn, stamp = connections.pop()
+                if now - stamp > self.timeout:
+                    dead.append(conn)
+                    dead.extend([c[0] for c in connections])
+                    del connections[:]
+                    break
+                if self.stale(conn):
+                    dead.append(conn)
+                    continue
+                result = conn
+                break
+        finally:
+            self.lock.release()
+        for conn in dead:
+            conn.close()
+        return result
+
+    def put(self, key, conn):
+        """
+        Return a connection to the pool.  The connection is closed
+        when the pool for the I{key} is full.
+        @param key: The connection key.
+        @type key: tuple
+        @param conn: A connection.
+        @type conn: L{http_client.HTTPConnection}
+        """
+        self.lock.acquire()
+        try:
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.maxsize:
+                connections.append((conn, time.time()))
+                return
+        finally:
+            self.lock.release()
+        conn.close()
+
+    def clear(self):
+        """
+        Close all idle connections.
+        """
+        self.lock.acquire()
+        try:
+            idle = self.idle
+            self.idle = {}
+        finally:
+            self.lock.release()
+        for connections in idle.values():
+            for conn, stamp in connections:
+                conn.close()
+
+    def stale(self, conn):
+        """
+        Get whether an idle connection has been closed (or written to)
+        by the server.  An idle socket must never be readable.
+        @param conn: A connection.
+        @type conn: L{http_client.HTTPConnection}
+        @rtype: bool
+        """
+        if conn.sock is None:
+            return True
+        try:
+            readable = select([conn.sock], [], [], 0)[0]
+            return len(readable) > 0
+        except Exception:
+            return True
+
+    def __len__(self):
+        return sum([len(c) for c in self.idle.values()])
+
+
+class PooledResponse(http_client.HTTPResponse):
+    """
+    An http response that returns its connection to the pool once the
+    body has been completely read.
+    @ivar release: A callback (reusable) invoked when the response
+        no longer needs the connection.
+    @type release: callable
+    @ivar reusable: Whether the connection may be reused.
+    @type reusable: bool
+    """
+
+    release = None
+    reusable = True
+
+    def close(self):
+        if self.fp is not None:
+            # the body has not been consumed.
+            self.reusable = False
+        http_client.HTTPResponse.close(self)
+
+    def _close_conn(self):
+        http_client.HTTPResponse._close_conn(self)
+        release, self.release = self.release, None
+        if release is not None:
+            release(self.reusable and not self.will_close)
+
+
+class PoolMixin(object):
+    """
+    Opens urllib requests on pooled keep-alive connections.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    """
+
+    def pooled_open(self, http_class, req, **http_conn_args):
+        """
+        Open the request on an idle connection from the pool, else on a
+        new connection.  A request is retried once on a new connection
+        only when the reused connection turns out to have been closed by
+        the server while idle (see L{PoolMixin.request}).  Any other
+        error, notably a timeout, is raised without resending.
+        @param http_class: The connection class.
+        @type http_class: L{http_client.HTTPConnection}
+        @param req: A urllib request.
+        @type req: urllib.request.Request
+        @return: The response.
+        @rtype: L{PooledResponse}
+        """
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+        key = (req.type, host, req._tunnel_host)
+        conn = self.pool.get(key)
+        try:
+            if conn is not None:
+                log.debug('reusing connection to (%s)', host)
+                conn.timeout = req.timeout
+                conn.sock.settimeout(req.timeout)
+                response = self.request(key, conn, req, reused=True)
+                if response is not None:
+                    return response
+            conn = http_class(host, timeout=req.timeout, **http_conn_args)
+            conn.response_class = PooledResponse
+            return self.request(key, conn, req)
+        except OSError as e:
+            raise urllib.error.URLError(e)
+
+    def request(self, key, conn, req, reused=False):
+        """
+        Send the request on the specified connection.
+        @param key: The connection key.
+        @type key: tuple
+        @param conn: A connection.
+        @type conn: L{http_client.HTTPConnection}
+        @param req: A urllib request.
+        @type req: urllib.request.Request
+        @param reused: The connection was taken from the pool.
+        @type reused: bool
+        @return: The response, or None when the reused connection was
+            found closed by the server before any of the response arrived:
+            the request could not be sent (L{SEND_ERRORS}) or no status
+            line was received (L{STATUS_ERRORS}).
+        @rtype: L{PooledResponse}
+        """
+        headers = dict(req.unredirected_hdrs)
+        headers.update(
+            dict([(k, v) for k, v in req.headers.items() if k not in headers]))
+        headers['Connection'] = 'keep-alive'
+        headers = dict([(k.title(), v) for k, v in headers.items()])
+        if req._tunnel_host:
+            tunnel = {}
+            auth = 'Proxy-Authorization'
+            if auth in headers:
+                tunnel[auth] = headers.pop(auth)
+            if conn.sock is None:
+                conn.set_tunnel(req._tunnel_host, headers=tunnel)
+        sent = False
+        try:
+            conn.request(req.get_method(), req.selector, req.data, headers)
+            sent = True
+            response = conn.getresponse()
+        except SEND_ERRORS + STATUS_ERRORS as e:
+            conn.close()
+            if reused and (isinstance(e, STATUS_ERRORS) or not sent):
+                log.debug('reused connection to (%s) closed: %s', conn.host, e)
+                return None
+            raise
+        except:
+            conn.close()
+            raise
+
+        def release(reusable):
+            if reusable and conn.sock is not None:
+                self.pool.put(key, conn)
+            else:
+                conn.close()
+        response.release = release
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+
+class PooledHTTPHandler(PoolMixin, urllib.request.HTTPHandler):
+    """
+    A urllib I{http} handler using pooled connections.
+    """
+
+    def __init__(self, pool):
+        urllib.request.HTTPHandler.__init__(self)
+        self.pool = pool
+
+    def http_open(self, req):
+        return self.pooled_open(http_client.HTTPConnection, req)
+
+
+class PooledHTTPSHandler(PoolMixin, urllib.request.HTTPSHandler):
+    """
+    A urllib I{https} handler using pooled connections.
+    """
+
+    def __init__(self, pool, context=None):
+        urllib.request.HTTPSHandler.__init__(self, context=context)
+        self.pool = pool
+        self.context = context
+
+    def https_open(self, req):
+        return self.pooled_open(
+            http_client.HTTPSConnection, req, context=self.context)
+
+
+class PooledHttpAuthenticated(HttpAuthenticated):
+    """
+    A drop-in replacement for L{HttpAuthenticated} that keeps connections
+    alive and reuses them for subsequent requests to the same host, saving
+    the TCP and TLS handshakes.  Cookies, proxies, authentication and the
+    timeout are handled as by L{HttpAuthenticated}.
+    @ivar pool: The connection pool.
+    @type pool: L{ConnectionPool}
+    """
+
+    def __init__(self, **kwargs):
+        """
+        @param kwargs: Keyword arguments.
+            - B{proxy} - An http proxy to be specified on requests.
+                 The proxy is defined as {protocol:proxy,}
+                    - type: I{dict}
+                    - default: {}
+            - B{timeout} - Set the url open timeout (seconds).
+                    - type: I{float}
+                    - default: 90
+            - B{username} - The username used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{password} - The password used for http authentication.
+                    - type: I{str}
+                    - default: None
+            - B{unverified_context} - Use an unverified context for the
+                 connection, i.e. disabling HTTPS certificate validation.
+                    - type: I{bool}
+                    - default: False
+            - B{max_per_host} - The maximum number of idle connections
+                 kept per host.
+                    - type: I{int}
+                    - default: 4
+            - B{idle_timeout} - The number of seconds an idle connection
+                 is kept before it is closed.
+                    - type: I{float}
+                    - default: 60
+        """
+        HttpAuthenticated.__init__(self, **kwargs)
+        self.pool = ConnectionPool()
+        self.opener = None
+        self.openedproxy = None
+
+    def u2opener(self):
+        """
+        Get the (cached) urllib opener.  The opener is rebuilt only when
+        the proxy settings change so the pooled handlers are kept.
+        @return: An opener.
+        @rtype: I{OpenerDirector}
+        """
+        if self.urlopener is not None:
+            return self.urlopener
+        self.pool.maxsize = self.options.max_per_host
+        self.pool.timeout = self.options.idle_timeout
+        proxy = dict(self.proxy)
+        if self.opener is None or proxy != self.openedproxy:
+            self.opener = urllib.request.build_opener(*self.u2handlers())
+            self.openedproxy = proxy
+        return self.opener
+
+    def u2handlers(self):
+        handlers = HttpTransport.u2handlers(self)
+        handlers.append(urllib.request.HTTPBasicAuthHandler(self.pm))
+        handlers.append(PooledHTTPHandler(self.pool))
+        context = getattr(self.HTTPSHandler, '_context', None)
+        handlers.append(PooledHTTPSHandler(self.pool, context=context))
+        return handlers
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        self.pool.clear()
@@ -30,6 +30,13 @@ log = getLogger(__name__)
 
 reserved = {'class': 'cls', 'def': 'dfn', }
 
+#
+# Add core extensions
+# children = The number of child nodes when not kept
+#     in the (streamed) node.
+#
+Content.extensions.append('children')
+
 
 class Core(object):
     """
@@ -80,11 +87,14 @@ class Core(object):
         @rtype: I{any}
         """
         node = content.node
-        if len(node.children) and node.hasText():
+        children = content.children
+        if children is None:
+            children = len(node.children)
+        if children and node.hasText():
             return node
         attributes = AttrList(node.attributes)
         if attributes.rlen() and \
-                not len(node.children) and \
+                not children and \
                 node.hasText():
             p = Factory.property(node.name, node.getText())
             return merge(content.data, p)
@@ -93,7 +103,7 @@ class Core(object):
         lang = attributes.lang()
         if content.node.isnil():
             return None
-        if not len(node.children) and content.text is None:
+        if not children and content.text is None:
             if self.nillable(content):
                 return None
             else:
@@ -139,21 +149,34 @@ class Core(object):
         for child in content.node:
             cont = Content(child)
             cval = self.append(cont)
-            key = reserved.get(child.name, child.name)
-            if key in content.data:
-                v = getattr(content.data, key)
-                if isinstance(v, list):
-                    v.append(cval)
-                else:
-                    setattr(content.data, key, [v, cval])
-                continue
-            if self.unbounded(cont):
-                if cval is None:
-                    setattr(content.data, key, [])
-                else:
-                    setattr(content.data, key, [cval, ])
+            self.append_child(content, cont, cval)
+
+    def append_child(self, content, cont, cval):
+        """
+        Append an unmarshalled child into L{Content.data}
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @param cont: The child content.
+        @type cont: L{Content}
+        @param cval: The unmarshalled child value.
+        @type cval: I{any}
+        """
+        name = cont.node.name
+        key = reserved.get(name, name)
+        if key in content.data:
+            v = getattr(content.data, key)
+            if isinstance(v, list):
+                v.append(cval)
             else:
-                setattr(content.data, key, cval)
+                setattr(content.data, key, [v, cval])
+            return
+        if self.unbounded(cont):
+            if cval is None:
+                setattr(content.data, key, [])
+            else:
+                setattr(content.data, key, [cval, ])
+        else:
+            setattr(content.data, key, cval)
 
     def append_text(self, content):
         """
@@ -0,0 +1,292 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+
+"""
+Provides classes for I{streaming} (sax event driven) unmarshalling.
+The reply content is unmarshalled as it is parsed so that the
+(full) element tree is never built.
+"""
+
+from logging import getLogger
+from suds.sax.parser import Handler
+from suds.sax.text import Text
+from suds.sudsobject import Factory
+from suds.umx import Content
+
+log = getLogger(__name__)
+
+envns = ('SOAP-ENV', 'http://schemas.xmlsoap.org/soap/envelope/')
+
+
+class Unstreamable(Exception):
+    """
+    The reply cannot be unmarshalled while parsing (eg: multiref or
+    mixed content).
+    """
+    pass
+
+
+class Frame(object):
+    """
+    An element being unmarshalled.
+    @ivar content: The content being unmarshalled.
+    @type content: L{Content}
+    @ivar children: The number of child elements.
+    @type children: int
+    """
+
+    __slots__ = ('content', 'children')
+
+    def __init__(self, content):
+        self.content = content
+        self.children = 0
+
+
+class StreamHandler(Handler):
+    """
+    A sax handler that unmarshals the reply content nodes as they are
+    parsed.  The envelope, header, body and (wrapper) elements along with
+    any fault are built as a (regular) tree.  The content nodes are not
+    added to the tree and only the content elements currently open
+    (being parsed) exist at any time.
+    @ivar unmarshaller: The (typed) unmarshaller.
+    @type unmarshaller: L{suds.umx.core.Core}
+    @ivar reply: The reply collector.
+    @type reply: L{Reply}
+    @ivar depth: The number of wrapper elements between the soap
+        body and the content nodes.
+    @type depth: int
+    @ivar body: The soap body.
+    @type body: L{suds.sax.element.Element}
+    @ivar frames: The stack of open content frames; None for
+        skipped elements.
+    @type frames: [L{Frame},..]
+    """
+
+    def __init__(self, unmarshaller, reply, depth):
+        """
+        @param unmarshaller: The (typed) unmarshaller.
+        @type unmarshaller: L{suds.umx.core.Core}
+        @param reply: The reply collector.
+        @type reply: L{Reply}
+        @param depth: The number of wrapper elements between the soap
+            body and the content nodes.
+        @type depth: int
+        """
+        Handler.__init__(self)
+        self.unmarshaller = unmarshaller
+        self.reply = reply
+        self.depth = depth
+        self.body = None
+        self.frames = []
+
+    def startElement(self, name, attrs):
+        top = self.top()
+        node = self.element(name, attrs)
+        if self.frames:
+            node.parent = top
+            parent = self.frames[-1]
+            if parent is None:
+                self.frames.append(None)
+            else:
+                parent.children += 1
+                self.frames.append(self.open(node, None))
+        elif self.content(top, node):
+            node.parent = top
+            type = self.reply.typeof(node)
+            if type is None:
+                self.frames.append(None)
+            else:
+                self.unmarshaller.reset()
+                self.frames.append(self.open(node, type))
+        else:
+            top.append(node)
+            if self.body is None and node.match('Body', envns) and \
+                    top.match('Envelope', envns):
+                self.body = node
+        self.push(node)
+
+    def endElement(self, name):
+        if not self.frames:
+            Handler.endElement(self, name)
+            return
+        frame = self.frames.pop()
+        node = self.top()
+        if frame is None:
+            self.pop()
+            return
+        self.settext(node, frame.children)
+        value = self.close(frame)
+        self.pop()
+        if self.frames:
+            parent = self.frames[-1]
+            self.unmarshaller.append_child(parent.content, frame.content, value)
+        else:
+            self.reply.add(node, value)
+
+    def characters(self, content):
+        frame = self.frames and self.frames[-1]
+        if frame is None:
+            return
+        Handler.characters(self, content)
+
+    def content(self, parent, node):
+        """
+        Get whether the node is a reply I{content} node.
+        @param parent: The parent element.
+        @type parent: L{suds.sax.element.Element}
+        @param node: An element (not yet added to the tree).
+        @type node: L{suds.sax.element.Element}
+        @rtype: bool
+        """
+        if self.body is None:
+            return False
+        node.parent = parent
+        ancestor = node
+        for n in range(self.depth + 1):
+            if ancestor.match('Fault', envns):
+                return False
+            ancestor = ancestor.parent
+        return ancestor is self.body
+
+    def open(self, node, type):
+        """
+        Start unmarshalling a content element.
+        @param node: The element.
+        @type node: L{suds.sax.element.Element}
+        @param type: The (resolved) schema type of top level
+            content nodes; else None.
+        @type type: L{suds.xsd.sxbase.SchemaObject}
+        @return: The content frame.
+        @rtype: L{Frame}
+        """
+        if node.get('href') is not None:
+            raise Unstreamable('<%s/> is a multiref' % node.qname())
+        content = Content(node)
+        content.type = type
+        self.unmarshaller.start(content)
+        self.unmarshaller.append_attributes(content)
+        return Frame(content)
+
+    def close(self, frame):
+        """
+        Finish unmarshalling a content element.  An element with both
+        text and child elements (mixed content) is unmarshalled as the
+        element itself which, as its children are not kept, cannot be
+        streamed.
+        @param frame: The content frame.
+        @type frame: L{Frame}
+        @return: The unmarshalled value.
+        @rtype: I{any}
+        """
+        content = frame.content
+        if frame.children and content.node.hasText():
+            raise Unstreamable('<%s/> has mixed content' % content.node.qname())
+        content.children = frame.children
+        self.unmarshaller.append_text(content)
+        self.unmarshaller.end(content)
+        return self.unmarshaller.postprocess(content)
+
+    def settext(self, node, children):
+        if len(node.charbuffer):
+            node.text = Text(u''.join(node.charbuffer))
+        del node.charbuffer
+        if children:
+            node.trim()
+
+
+class Reply(object):
+    """
+    Collects the unmarshalled reply content nodes into the method
+    result.  Mirrors the reply (list|composite) construction of
+    L{suds.bindings.binding.Binding}.
+    @ivar rtypes: The return types.
+    @type rtypes: [L{suds.xsd.sxbase.SchemaObject},..]
+    """
+
+    def __init__(self, rtypes):
+        """
+        @param rtypes: The return types.
+        @type rtypes: [L{suds.xsd.sxbase.SchemaObject},..]
+        """
+        self.rtypes = rtypes
+        self.types = {}
+        for rt in rtypes:
+            self.types[rt.name] = rt
+        self.items = []
+        self.composite = Factory.object('reply')
+
+    def typeof(self, node):
+        """
+        Get the (resolved) type of a content node.
+        @param node: A content node.
+        @type node: L{suds.sax.element.Element}
+        @return: The type or None when the node is to be skipped.
+        @rtype: L{suds.xsd.sxbase.SchemaObject}
+        """
+        if len(self.rtypes) > 1:
+            rt = self.types.get(node.name)
+            if rt is None:
+                if node.get('id') is None:
+                    raise Exception('<%s/> not mapped to message part' % node.name)
+                return None
+        elif len(self.rtypes) == 1:
+            rt = self.rtypes[0]
+            if not rt.unbounded() and len(self.items):
+                return None
+        else:
+            return None
+        return rt.resolve(nobuiltin=True)
+
+    def add(self, node, value):
+        """
+        Add an unmarshalled content node.
+        @param node: A content node.
+        @type node: L{suds.sax.element.Element}
+        @param value: The unmarshalled value.
+        @type value: I{any}
+        """
+        if len(self.rtypes) == 1:
+            self.items.append(value)
+            return
+        tag = node.name
+        rt = self.types[tag]
+        composite = self.composite
+        current = getattr(composite, tag, None)
+        if current is None:
+            if rt.unbounded():
+                setattr(composite, tag, [value])
+            else:
+                setattr(composite, tag, value)
+        else:
+            if not isinstance(current, list):
+                current = [current, ]
+                setattr(composite, tag, current)
+            current.append(value)
+
+    def result(self):
+        """
+        Get the method result.
+        @return: The unmarshalled reply.
+        @rtype: L{suds.sudsobject.Object}|list
+        """
+        if len(self.rtypes) > 1:
+            return self.composite
+        if len(self.rtypes) == 1:
+            if self.rtypes[0].unbounded():
+                return self.items
+            if len(self.items):
+                return self.items[0]
+        return None
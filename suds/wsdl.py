@@ -20,16 +20,17 @@ The primary class is I{Definitions} as it represends the root element
 found in the document.
 """
 
+from copy import copy
 from logging import getLogger
-from suds import objid, TypeNotFound, MethodNotFound
+from suds import objid, metrics, BuildError, TypeNotFound, MethodNotFound
 from suds.sax.element import Element
 from suds.bindings.document import Document
 from suds.bindings.rpc import RPC, Encoded
 from suds.xsd import qualify, Namespace
-from suds.xsd.schema import Schema, SchemaCollection
+from suds.xsd.schema import Schema, SchemaCollection, Imports
 from suds.xsd.query import ElementQuery
 from suds.sudsobject import Object, Facade, Metadata
-from suds.reader import DocumentReader
+from suds.reader import DocumentReader, Prefetch
 import suds.soaparray
 import re
 from six.moves import urllib
@@ -160,20 +161,66 @@ class Definitions(WObject):
         self.port_types = {}
         self.bindings = {}
         self.services = []
-        self.add_children(self.root)
+        with metrics.phase('add_children'):
+            self.add_children(self.root)
         self.children.sort()
         pmd = self.__metadata__.__print__
         pmd.excludes.append('children')
         pmd.excludes.append('wsdl')
         pmd.wrappers['schema'] = repr
-        self.open_imports()
-        self.resolve()
-        self.build_schema()
-        self.set_wrapped()
-        for s in self.services:
-            self.add_methods(s)
+        pruned = (options.operations is not None)
+        with Prefetch(options, self.references).start(url, root), Imports(pruned) as imports:
+            with metrics.phase('open_imports'):
+                self.open_imports()
+            with metrics.phase('resolve'):
+                self.resolve()
+            with metrics.phase('build_schema'):
+                self.build_schema()
+        if imports.outermost:
+            with metrics.phase('prune'):
+                self.prune(options.operations)
+        with metrics.phase('set_wrapped'):
+            self.set_wrapped()
+        with metrics.phase('add_methods'):
+            for s in self.services:
+                self.add_methods(s)
         log.debug("wsdl at '%s' loaded:\n%s", url, self)
 
+    @staticmethod
+    def references(url, root):
+        """
+        Get the URLs of the documents imported (or included) by a
+        WSDL or schema document.  Relative locations are joined with
+        the I{url} as they are when imported.
+        @param url: The url of the document.
+        @type url: str
+        @param root: The root of the document.
+        @type root: L{Element}
+        @return: A list of URLs.
+        @rtype: [str,...]
+        """
+        locations = []
+        schemas = []
+        if root.match(Definitions.Tag, wsdlns):
+            for imp in root.getChildren('import', wsdlns):
+                locations.append(imp.get('location'))
+            for types in root.getChildren('types', wsdlns):
+                schemas += types.getChildren(Schema.Tag, Namespace.xsdns)
+        elif root.match(Schema.Tag, Namespace.xsdns):
+            schemas.append(root)
+        for schema in schemas:
+            for child in schema.getChildren(ns=Namespace.xsdns):
+                if child.name in ('import', 'include'):
+                    locations.append(child.get('schemaLocation'))
+        result = []
+        for location in locations:
+            if location is None:
+                continue
+            if '://' not in location:
+                location = urllib.parse.urljoin(url, location)
+            result.append(location)
+        return result
+
     def mktns(self, root):
         """ Get/create the target namespace """
         tns = root.get('targetNamespace')
@@ -235,6 +282,71 @@ class Definitions(WObject):
             self.schema.merge(s)
         return self.schema
 
+    def prune(self, operations):
+        """
+        Prune the definitions (and the imported definitions) down to the
+        named operations: the other operations of the port types and
+        bindings are dropped along with the messages only they use and
+        the schema objects no longer reachable from the parts of the
+        messages retained.  See L{Schema.prune}.
+        @param operations: The names of the operations retained.
+        @type operations: [str,..]
+        @raise MethodNotFound: When an operation is not defined.
+        """
+        operations = set(operations)
+        messages = {}
+        for pt in self.port_types.values():
+            for name in list(pt.operations.keys()):
+                if name not in operations:
+                    del pt.operations[name]
+                    continue
+                for op in pt.operations[name]:
+                    for m in [op.input, op.output] + [f.message for f in op.faults]:
+                        messages[id(m)] = m
+        defined = set()
+        for pt in self.port_types.values():
+            defined.update(pt.operations.keys())
+        undefined = sorted(operations - defined)
+        if undefined:
+            raise MethodNotFound(undefined[0])
+        for b in self.bindings.values():
+            for name in list(b.operations.keys()):
+                if name not in operations:
+                    del b.operations[name]
+                    continue
+                for op in b.operations[name]:
+                    for header in op.soap.input.headers + op.soap.output.headers:
+                        ref = qualify(header.message, b.root, self.tns)
+                        m = self.messages[ref]
+                        messages[id(m)] = m
+            keep = set(b.operations.keys())
+            b.root.children = [c for c in b.root.children
+                               if c.name != 'operation' or c.get('name') in keep]
+        for pt in self.port_types.values():
+            keep = set(pt.operations.keys())
+            pt.root.children = [c for c in pt.root.children
+                                if c.name != 'operation' or c.get('name') in keep]
+        definitions = [self]
+        for d in definitions:
+            for imp in d.imports:
+                if imp.imported is not None:
+                    definitions.append(imp.imported)
+        for d in definitions:
+            dropped = [m for m in d.messages.values() if id(m) not in messages]
+            nodes = set(id(m.root) for m in dropped)
+            d.messages = dict((q, m) for q, m in d.messages.items() if id(m) in messages)
+            d.children = [c for c in d.children if id(c.root) not in nodes]
+            d.root.children = [c for c in d.root.children if id(c) not in nodes]
+        roots = []
+        for m in messages.values():
+            for p in m.parts:
+                if p.element is not None:
+                    roots.append(p.element)
+                elif p.type is not None:
+                    roots.append(p.type)
+        if self.schema is not None:
+            self.schema.prune(roots)
+
     def add_methods(self, service):
         """ Build method view for service """
         bindings = {
@@ -261,6 +373,65 @@ class Definitions(WObject):
 
                     p.methods.add(name, m)
 
+    def view(self, options):
+        """
+        Get a (shallow) copy of the definitions having its own options.
+        The schema and the WSDL objects (messages, port types, bindings)
+        are shared; the services (ports and methods) and the (method)
+        bindings which read the options are not.
+        @param options: An options object.
+        @type options: L{options.Options}
+        @return: The copy.
+        @rtype: L{Definitions}
+        """
+        result = copy(self)
+        result.__dict__['__keylist__'] = list(self.__keylist__)
+        result.options = options
+        bindings = {}
+        result.services = [s.view(result, bindings) for s in self.services]
+        return result
+
+    def warm(self):
+        """
+        Build the (otherwise lazily built and cached) objects used by
+        the clients: the schema lookup tables, the content models and
+        resolved types of the schema objects and the prepared message
+        definitions and part names of the methods.  Schema objects that
+        cannot be built or resolved (see the I{lazy} option) are skipped
+        and reported when used.
+        """
+        schema = self.schema
+        if schema is not None:
+            schema.lookup()
+            visited = set()
+            pending = schema.children + schema.all
+            while pending:
+                x = pending.pop()
+                if id(x) in visited:
+                    continue
+                visited.add(id(x))
+                try:
+                    x.model()
+                    x.resolve()
+                    x.resolve(nobuiltin=True)
+                    pending.extend(x.rawchildren)
+                except (BuildError, TypeNotFound) as e:
+                    log.debug('%s not warmed: %s', x.id, e)
+        for service in self.services:
+            for port in service.ports:
+                for methods in port.methods.values():
+                    for m in methods:
+                        input = m.soap.input
+                        input.part_names = set(p.name for p in input.body.parts)
+                        binding = m.binding.input
+                        if binding is not None:
+                            binding.param_defs(m)
+                            binding.headpart_types(m)
+                        binding = m.binding.output
+                        if binding is not None:
+                            binding.returned_types(m)
+                            binding.headpart_types(m, False)
+
     def set_wrapped(self):
         """ set (wrapped|bare) flag on messages """
         for b in self.bindings.values():
@@ -326,7 +497,8 @@ class Import(WObject):
         if '://' not in url:
             url = urllib.parse.urljoin(definitions.url, url)
         options = definitions.options
-        d = Definitions(url, options)
+        with metrics.phase('definitions'):
+            d = Definitions(url, options)
         if d.root.match(Definitions.Tag, wsdlns):
             self.import_definitions(definitions, d)
             return
@@ -846,6 +1018,42 @@ class Port(NamedObject):
             self.location = address.get('location').encode('utf-8')
         self.methods = MultiDict()
 
+    def view(self, definitions, bindings):
+        """
+        Get a (shallow) copy of the port for a view of the definitions.
+        The methods are copied and bound to the view.
+        @param definitions: The definitions (view).
+        @type definitions: L{Definitions}
+        @param bindings: The (method) bindings of the view by class.
+        @type bindings: dict
+        @return: The copy.
+        @rtype: L{Port}
+        """
+        result = copy(self)
+        result.__dict__['__keylist__'] = list(self.__keylist__)
+        result.methods = MultiDict()
+        for name, methods in self.methods.items():
+            for m in methods:
+                n = Facade('Method')
+                n.name = m.name
+                n.location = m.location
+                n.soap = m.soap
+                n.binding = Facade('binding')
+                for io in ('input', 'output'):
+                    binding = getattr(m.binding, io)
+                    if binding is None:
+                        setattr(n.binding, io, None)
+                        continue
+                    cls = binding.__class__
+                    if cls not in bindings:
+                        bindings[cls] = cls(definitions)
+                    setattr(n.binding, io, bindings[cls])
+                if getattr(m, 'prepared', None) is None:
+                    m.prepared = {}
+                n.prepared = m.prepared
+                result.methods.add(name, n)
+        return result
+
     def method(self, name, input_name=None, output_name=None):
         """
         Get a method defined in this portType by name.
@@ -905,6 +1113,22 @@ class Service(NamedObject):
                 return p
         return None
 
+    def view(self, definitions, bindings):
+        """
+        Get a (shallow) copy of the service (and its ports) for a view
+        of the definitions.
+        @param definitions: The definitions (view).
+        @type definitions: L{Definitions}
+        @param bindings: The (method) bindings of the view by class.
+        @type bindings: dict
+        @return: The copy.
+        @rtype: L{Service}
+        """
+        result = copy(self)
+        result.__dict__['__keylist__'] = list(self.__keylist__)
+        result.ports = [p.view(definitions, bindings) for p in self.ports]
+        return result
+
     def setlocation(self, url, names=None):
         """
         Override the invocation location (url) for service method.
@@ -22,7 +22,6 @@ from logging import getLogger
 from suds import objid, tostr, Repr
 from suds.sudsobject import Object
 from suds.xsd import isqref
-from suds.xsd.sxbuiltin import Factory
 
 log = getLogger(__name__)
 
@@ -95,13 +94,13 @@ class BlindQuery(Query):
     """
 
     def execute(self, schema):
-        if schema.builtin(self.ref):
-            name = self.ref[0]
-            b = Factory.create(schema, name)
-            log.debug('%s, found builtin (%s)', self.id, name)
+        lookup = schema.lookup()
+        b = lookup.builtin(self.ref)
+        if b is not None:
+            log.debug('%s, found builtin (%s)', self.id, self.ref[0])
             return b
         result = None
-        for d in (schema.elements, schema.types):
+        for d in (lookup.elements, lookup.types):
             result = d.get(self.ref)
             if self.filter(result):
                 result = None
@@ -121,12 +120,12 @@ class TypeQuery(Query):
     """
 
     def execute(self, schema):
-        if schema.builtin(self.ref):
-            name = self.ref[0]
-            b = Factory.create(schema, name)
-            log.debug('%s, found builtin (%s)', self.id, name)
+        lookup = schema.lookup()
+        b = lookup.builtin(self.ref)
+        if b is not None:
+            log.debug('%s, found builtin (%s)', self.id, self.ref[0])
             return b
-        result = schema.types.get(self.ref)
+        result = lookup.types.get(self.ref)
         if self.filter(result):
             result = None
         return self.result(result)
@@ -139,7 +138,7 @@ class GroupQuery(Query):
     """
 
     def execute(self, schema):
-        result = schema.groups.get(self.ref)
+        result = schema.lookup().groups.get(self.ref)
         if self.filter(result):
             result = None
         return self.result(result)
@@ -153,9 +152,13 @@ class AttrQuery(Query):
     """
 
     def execute(self, schema):
-        result = schema.attributes.get(self.ref)
+        lookup = schema.lookup()
+        result = lookup.attributes.get(self.ref)
         if self.filter(result):
-            result = self.__deepsearch(schema)
+            from suds.xsd.sxbasic import Attribute
+            result = lookup.nested(Attribute).get(self.ref)
+            if self.filter(result):
+                result = self.__deepsearch(schema)
         return self.result(result)
 
     def __deepsearch(self, schema):
@@ -177,7 +180,7 @@ class AttrGroupQuery(Query):
     """
 
     def execute(self, schema):
-        result = schema.agrps.get(self.ref)
+        result = schema.lookup().agrps.get(self.ref)
         if self.filter(result):
             result = None
         return self.result(result)
@@ -191,9 +194,13 @@ class ElementQuery(Query):
     """
 
     def execute(self, schema):
-        result = schema.elements.get(self.ref)
+        lookup = schema.lookup()
+        result = lookup.elements.get(self.ref)
         if self.filter(result):
-            result = self.__deepsearch(schema)
+            from suds.xsd.sxbasic import Element
+            result = lookup.nested(Element).get(self.ref)
+            if self.filter(result):
+                result = self.__deepsearch(schema)
         return self.result(result)
 
     def __deepsearch(self, schema):
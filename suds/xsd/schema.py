@@ -22,14 +22,17 @@ Most of the I{value-add} provided by the model is centered around
 tranparent referenced type resolution and targeted denormalization.
 """
 
-from suds import objid, Repr
-from suds.xsd import isqref
+from suds import objid, Repr, metrics
+from suds.xsd import isqref, qualify
+from suds.xsd import sxbasic
+from suds.xsd.sxbase import Generation, SchemaObject
 from suds.xsd.sxbuiltin import Factory
 from suds.xsd.sxbasic import Factory as BasicFactory
 from suds.xsd.deplist import DepList
 from suds.sax.element import Element
 from suds.sax import splitPrefix, Namespace
 from logging import getLogger
+from threading import RLock, local
 import six
 
 log = getLogger(__name__)
@@ -38,6 +41,137 @@ PROCESSED_IMPORTS_CACHE = {}
 PROCESSED_IMPORT_DEPTH = {}
 MAX_IMPORT_DEPTH = 3
 
+MATERIALIZE_LOCK = RLock()
+
+
+def forget(url):
+    """
+    Forget the schema imported from the document at the I{url} so
+    that it is built again when next imported.  Used when the (cached)
+    document has changed.
+    @param url: The URL of the imported document.
+    @type url: str
+    """
+    PROCESSED_IMPORTS_CACHE.pop(url, None)
+    PROCESSED_IMPORT_DEPTH.pop(url, None)
+
+
+def referenced(x):
+    """
+    Get the (qualified) references made by the content of a top level
+    schema object: the I{type}, I{ref}, I{base}, I{itemType},
+    I{memberTypes} and (soap encoded) I{arrayType} attributes of its
+    XML.  The XML is walked so that the content of a deferred object
+    (see L{Schema.lazy}) is not built.
+    @param x: A top level schema object.
+    @type x: L{SchemaObject}
+    @return: The references.
+    @rtype: [(name, namespace-uri),..]
+    """
+    result = []
+    pending = [x.root]
+    while pending:
+        node = pending.pop()
+        pending.extend(node)
+        for a in node.attributes:
+            if a.name not in ('type', 'ref', 'base', 'itemType', 'memberTypes', 'arrayType'):
+                continue
+            defns = node.defaultNamespace()
+            if Namespace.none(defns):
+                defns = x.schema.tns
+            for ref in a.getValue().split():
+                try:
+                    result.append(qualify(ref.split('[')[0], node, defns))
+                except Exception:
+                    log.debug('%s, reference "%s" not resolved', x.id, ref)
+    return result
+
+
+def derivations(x):
+    """
+    Get the (qualified) base types a top level type is derived from
+    by extension or restriction.
+    @param x: A top level schema type.
+    @type x: L{SchemaObject}
+    @return: The base type references.
+    @rtype: [(name, namespace-uri),..]
+    """
+    nodes = []
+    for child in x.root.children:
+        if child.name in ('complexContent', 'simpleContent'):
+            nodes += child.children
+        else:
+            nodes.append(child)
+    result = []
+    for node in nodes:
+        if node.name not in ('extension', 'restriction'):
+            continue
+        base = node.get('base')
+        if base is None:
+            continue
+        defns = node.defaultNamespace()
+        if Namespace.none(defns):
+            defns = x.schema.tns
+        try:
+            result.append(qualify(base, node, defns))
+        except Exception:
+            log.debug('%s, base "%s" not resolved', x.id, base)
+    return result
+
+
+class Imports(object):
+    """
+    A private cache of the imported schemas used (in place of the
+    process wide one) while a WSDL which is to be pruned is loaded:
+    the schemas it imports are not shared with (or taken from) other
+    loads and may be modified.  Only the outermost cache of a thread
+    is active.
+    @cvar active: The active cache (per thread).
+    @type active: I{threading.local}
+    @ivar private: The private cache is used.
+    @type private: bool
+    @ivar outermost: This is the active cache.
+    @type outermost: bool
+    @ivar schemas: The imported schemas by URL.
+    @type schemas: {url: L{Schema}}
+    @ivar depth: The import depth by URL.
+    @type depth: {url: int}
+    """
+
+    active = local()
+
+    @classmethod
+    def current(cls):
+        """
+        Get the cache of imported schemas of this thread.
+        @return: The imported schemas and the import depth by URL.
+        @rtype: (dict, dict)
+        """
+        imports = getattr(cls.active, 'imports', None)
+        if imports is None:
+            return (PROCESSED_IMPORTS_CACHE, PROCESSED_IMPORT_DEPTH)
+        return (imports.schemas, imports.depth)
+
+    def __init__(self, private=True):
+        """
+        @param private: Use a private cache (else this is a no-op).
+        @type private: bool
+        """
+        self.private = private
+        self.outermost = False
+        self.schemas = {}
+        self.depth = {}
+
+    def __enter__(self):
+        if self.private and getattr(self.active, 'imports', None) is None:
+            self.active.imports = self
+            self.outermost = True
+        return self
+
+    def __exit__(self, *exc):
+        if self.outermost:
+            self.active.imports = None
+
 
 class SchemaCollection(object):
     """
@@ -49,6 +183,8 @@ class SchemaCollection(object):
     @type children: [L{Schema},...]
     @ivar namespaces: A dictionary of contained schemas by namespace.
     @type namespaces: {str:L{Schema}}
+    @ivar generation: The invalidation counter of the contained schemas.
+    @type generation: L{sxbase.Generation}
     """
 
     def __init__(self, wsdl):
@@ -59,6 +195,7 @@ class SchemaCollection(object):
         self.wsdl = wsdl
         self.children = []
         self.namespaces = {}
+        self.generation = Generation()
 
     def add(self, schema):
         """
@@ -95,8 +232,12 @@ class SchemaCollection(object):
         for child in self.children:
             child.dereference()
         log.debug('loaded:\n%s', self)
-        merged = self.merge()
+        with metrics.phase('schema.merge'):
+            merged = self.merge()
         log.debug('MERGED:\n%s', merged)
+        if merged is not None:
+            with metrics.phase('schema.lookup'):
+                merged.lookup()
         return merged
 
     def autoblend(self):
@@ -190,6 +331,14 @@ class Schema(object):
     @ivar form_qualified: The flag indicating:
         (@elementFormDefault).
     @type form_qualified: bool
+    @ivar tables: The qname lookup tables.
+    @type tables: L{Lookup}
+    @ivar lazy: The content of the top level objects is built (and
+        dereferenced) when first used.  See L{materialize}.
+    @type lazy: bool
+    @ivar generation: The invalidation counter of the objects of this
+        schema; the container's when contained.
+    @type generation: L{sxbase.Generation}
     """
 
     Tag = 'schema'
@@ -218,6 +367,12 @@ class Schema(object):
         self.attributes = {}
         self.groups = {}
         self.agrps = {}
+        self.tables = None
+        self.lazy = options.lazy
+        if container is None:
+            self.generation = Generation()
+        else:
+            self.generation = container.generation
         if options.doctor is not None:
             options.doctor.examine(root)
         form = self.root.get('elementFormDefault')
@@ -250,8 +405,10 @@ class Schema(object):
         using the factory.
             - Build the graph.
             - Collate the children.
+        When I{lazy}, only the top level objects are built.
         """
-        self.children = BasicFactory.build(self.root, self)
+        with metrics.phase('schema.build'):
+            self.children = BasicFactory.build(self.root, self, lazy=self.lazy)
         collated = BasicFactory.collate(self.children)
         self.children = collated[0]
         self.attributes = collated[2]
@@ -295,8 +452,90 @@ class Schema(object):
             self.all.append(item[1])
             self.agrps[item[0]] = item[1]
         schema.merged = True
+        self.invalidate()
         return self
 
+    def invalidate(self):
+        """
+        Invalidate the content models and lookup tables of the objects
+        of this schema (and of the schemas loaded with it).
+        See L{sxbase.Generation}.
+        """
+        self.generation.invalidate()
+
+    def lookup(self):
+        """
+        Get the qname lookup tables.  The tables are built when first
+        requested (by L{SchemaCollection.load} for the merged schema)
+        and rebuilt after L{invalidate}.
+        @return: The lookup tables.
+        @rtype: L{Lookup}
+        """
+        tables = getattr(self, 'tables', None)
+        if tables is None or tables.generation != self.generation.value:
+            tables = Lookup(self)
+            self.tables = tables
+        return tables
+
+    def prune(self, roots):
+        """
+        Prune the (merged) schema down to the top level objects
+        reachable from the I{roots}: those (transitively) referenced
+        by their content (see L{referenced}) and the types derived from
+        a reachable type (which may be used by I{xsi:type}).  The other
+        top level objects are dropped from this schema and from the
+        schemas they were built (or imported) by.
+        @param roots: The (qualified) references of the roots.
+        @type roots: [(name, namespace-uri),..]
+        """
+        tables = (self.types, self.elements, self.groups, self.agrps, self.attributes)
+        derived = {}
+        for t in self.types.values():
+            for base in derivations(t):
+                derived.setdefault(base, []).append(t.qname)
+        reachable = {}
+        seen = set()
+        pending = list(roots)
+        while pending:
+            ref = pending.pop()
+            if ref in seen:
+                continue
+            seen.add(ref)
+            for table in tables:
+                x = table.get(ref)
+                if x is None or id(x) in reachable:
+                    continue
+                reachable[id(x)] = x
+                pending.extend(referenced(x))
+            pending.extend(derived.get(ref, ()))
+        schemas = {id(self): self}
+        for x in self.children + self.all:
+            schemas[id(x.schema)] = x.schema
+        for schema in schemas.values():
+            schema.retain(reachable)
+            schema.invalidate()
+        log.debug('pruned: %d top level objects retained', len(reachable))
+
+    def retain(self, reachable):
+        """
+        Drop the top level objects (and their XML) but the I{reachable}.
+        @param reachable: The retained objects by id().
+        @type reachable: {int: L{SchemaObject}}
+        """
+        for table in (self.types, self.elements, self.groups, self.agrps, self.attributes):
+            for qname, x in list(table.items()):
+                if id(x) not in reachable:
+                    del table[qname]
+        dropped = [x for x in self.children if id(x) not in reachable]
+        self.children = [x for x in self.children if id(x) in reachable]
+        self.all = [x for x in self.all if id(x) in reachable]
+        nodes = set(id(x.root) for x in dropped)
+        parents = dict((id(x.root.parent), x.root.parent) for x in dropped if x.root.parent is not None)
+        parents[id(self.root)] = self.root
+        for parent in parents.values():
+            parent.children = [c for c in parent.children if id(c) not in nodes]
+        self.tables = None
+
     def open_imports(self, options):
         """
         Instruct all contained L{sxbasic.Import} children to import
@@ -305,36 +544,81 @@ class Schema(object):
         @param options: An options dictionary.
         @type options: L{options.Options}
         """
-        for imp in self.imports:
-            imported = imp.open(options)
-            if imported is None:
-                continue
-            imported.open_imports(options)
-            log.debug('imported:\n%s', imported)
-            self.merge(imported)
-
-    def dereference(self):
-        """
-        Instruct all children to perform dereferencing.
-        """
-        all = []
-        indexes = {}
-        for child in self.children:
-            child.content(all)
-        deplist = DepList()
-        for x in all:
-            x.qualify()
-            midx, deps = x.dependencies()
-            item = (x, tuple(deps))
-            deplist.add(item)
-            indexes[x] = midx
-        for x, deps in deplist.sort():
-            midx = indexes.get(x)
-            if midx is None:
-                continue
-            d = deps[midx]
-            log.debug('(%s) merging %s <== %s', self.tns[1], Repr(x), Repr(d))
-            x.merge(d)
+        if not self.imports:
+            return
+        with metrics.phase('schema.open_imports'):
+            for imp in self.imports:
+                imported = imp.open(options)
+                if imported is None:
+                    continue
+                imported.open_imports(options)
+                log.debug('imported:\n%s', imported)
+                self.merge(imported)
+
+    def dereference(self, children=None):
+        """
+        Instruct all children to perform dereferencing.  The children
+        of a I{lazy} schema are dereferenced when materialized.
+        @param children: The (top level) children dereferenced; all
+            when None.
+        @type children: [L{SchemaObject},...]
+        """
+        if children is None:
+            if self.lazy:
+                return
+            children = self.children
+        with metrics.phase('schema.dereference'):
+            all = []
+            indexes = {}
+            for child in children:
+                child.content(all)
+            deplist = DepList()
+            for x in all:
+                x.qualify()
+                midx, deps = x.dependencies()
+                item = (x, tuple(deps))
+                deplist.add(item)
+                indexes[x] = midx
+            for x, deps in deplist.sort():
+                midx = indexes.get(x)
+                if midx is None:
+                    continue
+                d = deps[midx]
+                log.debug('(%s) merging %s <== %s', self.tns[1], Repr(x), Repr(d))
+                x.merge(d)
+            self.invalidate()
+
+    def materialize(self, x):
+        """
+        Build and dereference the content of a (deferred) top level
+        object of a I{lazy} schema when first used.  The objects it
+        depends on (merges) are materialized in turn.  The content is
+        set before it is dereferenced so that (cyclic) references to
+        the object being materialized find it.  The models and lookup
+        tables already built are not invalidated: no object (content)
+        other than those being built is changed.  The object is
+        deferred again when it cannot be dereferenced.
+        @param x: A top level object of this schema.
+        @type x: L{SchemaObject}
+        @return: The content (I{rawchildren}) of the object.
+        @rtype: [L{SchemaObject},...]
+        """
+        with MATERIALIZE_LOCK:
+            if 'rawchildren' in x.__dict__:
+                return x.rawchildren
+            log.debug('(%s) materializing %s', self.tns[1], Repr(x))
+            materializing = SchemaObject.materializing
+            materializing.depth = getattr(materializing, 'depth', 0) + 1
+            try:
+                x.rawchildren = BasicFactory.build(x.root, self, x.childtags())
+                self.dereference([x])
+            except:
+                x.defer()
+                raise
+            finally:
+                materializing.depth -= 1
+            SchemaObject.materialized += 1
+            return x.rawchildren
 
     def locate(self, ns):
         """
@@ -400,25 +684,25 @@ class Schema(object):
         @note: This is only used by Import children.
         """
 
-        global PROCESSED_IMPORTS_CACHE, PROCESSED_IMPORT_DEPTH, MAX_IMPORT_DEPTH
-        if baseurl not in PROCESSED_IMPORTS_CACHE:
-            if baseurl in PROCESSED_IMPORT_DEPTH:
-                if (PROCESSED_IMPORT_DEPTH[baseurl] < MAX_IMPORT_DEPTH):
-                    PROCESSED_IMPORT_DEPTH[baseurl] += 1
+        processed, depth = Imports.current()
+        if baseurl not in processed:
+            if baseurl in depth:
+                if (depth[baseurl] < MAX_IMPORT_DEPTH):
+                    depth[baseurl] += 1
                     log.debug('Increasing import count for: %s' % baseurl)
                 else:
                     log.debug('Maxdepth (%d) reached; Skipping processed import: %s' % (MAX_IMPORT_DEPTH, baseurl))
                     return None
             else:
-                PROCESSED_IMPORT_DEPTH[baseurl] = 1
+                depth[baseurl] = 1
                 log.debug('Importing for the first time: %s' % baseurl)
 
-            PROCESSED_IMPORTS_CACHE[baseurl] = Schema(root, baseurl, options)
+            processed[baseurl] = Schema(root, baseurl, options)
             log.debug('Successfully cached import: %s' % baseurl)
         else:
             log.debug('Retrieving import from cache: %s' % baseurl)
 
-        return PROCESSED_IMPORTS_CACHE[baseurl]
+        return processed[baseurl]
 
     def str(self, indent=0):
         tab = '%*s' % (indent * 3, '')
@@ -444,3 +728,141 @@ class Schema(object):
 
     def __unicode__(self):
         return self.str()
+
+
+class Lookup(object):
+    """
+    The qname lookup tables of a schema used by the schema queries in
+    place of searching.  One table per kind of (top level) named object
+    plus the (nested) elements and attributes found by a I{deep} search
+    of the merged (imported) objects in L{Schema.all}.
+    @ivar generation: The L{Schema.generation} when built.
+    @type generation: int
+    @ivar types: The top level types.
+    @type types: {qname:L{SchemaObject}}
+    @ivar elements: The top level elements.
+    @type elements: {qname:L{SchemaObject}}
+    @ivar attributes: The top level attributes.
+    @type attributes: {qname:L{SchemaObject}}
+    @ivar groups: The top level groups.
+    @type groups: {qname:L{SchemaObject}}
+    @ivar agrps: The top level attribute groups.
+    @type agrps: {qname:L{SchemaObject}}
+    @ivar deep: The first nested object (by qname) of each class
+        in the order found by L{sxbase.SchemaObject.find}.  Built when
+        first used by L{nested}.
+    @type deep: {class:{qname:L{SchemaObject}}}
+    @ivar deferred: The (lazy) objects not yet materialized whose
+        content is walked into the I{deep} tables once materialized.
+    @type deferred: [L{SchemaObject},..]
+    @ivar materialized: The L{SchemaObject.materialized} count when
+        the I{deferred} objects were last checked.
+    @type materialized: int
+    @ivar builtins: The builtin types by qref.
+    @type builtins: {qref:L{sxbase.XBuiltin}}
+    @ivar found: The I{blind} L{find} results by qref.
+    @type found: {qref:L{SchemaObject}}
+    """
+
+    def __init__(self, schema):
+        """
+        @param schema: A schema.
+        @type schema: L{Schema}
+        """
+        self.schema = schema
+        self.generation = schema.generation.value
+        self.types = schema.types
+        self.elements = schema.elements
+        self.attributes = schema.attributes
+        self.groups = schema.groups
+        self.agrps = schema.agrps
+        self.deep = None
+        self.deferred = []
+        self.materialized = None
+        self.builtins = {}
+        self.found = {}
+
+    def nested(self, cls):
+        """
+        Get the I{deep} table of a class.  The tables are built by
+        walking all (merged) objects when first used.  The content of
+        the objects of a I{lazy} schema that are not yet materialized
+        is not walked (which would materialize them) until they have
+        been materialized.
+        @param cls: The class: L{sxbasic.Element} or L{sxbasic.Attribute}.
+        @type cls: class
+        @return: The nested objects by qname.
+        @rtype: {qname:L{SchemaObject}}
+        """
+        with MATERIALIZE_LOCK:
+            if self.deep is None:
+                self.deep = {sxbasic.Element: {}, sxbasic.Attribute: {}}
+                self.deferred = list(self.schema.all)
+            if self.materialized != SchemaObject.materialized:
+                self.materialized = SchemaObject.materialized
+                deferred = self.deferred
+                self.deferred = []
+                visited = set()
+                for x in deferred:
+                    self.walk(x, visited)
+            return self.deep[cls]
+
+    def walk(self, x, visited):
+        """
+        Add the (nested) elements and attributes to the I{deep} tables.
+        The objects not yet materialized are added to I{deferred}.
+        @param x: A schema object.
+        @type x: L{SchemaObject}
+        @param visited: The visited objects (ids).
+        @type visited: set
+        """
+        pending = [x]
+        while pending:
+            x = pending.pop()
+            if id(x) in visited:
+                continue
+            visited.add(id(x))
+            table = self.deep.get(x.__class__)
+            if table is not None and x.qname not in table:
+                table[x.qname] = x
+            if 'rawchildren' not in x.__dict__:
+                self.deferred.append(x)
+                continue
+            pending.extend(reversed(x.rawchildren))
+
+    def builtin(self, ref):
+        """
+        Get a builtin type.
+        @param ref: A qref.
+        @type ref: qref
+        @return: The builtin or None when I{ref} is not a builtin.
+        @rtype: L{sxbase.XBuiltin}
+        """
+        result = self.builtins.get(ref)
+        if result is None and self.schema.builtin(ref):
+            result = Factory.create(self.schema, ref[0])
+            self.builtins[ref] = result
+        return result
+
+    def find(self, ref):
+        """
+        I{Blindly} find an object as by a L{query.BlindQuery}: a builtin,
+        a top level element, a type or a nested element.
+        @param ref: A qref.
+        @type ref: qref
+        @return: The object found, else None.
+        @rtype: L{SchemaObject}
+        """
+        result = self.found.get(ref)
+        if result is not None:
+            return result
+        result = self.builtin(ref)
+        if result is None:
+            result = self.elements.get(ref)
+        if result is None:
+            result = self.types.get(ref)
+        if result is None:
+            result = self.nested(sxbasic.Element).get(ref)
+        if result is not None:
+            self.found[ref] = result
+        return result
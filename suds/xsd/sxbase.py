@@ -20,6 +20,7 @@ schema objects.
 """
 
 from logging import getLogger
+from threading import local
 from suds import objid, Repr
 from suds.xsd import Filter, isqref, qualify
 from suds.sax.element import Element
@@ -29,6 +30,32 @@ import six
 log = getLogger(__name__)
 
 
+class Generation(object):
+    """
+    The invalidation counter of the schemas loaded together: those of
+    a L{schema.SchemaCollection} (merged into one) or a schema loaded on
+    its own such as an import.  Incremented whenever the content of
+    (any of) their objects may have changed, it invalidates the content
+    L{Model} of their objects and their lookup tables only: those of
+    the schemas loaded by other clients are kept.
+    @ivar value: The current generation.
+    @type value: int
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def invalidate(self):
+        """
+        Increment the generation.  Nothing is invalidated while the
+        content of a lazy object is being materialized: only the
+        objects being built are changed.
+        """
+        if getattr(SchemaObject.materializing, 'depth', 0):
+            return
+        self.value += 1
+
+
 class SchemaObject(object):
     """
     A schema object is an extension to object object with
@@ -47,8 +74,23 @@ class SchemaObject(object):
     @type default: object
     @ivar rawchildren: A list raw of all children.
     @type rawchildren: [L{SchemaObject},...]
+    @cvar materializing: The (per thread) depth of the lazy objects
+        being materialized (see L{schema.Schema.materialize}).
+    @type materializing: I{threading.local}
+    @cvar materialized: The number of lazy objects materialized.
+    @type materialized: int
     """
 
+    materializing = local()
+    materialized = 0
+
+    def invalidate(self):
+        """
+        Invalidate the content L{Model} of the objects of the schemas
+        loaded with this object's schema.  See L{Generation}.
+        """
+        self.schema.generation.invalidate()
+
     @classmethod
     def prepend(cls, d, s, filter=Filter()):
         """
@@ -105,7 +147,22 @@ class SchemaObject(object):
         self.rawchildren = []
         self.cache = {}
 
-    def attributes(self, filter=Filter()):
+    def __getattr__(self, name):
+        if name == 'rawchildren' and 'schema' in self.__dict__:
+            return self.schema.materialize(self)
+        raise AttributeError(name)
+
+    def defer(self):
+        """
+        Defer building the content (I{rawchildren}) of this (top level)
+        object until first used.  See L{schema.Schema.materialize}.
+        @return: self
+        @rtype: L{SchemaObject}
+        """
+        del self.rawchildren
+        return self
+
+    def attributes(self, filter=None):
         """
         Get only the attribute content.
         @param filter: A filter to constrain the result.
@@ -113,13 +170,15 @@ class SchemaObject(object):
         @return: A list of tuples (attr, ancestry)
         @rtype: [(L{SchemaObject}, [L{SchemaObject},..]),..]
         """
+        if filter is None:
+            return list(self.model().attributes)
         result = []
         for child, ancestry in self:
             if child.isattr() and child in filter:
                 result.append((child, ancestry))
         return result
 
-    def children(self, filter=Filter()):
+    def children(self, filter=None):
         """
         Get only the I{direct} or non-attribute content.
         @param filter: A filter to constrain the result.
@@ -127,6 +186,8 @@ class SchemaObject(object):
         @return: A list tuples: (child, ancestry)
         @rtype: [(L{SchemaObject}, [L{SchemaObject},..]),..]
         """
+        if filter is None:
+            return list(self.model().children)
         result = []
         for child, ancestry in self:
             if not child.isattr() and child in filter:
@@ -141,10 +202,7 @@ class SchemaObject(object):
         @return: A tuple: the requested (attribute, ancestry).
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
         """
-        for child, ancestry in self.attributes():
-            if child.name == name:
-                return (child, ancestry)
-        return (None, [])
+        return self.model().attribute(name)
 
     def get_child(self, name):
         """
@@ -154,10 +212,20 @@ class SchemaObject(object):
         @return: A tuple: the requested (child, ancestry).
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
         """
-        for child, ancestry in self.children():
-            if child.any() or child.name == name:
-                return (child, ancestry)
-        return (None, [])
+        return self.model().child(name)
+
+    def model(self):
+        """
+        Get the (flattened) content model.  The model is built when
+        first requested and rebuilt after L{invalidate}.
+        @return: The content model.
+        @rtype: L{Model}
+        """
+        model = self.cache.get('model')
+        if model is None or model.generation != self.schema.generation.value:
+            model = Model(self)
+            self.cache['model'] = model
+        return model
 
     def namespace(self, prefix=None):
         """
@@ -383,6 +451,7 @@ class SchemaObject(object):
         """
         Merge another object as needed.
         """
+        self.invalidate()
         other.qualify()
         for n in ('name',
                   'qname',
@@ -492,19 +561,117 @@ class SchemaObject(object):
         return myrep.encode('utf-8')
 
     def __len__(self):
-        n = 0
-        for x in self:
-            n += 1
-        return n
+        return len(self.model().content)
 
     def __iter__(self):
-        return Iter(self)
+        return iter(self.model().content)
 
     def __getitem__(self, index):
-        i = 0
-        for c in self:
-            if i == index:
-                return c
+        content = self.model().content
+        if 0 <= index < len(content):
+            return content[index]
+
+
+class Model(object):
+    """
+    The (frozen) flattened content model of a schema object: the
+    content free of container elements such as <sequence/> and
+    <choice/> as provided by L{Iter}, split and indexed by name.
+    @ivar generation: The L{Generation} of the object's schema when
+        built.
+    @type generation: int
+    @ivar content: The content: ((child, ancestry),..)
+    @type content: tuple
+    @ivar children: The non-attribute content: ((child, ancestry),..)
+    @type children: tuple
+    @ivar choice: Whether the ancestry of each of the I{children}
+        contains a <choice/>.
+    @type choice: (bool,..)
+    @ivar attributes: The attribute content: ((attr, ancestry),..)
+    @type attributes: tuple
+    @ivar attrnames: The (I{_} prefixed) name of each of the
+        I{attributes}.
+    @type attrnames: (str,..)
+    @ivar ordering: The names of the (named) content; attribute names
+        are prefixed by I{_}.
+    @type ordering: (str,..)
+    @ivar names: The first child by name: {name: (position, child, ancestry)}
+    @type names: dict
+    @ivar any: The first <xs:any/> child: (position, child, ancestry)
+    @type any: tuple
+    @ivar attrindex: The first attribute by name: {name: (attr, ancestry)}
+    @type attrindex: dict
+    """
+
+    def __init__(self, sx):
+        """
+        @param sx: A schema object.
+        @type sx: L{SchemaObject}
+        """
+        self.generation = sx.schema.generation.value
+        self.content = tuple(Iter(sx))
+        children = []
+        choice = []
+        attributes = []
+        ordering = []
+        for item in self.content:
+            child, ancestry = item
+            if child.isattr():
+                attributes.append(item)
+            else:
+                children.append(item)
+                choice.append(any([a.choice() for a in ancestry]))
+            if child.name is None:
+                continue
+            if child.isattr():
+                ordering.append('_%s' % child.name)
+            else:
+                ordering.append(child.name)
+        self.children = tuple(children)
+        self.choice = tuple(choice)
+        self.attributes = tuple(attributes)
+        self.attrnames = tuple(['_%s' % a.name for a, ancestry in attributes])
+        self.ordering = tuple(ordering)
+        self.names = {}
+        self.any = None
+        for n, (child, ancestry) in enumerate(self.children):
+            if child.any():
+                if self.any is None:
+                    self.any = (n, child, ancestry)
+                continue
+            if child.name not in self.names:
+                self.names[child.name] = (n, child, ancestry)
+        self.attrindex = {}
+        for attr, ancestry in self.attributes:
+            if attr.name not in self.attrindex:
+                self.attrindex[attr.name] = (attr, ancestry)
+
+    def child(self, name):
+        """
+        Get a child by name.  An <xs:any/> that precedes the named
+        child (in the content) matches any name.
+        @param name: A child name.
+        @type name: str
+        @return: A tuple: the requested (child, ancestry).
+        @rtype: (L{SchemaObject}, [L{SchemaObject},..])
+        """
+        found = self.names.get(name)
+        if self.any is not None:
+            if found is None or self.any[0] < found[0]:
+                found = self.any
+        if found is None:
+            return (None, [])
+        return (found[1], found[2])
+
+    def attribute(self, name):
+        """
+        Get an attribute by name.
+        @param name: An attribute name.
+        @type name: str
+        @return: A tuple: the requested (attribute, ancestry).
+        @rtype: (L{SchemaObject}, [L{SchemaObject},..])
+        """
+        return self.attrindex.get(name, (None, []))
 
 
 class Iter(object):
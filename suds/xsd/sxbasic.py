@@ -758,13 +758,16 @@ class Factory(object):
             return None
 
     @classmethod
-    def build(cls, root, schema, filter=('*',)):
+    def build(cls, root, schema, filter=('*',), lazy=False):
         """
         Build an xsobject representation.
         @param root: An schema XML root.
         @type root: L{sax.element.Element}
         @param filter: A tag filter.
         @type filter: [str,...]
+        @param lazy: Defer building the content of the children (but
+            imports and includes) until first used.
+        @type lazy: bool
         @return: A schema object graph.
         @rtype: L{sxbase.SchemaObject}
         """
@@ -775,6 +778,10 @@ class Factory(object):
                 if child is None:
                     continue
                 children.append(child)
+                if lazy and not isinstance(child, (Import, Include)):
+                    child.qualify()
+                    child.defer()
+                    continue
                 c = cls.build(node, schema, child.childtags())
                 child.rawchildren = c
         return children
@@ -16,6 +16,10 @@
 
 import sys
 import logging
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
 
 
 def setup_logging():
@@ -24,3 +28,227 @@ def setup_logging():
     else:
         fmt = '%(asctime)s [%(levelname)s] %(funcName)s() @%(filename)s:%(lineno)d\n%(message)s\n'
     logging.basicConfig(level=logging.INFO, format=fmt)
+
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="urn:root"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="urn:root"%(xmlns)s>
+  <wsdl:types>
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        elementFormDefault="qualified" targetNamespace="urn:root">
+%(types)s
+    </xs:schema>
+  </wsdl:types>
+%(messages)s
+  <wsdl:portType name="Root">
+%(operations)s
+  </wsdl:portType>
+  <wsdl:binding name="RootBinding" type="tns:Root">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+%(bindings)s
+  </wsdl:binding>
+  <wsdl:service name="RootService">
+    <wsdl:port name="RootPort" binding="tns:RootBinding">
+      <soap:address location="http://localhost/root"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+XSD = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    elementFormDefault="qualified" targetNamespace="urn:%(ns)s"
+    xmlns:tns="urn:%(ns)s">
+%(imports)s
+  <xs:complexType name="%(type)s">
+    <xs:sequence>
+%(fields)s
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+IMPORT = '      <xs:import namespace="urn:%s" schemaLocation="%s"/>'
+
+INCLUDE = '      <xs:include schemaLocation="%s"/>'
+
+TYPES = """      <xs:element name="op%(n)d" type="%(type)s"/>
+      <xs:element name="op%(n)dResponse" type="tns:item%(n)d"/>
+      <xs:complexType name="item%(n)d">
+        <xs:sequence>
+%(fields)s
+        </xs:sequence>
+      </xs:complexType>"""
+
+FIELD = '          <xs:element name="%s" type="xs:string" minOccurs="0"/>'
+
+MESSAGES = """  <wsdl:message name="op%(n)d">
+    <wsdl:part name="parameters" element="tns:op%(n)d"/>
+  </wsdl:message>
+  <wsdl:message name="op%(n)dResponse">
+    <wsdl:part name="parameters" element="tns:op%(n)dResponse"/>
+  </wsdl:message>"""
+
+OPERATION = """    <wsdl:operation name="op%(n)d">
+      <wsdl:input message="tns:op%(n)d"/>
+      <wsdl:output message="tns:op%(n)dResponse"/>
+    </wsdl:operation>"""
+
+BINDING = """    <wsdl:operation name="op%(n)d">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>"""
+
+
+def wsdl(operations=1, fields=20, type=None, imports=()):
+    """
+    Get a (document/literal) WSDL of the operations I{op0}..I{opN}.
+    Operation I{opN} takes an I{opN} element of the I{type} (default:
+    I{itemN}) and returns an I{opNResponse} element of the I{itemN}
+    type of string fields I{field0}..I{fieldN}.
+    @param operations: The number of operations.
+    @type operations: int
+    @param fields: The number of fields of the I{itemN} types.
+    @type fields: int
+    @param type: The (qualified) type of the I{opN} elements.
+    @type type: str
+    @param imports: The imported schemas: [(name, location),..] of the
+        namespace I{urn:name} declared with the I{name} prefix.
+    @type imports: [(str, str),..]
+    @rtype: str
+    """
+    lines = '\n'.join([FIELD % ('field%d' % n) for n in range(fields)])
+    parts = dict(xmlns=''.join(['\n    xmlns:%s="urn:%s"' % (name, name) for name, location in imports]))
+    for key, template in (('types', TYPES), ('messages', MESSAGES),
+                          ('operations', OPERATION), ('bindings', BINDING)):
+        parts[key] = [template % dict(n=n, fields=lines, type=type or 'tns:item%d' % n)
+                      for n in range(operations)]
+    parts['types'] = [IMPORT % i for i in imports] + parts['types']
+    for key in ('types', 'messages', 'operations', 'bindings'):
+        parts[key] = '\n'.join(parts[key])
+    return WSDL % parts
+
+
+def xsd(ns, type=None, fields=('value',), imports=(), includes=()):
+    """
+    Get a schema (of namespace I{urn:ns}) defining one complex I{type}
+    (default: I{ns}) of string I{fields}.
+    @param ns: The name of the namespace.
+    @type ns: str
+    @param type: The name of the type.
+    @type type: str
+    @param fields: The field names.
+    @type fields: [str,..]
+    @param imports: The imported schemas: [(ns, location),..]
+    @type imports: [(str, str),..]
+    @param includes: The locations of the included schemas.
+    @type includes: [str,..]
+    @rtype: str
+    """
+    return XSD % dict(
+        ns=ns,
+        type=type or ns,
+        imports='\n'.join([IMPORT % i for i in imports] + [INCLUDE % i for i in includes]),
+        fields='\n'.join([FIELD % f for f in fields]))
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    The (quiet, keep-alive) base of the HTTP stub request handlers.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def reply(self, body, code=200, headers=()):
+        """
+        Send a (text/xml) reply.
+        @param body: The body.
+        @type body: bytes
+        @param code: The HTTP status code.
+        @type code: int
+        @param headers: Additional headers: [(name, value),..]
+        @type headers: [(str, str),..]
+        """
+        self.send_response(code)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Documents(Handler):
+    """
+    Serves the I{documents} of the server by path (after the server
+    I{latency}) and records the requested paths.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+        time.sleep(server.latency)
+        document = server.documents.get(self.path)
+        if document is None:
+            self.reply(b'not found', 404)
+        else:
+            self.reply(document.encode('utf-8'))
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    An HTTP stub server listening on a free local port, served on a
+    (daemon) thread until stopped.
+    @ivar documents: The documents served by L{Documents}: {path: str}
+    @type documents: dict
+    @ivar requests: The requests recorded by the handler.
+    @type requests: list
+    @ivar lock: Guards the I{requests}.
+    @type lock: I{threading.Lock}
+    @ivar latency: The time (seconds) taken by L{Documents} to reply.
+    @type latency: float
+    """
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, handler=Documents, documents=(), latency=0):
+        """
+        @param handler: The request handler class.
+        @type handler: L{Handler}
+        @param documents: The documents served: {path: str}
+        @type documents: dict
+        @param latency: The time (seconds) taken by L{Documents} to reply.
+        @type latency: float
+        """
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.documents = dict(documents)
+        self.requests = []
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def url(self, path=''):
+        """
+        Get the URL of a I{path} on the server.
+        @param path: A path.
+        @type path: str
+        @rtype: str
+        """
+        return 'http://127.0.0.1:%d%s' % (self.server_port, path)
+
+    def stop(self):
+        """
+        Stop serving and close the (listening) socket.
+        """
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,301 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import asyncio
+import os
+import re
+import ssl
+import sys
+
+from suds import WebFault
+from suds.asyncclient import AsyncClient
+from suds.client import Client
+from suds.transport import TransportError
+from suds.transport.asynchttp import AsyncHttpTransport
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+REPLY = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+         <ns2:return>%d</ns2:return>
+      </ns2:duckAddResponse>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+FAULT = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <soap:Fault>
+         <faultcode>soap:Server</faultcode>
+         <faultstring>no such duck</faultstring>
+      </soap:Fault>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+class Server(object):
+    """
+    A minimal asyncio http server replying to duckAdd with the
+    length of the username, or a fault for an empty username.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return 'http://127.0.0.1:%d/DuckService2' % port
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, value = line.decode('latin-1').split(':', 1)
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                body = (await reader.readexactly(length)).decode('utf-8')
+                self.requests += 1
+                await asyncio.sleep(0.01)
+                username = re.search(r'<ns\d:username>(.*)</ns\d:username>', body)
+                if username and username.group(1):
+                    status = '200 OK'
+                    reply = REPLY % len(username.group(1))
+                else:
+                    status = '500 Internal Server Error'
+                    reply = FAULT
+                reply = reply.encode('utf-8')
+                head = 'HTTP/1.1 %s\r\nContent-Type: text/xml\r\n' \
+                       'Content-Length: %d\r\n\r\n' % (status, len(reply))
+                if username and username.group(1) == 'truncated':
+                    writer.write(head.encode('latin-1') + reply[:len(reply) // 2])
+                    await writer.drain()
+                    break
+                writer.write(head.encode('latin-1') + reply)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+class Proxy(object):
+    """
+    A minimal asyncio http proxy tunnelling CONNECT requests.
+    """
+
+    def __init__(self):
+        self.tunnels = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        return 'http://127.0.0.1:%d' % self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        line = await reader.readline()
+        while (await reader.readline()) not in (b'\r\n', b''):
+            pass
+        method, target, version = line.decode('latin-1').split()
+        self.tunnels.append(target)
+        host, port = target.rsplit(':', 1)
+        sreader, swriter = await asyncio.open_connection(host, int(port))
+        writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+        await writer.drain()
+
+        async def relay(source, sink):
+            try:
+                while True:
+                    data = await source.read(65536)
+                    if not data:
+                        break
+                    sink.write(data)
+                    await sink.drain()
+            except OSError:
+                pass
+            finally:
+                sink.close()
+        await asyncio.gather(relay(reader, swriter), relay(sreader, writer))
+
+
+class TestAsyncClient(TestCase):
+
+    def setUp(self):
+        self.url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+
+    def run_async(self, fn):
+        async def main():
+            server = Server()
+            location = await server.start()
+            try:
+                return await fn(server, location)
+            finally:
+                await server.stop()
+        return asyncio.run(main())
+
+    def testInvoke(self):
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            result = await client.service.duckAdd(username='donald', password='x', settings=[])
+            await client.close()
+            return result
+        self.assertEqual(6, self.run_async(fn))
+
+    def testConcurrentInvoke(self):
+        names = ['d' * n for n in range(1, 51)]
+
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            calls = [client.service.duckAdd(username=n, password='x', settings=[]) for n in names]
+            result = await asyncio.gather(*calls)
+            await client.close()
+            return result, server
+        result, server = self.run_async(fn)
+        self.assertEqual([len(n) for n in names], result)
+        self.assertEqual(50, server.requests)
+
+    def testConnectionReused(self):
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            for n in range(5):
+                await client.service.duckAdd(username='duck', password='x', settings=[])
+            await client.close()
+            return server
+        server = self.run_async(fn)
+        self.assertEqual(5, server.requests)
+        self.assertEqual(1, server.connections)
+
+    def testTruncatedNotRetried(self):
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            await client.service.duckAdd(username='duck', password='x', settings=[])
+            try:
+                await client.service.duckAdd(username='truncated', password='x', settings=[])
+                self.fail('expected TransportError')
+            except TransportError:
+                pass
+            finally:
+                await client.close()
+            return server
+        server = self.run_async(fn)
+        self.assertEqual(2, server.requests)
+        self.assertEqual(1, server.connections)
+
+    def testHttpsProxy(self):
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(os.path.abspath('localhost.pem'))
+
+        async def main():
+            server = Server()
+            server.server = await asyncio.start_server(
+                server.handle, '127.0.0.1', 0, ssl=context)
+            port = server.server.sockets[0].getsockname()[1]
+            proxy = Proxy()
+            location = await proxy.start()
+            transport = AsyncHttpTransport(
+                proxy={'https': location}, unverified_context=True)
+            client = AsyncClient(
+                self.url, location='https://127.0.0.1:%d/DuckService2' % port,
+                asynctransport=transport)
+            try:
+                results = []
+                for n in range(2):
+                    results.append(await client.service.duckAdd(
+                        username='duck', password='x', settings=[]))
+            finally:
+                await client.close()
+                await proxy.stop()
+                await server.stop()
+            return results, proxy, server, port
+        results, proxy, server, port = asyncio.run(main())
+        self.assertEqual([4, 4], results)
+        self.assertEqual(['127.0.0.1:%d' % port], proxy.tunnels)
+        self.assertEqual(1, server.connections)
+
+    def testFault(self):
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            try:
+                await client.service.duckAdd(username='', password='x', settings=[])
+                self.fail('expected WebFault')
+            except WebFault as e:
+                return e
+            finally:
+                await client.close()
+        e = self.run_async(fn)
+        self.assertEqual('no such duck', e.fault.faultstring)
+
+    def testFromClient(self):
+        client = Client(self.url)
+
+        async def fn(server, location):
+            aclient = AsyncClient.from_client(client)
+            aclient.set_options(location=location)
+            self.assertTrue(aclient.wsdl is client.wsdl)
+            self.assertTrue(aclient.factory is client.factory)
+            result = await aclient.service.duckAdd(username='dd', password='x', settings=[])
+            await aclient.close()
+            return result
+        self.assertEqual(2, self.run_async(fn))
+
+    def testMap(self):
+        names = ['d' * n for n in range(1, 21)] + ['']
+
+        async def fn(server, location):
+            client = AsyncClient(self.url, location=location)
+            items = [dict(username=n, password='x', settings=[]) for n in names]
+            result = await client.service.duckAdd.map(items, workers=4)
+            unordered = []
+            async for r in client.service.duckAdd.imap_unordered(items[:5]):
+                unordered.append(r)
+            await client.close()
+            return result, unordered
+        result, unordered = self.run_async(fn)
+        self.assertEqual(list(range(1, 21)), result[:-1])
+        self.assertTrue(isinstance(result[-1], WebFault))
+        self.assertEqual([(n, n + 1) for n in range(5)], sorted(unordered))
+
+    def testSimulation(self):
+        async def fn(server, location):
+            client = AsyncClient(self.url)
+            return await client.service.duckAdd(
+                username='dd', password='x', settings=[], __inject={'reply': REPLY % 3})
+        self.assertEqual(3, self.run_async(fn))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+
+from suds import WebFault
+from suds.client import Client
+from suds.transport import Reply
+from suds.transport.https import HttpAuthenticated
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+REPLY = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+         <ns2:return>%d</ns2:return>
+      </ns2:duckAddResponse>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+FAULT = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <soap:Fault>
+         <faultcode>soap:Server</faultcode>
+         <faultstring>no such duck</faultstring>
+      </soap:Fault>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+class Transport(HttpAuthenticated):
+    """
+    Opens the WSDL but replies to each request without sending it.
+    """
+
+    def __init__(self, reply, **kwargs):
+        HttpAuthenticated.__init__(self, **kwargs)
+        self.reply = reply
+        self.sent = []
+
+    def send(self, request):
+        self.sent.append(request.message)
+        return Reply(200, {}, self.reply)
+
+
+def item(n):
+    return dict(username='d' * n, password='x', settings=[],
+                __inject={'reply': REPLY % n})
+
+
+class TestBatch(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url)
+
+    def testMap(self):
+        items = [item(n) for n in range(100)]
+        results = self.client.service.duckAdd.map(items, workers=4)
+        self.assertEqual(list(range(100)), results)
+
+    def testMapGenerator(self):
+        results = self.client.service.duckAdd.map((item(n) for n in range(10)))
+        self.assertEqual(list(range(10)), results)
+
+    def testMapPositional(self):
+        transport = Transport((REPLY % 7).encode())
+        client = Client(self.client.wsdl.url, transport=transport)
+        items = [('ddd', 'x', []),
+                 dict(username='ddd', password='x', settings=[])]
+        results = client.service.duckAdd.map(items, workers=1)
+        self.assertEqual([7, 7], results)
+        self.assertEqual(2, len(transport.sent))
+        self.assertEqual(transport.sent[0], transport.sent[1])
+        self.assertTrue(b'>ddd<' in transport.sent[0])
+
+    def testMapFaults(self):
+        items = [item(n) for n in range(10)]
+        items[3]['__inject'] = {'fault': FAULT}
+        items[7]['__inject'] = {'fault': FAULT}
+        results = self.client.service.duckAdd.map(items)
+        self.assertEqual(10, len(results))
+        for n, result in enumerate(results):
+            if n in (3, 7):
+                self.assertTrue(isinstance(result, WebFault))
+            else:
+                self.assertEqual(n, result)
+
+    def testImapUnordered(self):
+        items = [item(n) for n in range(50)]
+        results = list(self.client.service.duckAdd.imap_unordered(items, workers=3))
+        self.assertEqual(50, len(results))
+        for index, result in results:
+            self.assertEqual(index, result)
+        self.assertEqual(list(range(50)), sorted([r[0] for r in results]))
+
+    def testPrepared(self):
+        method = self.client.wsdl.services[0].ports[0].methods['duckAdd'][0]
+        binding = method.binding.input
+        pdefs = binding.param_defs(method)
+        self.assertTrue(pdefs is binding.param_defs(method))
+        self.assertEqual(['username', 'password', 'settings'], [p[0] for p in pdefs])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import shutil
+import sys
+import tempfile
+
+from suds.client import Client
+from suds.compile import compile, main
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+NS = 'http://example.com/duck/'
+
+
+class TestBundle(TestCase):
+
+    def setUp(self):
+        self.url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'duck.bundle')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def testFromBundle(self):
+        compile(self.url, self.path)
+        expected = Client(self.url, cache=None, nosend=True)
+        client = Client.from_bundle(self.path, nosend=True)
+        self.assertTrue(client.options.nosend)
+        self.assertTrue(client.wsdl.options is client.options)
+        self.assertEqual(sorted(expected.wsdl.schema.types.keys()),
+                         sorted(client.wsdl.schema.types.keys()))
+        self.assertEqual(str(expected), str(client))
+        duck = client.wsdl.schema.types[('duck', NS)]
+        model = duck.cache['model']
+        self.assertTrue(model is duck.model())
+        self.assertTrue(client.wsdl.schema.tables is client.wsdl.schema.lookup())
+        sent = client.service.duckAdd(username='donald', password='x', settings=[])
+        self.assertEqual(
+            expected.service.duckAdd(username='donald', password='x', settings=[]).envelope,
+            sent.envelope)
+        self.assertEqual('tKeyPair', client.factory.create('tKeyPair').__class__.__name__)
+
+    def testStale(self):
+        compile(self.url, self.path)
+        client = Client.from_bundle(self.path)
+        duck = client.wsdl.schema.types[('duck', NS)]
+        model = duck.cache['model']
+        duck.invalidate()
+        self.assertFalse(model is duck.model())
+
+    def testCommand(self):
+        self.assertEqual(0, main([os.path.abspath("test_overload_DuckService2.wsdl"), self.path]))
+        self.assertEqual(['duck.bundle'], os.listdir(self.tmp))
+        self.assertTrue(Client.from_bundle(self.path).wsdl.services)
+
+    def testIncompatible(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b'suds-bundle 0 0.0\n')
+        self.assertRaises(Exception, Client.from_bundle, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,384 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import shutil
+import sys
+import tempfile
+from io import BytesIO
+import threading
+import time
+from datetime import datetime, timedelta
+
+from suds.cache import DocumentCache, MemoryCache, ObjectCache, SqliteCache
+from suds.client import Client
+from suds.plugin import DocumentPlugin
+from suds.sax.parser import Parser
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+
+class Loaded(DocumentPlugin):
+
+    def __init__(self):
+        self.urls = []
+
+    def loaded(self, context):
+        self.urls.append(context.url)
+
+
+class TestObjectCache(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def files(self):
+        return sorted([fn for fn in os.listdir(self.location) if fn != 'version'])
+
+    def testPut(self):
+        cache = ObjectCache(self.location, days=1)
+        cache.put('a', {'x': [1, 2]})
+        self.assertEqual(['suds-a.px'], self.files())
+        self.assertEqual({'x': [1, 2]}, cache.get('a'))
+        self.assertEqual(None, cache.get('b'))
+
+    def testPeek(self):
+        cache = ObjectCache(self.location, days=1)
+        self.assertEqual((None, False), cache.peek('a'))
+        cache.put('a', [1])
+        self.assertEqual(([1], False), cache.peek('a'))
+        past = time.time() - 2 * 24 * 3600
+        os.utime(os.path.join(self.location, 'suds-a.px'), (past, past))
+        self.assertEqual(([1], True), cache.peek('a'))
+        cache.touch('a')
+        self.assertEqual(([1], False), cache.peek('a'))
+        os.utime(os.path.join(self.location, 'suds-a.px'), (past, past))
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual((None, False), cache.peek('a'))
+
+    def testCompression(self):
+        compressed = ObjectCache(self.location, compression=6)
+        compressed.put('a', ['duck'] * 1000)
+        with open(os.path.join(self.location, 'suds-a.px'), 'rb') as fp:
+            self.assertTrue(len(fp.read()) < 100)
+        self.assertEqual(['duck'] * 1000, ObjectCache(self.location).get('a'))
+        self.assertEqual(['duck'] * 1000, compressed.get('a'))
+
+    def testCorrupt(self):
+        cache = ObjectCache(self.location)
+        with open(os.path.join(self.location, 'suds-a.px'), 'wb') as fp:
+            fp.write(b'\x80\x04truncated')
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual([], self.files())
+
+    def testLock(self):
+        cache = ObjectCache(self.location)
+        events = []
+
+        def waiter():
+            with cache.lock('a'):
+                events.append('waiter')
+        with cache.lock('a'):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.1)
+            events.append('holder')
+        thread.join()
+        self.assertEqual(['holder', 'waiter'], events)
+
+    def testLockFiles(self):
+        cache = ObjectCache(self.location)
+        path = os.path.join(self.location, 'suds-a.px.lock')
+        events = []
+
+        def waiter():
+            with cache.lock('a'):
+                events.append(os.path.exists(path))
+        with cache.lock('a'):
+            cache.put('a', [1])
+            self.assertEqual(['suds-a.px', 'suds-a.px.lock'], self.files())
+            cache.clear()
+            self.assertEqual(['suds-a.px.lock'], self.files())
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.1)
+            cache.purge('a')
+            self.assertEqual([], self.files())
+        thread.join()
+        self.assertEqual([True], events)
+
+    def testBuiltOnce(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        cache = ObjectCache(self.location, days=1)
+        plugin = Loaded()
+        clients = []
+
+        def load():
+            client = Client(url, cache=cache, cachingpolicy=1, plugins=[plugin])
+            clients.append(client)
+        threads = [threading.Thread(target=load) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, len(clients))
+        self.assertEqual([url], plugin.urls)
+
+
+class TestDocumentCache(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def testPut(self):
+        cache = DocumentCache(self.location, days=1)
+        d = Parser().parse(string=b'<a xmlns="urn:a"><b>x &amp; y</b></a>')
+        d.validators = {'ETag': '"42"'}
+        cache.put('a', d)
+        cached = cache.get('a')
+        self.assertEqual(d.plain(), cached.plain())
+        self.assertEqual({'ETag': '"42"'}, cached.validators)
+        cache.put('b', d.root())
+        self.assertFalse(hasattr(cache.get('b'), 'validators'))
+        past = time.time() - 2 * 24 * 3600
+        os.utime(os.path.join(self.location, 'suds-a.xml'), (past, past))
+        cached, expired = cache.peek('a')
+        self.assertTrue(expired)
+        self.assertEqual({'ETag': '"42"'}, cached.validators)
+
+    def testClient(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        cache = DocumentCache(self.location, days=1)
+        plugin = Loaded()
+        first = Client(url, cache=cache, plugins=[plugin])
+        second = Client(url, cache=cache, plugins=[plugin])
+        self.assertEqual([url], plugin.urls)
+        self.assertEqual(str(first), str(second))
+
+
+class TestMemoryCache(TestCase):
+
+    def testLRU(self):
+        cache = MemoryCache(size=2)
+        cache.put('a', [1])
+        cache.put('b', [2])
+        self.assertEqual([1], cache.get('a'))
+        cache.put('c', [3])
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual([1], cache.get('a'))
+        self.assertEqual([3], cache.get('c'))
+        self.assertEqual(dict(size=2, hits=3, misses=1, evictions=1), cache.stats())
+
+    def testCopied(self):
+        cache = MemoryCache()
+        value = {'x': [1]}
+        cache.put('a', value)
+        value['x'].append(2)
+        first = cache.get('a')
+        self.assertEqual({'x': [1]}, first)
+        first['x'].append(3)
+        self.assertEqual({'x': [1]}, cache.get('a'))
+
+    def testLive(self):
+        cache = MemoryCache(copy=False)
+        value = {'x': [1]}
+        cache.put('a', value)
+        self.assertTrue(cache.get('a') is value)
+        self.assertTrue(cache.peek('a')[0] is value)
+        self.assertEqual(None, cache.getf('a'))
+
+    def testLock(self):
+        cache = MemoryCache()
+        events = []
+
+        def waiter():
+            with cache.lock('a'):
+                events.append('waiter')
+        with cache.lock('a'):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.1)
+            events.append('holder')
+            self.assertEqual(['a'], list(cache.locks))
+        thread.join()
+        self.assertEqual(['holder', 'waiter'], events)
+        self.assertEqual({}, cache.locks)
+
+    def testDuration(self):
+        cache = MemoryCache(minutes=5)
+        self.assertEqual(('minutes', 5), cache.duration)
+        self.assertRaises(Exception, cache.setduration, years=1)
+        cache.put('a', [1])
+        self.assertEqual([1], cache.get('a'))
+        created, bfr, pickled = cache.entries['a']
+        cache.entries['a'] = (created - timedelta(minutes=6), bfr, pickled)
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(1, cache.evictions)
+        self.assertFalse(MemoryCache().expired(datetime(2000, 1, 1)))
+
+    def testPeek(self):
+        cache = MemoryCache(minutes=5)
+        self.assertEqual((None, False), cache.peek('a'))
+        cache.put('a', [1])
+        created, bfr, pickled = cache.entries['a']
+        cache.entries['a'] = (created - timedelta(minutes=6), bfr, pickled)
+        self.assertEqual(([1], True), cache.peek('a'))
+        cache.touch('a')
+        self.assertEqual(([1], False), cache.peek('a'))
+
+    def testFile(self):
+        cache = MemoryCache()
+        self.assertEqual(None, cache.getf('a'))
+        fp = cache.putf('a', BytesIO(b'<a/>'))
+        self.assertEqual(b'<a/>', fp.read())
+        self.assertEqual(b'<a/>', cache.getf('a').read())
+
+    def testBackend(self):
+        location = tempfile.mkdtemp()
+        try:
+            backend = ObjectCache(location, days=1)
+            backend.put('a', [1])
+            cache = MemoryCache(size=10, backend=backend)
+            self.assertEqual([1], cache.get('a'))
+            self.assertEqual(1, cache.misses)
+            self.assertEqual([1], cache.get('a'))
+            self.assertEqual(1, cache.hits)
+            cache.put('b', [2])
+            self.assertEqual([2], backend.get('b'))
+            cache.purge('b')
+            self.assertEqual(None, backend.get('b'))
+            self.assertEqual(None, cache.get('b'))
+        finally:
+            shutil.rmtree(location)
+
+    def testClient(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        for policy in (0, 1):
+            cache = MemoryCache()
+            plugin = Loaded()
+            first = Client(url, cache=cache, cachingpolicy=policy, plugins=[plugin])
+            second = Client(url, cache=cache, cachingpolicy=policy, plugins=[plugin])
+            self.assertEqual([url], plugin.urls)
+            self.assertEqual(1, cache.hits)
+            self.assertFalse(first.wsdl is second.wsdl)
+            self.assertEqual(str(first), str(second))
+
+
+class TestSqliteCache(TestCase):
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.path = os.path.join(self.location, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def age(self, cache, id, minutes):
+        cache.connection().execute(
+            'UPDATE entry SET created = created - ? WHERE id = ?', (minutes * 60, id))
+
+    def testPut(self):
+        cache = SqliteCache(self.path, days=1)
+        self.assertEqual(None, cache.get('a'))
+        cache.put('a', {'x': [1]})
+        cache.put('a', {'x': [2]})
+        self.assertEqual({'x': [2]}, cache.get('a'))
+        self.assertEqual({'x': [2]}, SqliteCache(self.path).get('a'))
+        cache.purge('a')
+        self.assertEqual(None, cache.get('a'))
+
+    def testVersion(self):
+        cache = SqliteCache(self.path)
+        cache.put('a', 1)
+        cache.connection().execute("UPDATE version SET version = '0.0'")
+        self.assertEqual(None, SqliteCache(self.path).get('a'))
+
+    def testFile(self):
+        cache = SqliteCache(self.path)
+        self.assertEqual(b'<a/>', cache.putf('a', BytesIO(b'<a/>')).read())
+        self.assertEqual(b'<a/>', cache.getf('a').read())
+        self.assertEqual(None, cache.getf('b'))
+
+    def testLock(self):
+        cache = SqliteCache(self.path)
+        for id in ('a', 'b'):
+            with cache.lock(id):
+                cache.put(id, id)
+        locks = [fn for fn in os.listdir(self.location) if fn.endswith('.lock')]
+        self.assertEqual(['cache.db.lock'], locks)
+
+    def testExpiry(self):
+        cache = SqliteCache(self.path, minutes=5)
+        for id in ('a', 'b', 'c'):
+            cache.put(id, id)
+        self.age(cache, 'a', 6)
+        self.age(cache, 'b', 10)
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual('c', cache.get('c'))
+        self.assertEqual(dict(size=3, expired=2, bytes=cache.stats()['bytes']), cache.stats())
+        self.assertEqual(2, cache.expire())
+        self.assertEqual(1, cache.stats()['size'])
+        self.assertEqual(0, SqliteCache(self.path).expire())
+
+    def testPeek(self):
+        cache = SqliteCache(self.path, minutes=5)
+        self.assertEqual((None, False), cache.peek('a'))
+        cache.put('a', [1])
+        self.age(cache, 'a', 6)
+        self.assertEqual(([1], True), cache.peek('a'))
+        cache.touch('a')
+        self.assertEqual(([1], False), cache.peek('a'))
+
+    def testThreads(self):
+        cache = SqliteCache(self.path)
+        errors = []
+
+        def work(n):
+            try:
+                for i in range(20):
+                    cache.put('%d-%d' % (n, i), [n, i])
+                    self.assertEqual([n, i], cache.get('%d-%d' % (n, i)))
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(80, cache.stats()['size'])
+
+    def testClient(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        plugin = Loaded()
+        cache = SqliteCache(self.path, days=1)
+        first = Client(url, cache=cache, cachingpolicy=1, plugins=[plugin])
+        second = Client(url, cache=SqliteCache(self.path, days=1), cachingpolicy=1, plugins=[plugin])
+        self.assertEqual([url], plugin.urls)
+        self.assertEqual(str(first), str(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
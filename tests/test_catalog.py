@@ -0,0 +1,179 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import zipfile
+
+from suds.client import Client
+from suds.store import Catalog, CatalogStore, Recorder
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging, Server, wsdl, xsd
+
+setup_logging()
+
+WSDL = wsdl(type='a:a', imports=[('a', 'xsd/a.xsd?version=2')])
+
+XSD = xsd('a')
+
+
+class TestCatalog(TestCase):
+
+    def testResolve(self):
+        catalog = Catalog()
+        catalog.add('http://example.com/service?wsdl', 'service.wsdl')
+        catalog.rewrite('http://example.com/', 'example/')
+        catalog.rewrite('http://example.com/xsd/', 'xsd/')
+        self.assertEqual('service.wsdl', catalog.resolve('http://example.com/service?wsdl'))
+        self.assertEqual('xsd/a/b.xsd', catalog.resolve('http://example.com/xsd/a/b.xsd'))
+        self.assertEqual('example/c.xsd', catalog.resolve('http://example.com/c.xsd'))
+        self.assertEqual(None, catalog.resolve('http://example.org/c.xsd'))
+        parsed = Catalog.parse(catalog.str().encode('utf-8'))
+        self.assertEqual(catalog.uris, parsed.uris)
+        self.assertEqual(catalog.rewrites, parsed.rewrites)
+
+    def testSystem(self):
+        content = b"""<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+          <system systemId="http://example.com/a.xsd" uri="a.xsd"/>
+          <rewriteSystem systemIdStartString="http://example.com/b/" rewritePrefix="b/"/>
+        </catalog>"""
+        catalog = Catalog.parse(content)
+        self.assertEqual('a.xsd', catalog.resolve('http://example.com/a.xsd'))
+        self.assertEqual('b/c.xsd', catalog.resolve('http://example.com/b/c.xsd'))
+
+
+class TestStore(TestCase):
+
+    def setUp(self):
+        self.server = Server(documents={
+            '/echo.wsdl': WSDL,
+            '/xsd/a.xsd?version=2': XSD,
+        })
+        self.url = self.server.url('/echo.wsdl')
+        self.tmp = tempfile.mkdtemp()
+        self.recorded = os.path.join(self.tmp, 'recorded')
+
+    def tearDown(self):
+        self.stop()
+        shutil.rmtree(self.tmp)
+
+    def stop(self):
+        if self.server is not None:
+            self.server.stop()
+            self.server = None
+
+    def record(self, archive=None):
+        recorder = Recorder(self.recorded)
+        client = Client(self.url, cache=None, plugins=[recorder])
+        self.assertEqual(2, len(self.server.requests))
+        recorder.save(archive)
+        return client
+
+    def fields(self, client):
+        type = client.wsdl.schema.types[('a', 'urn:a')]
+        return [c.name for c, a in type.children()]
+
+    def testRecorded(self):
+        self.record()
+        port = self.server.server_port
+        self.assertTrue(os.path.exists(os.path.join(self.recorded, '127.0.0.1_%d' % port, 'echo.wsdl')))
+        catalog = Catalog.parse(open(os.path.join(self.recorded, 'catalog.xml'), 'rb').read())
+        self.assertEqual(2, len(catalog.uris))
+        self.stop()
+        client = Client(self.url, cache=None, store=CatalogStore(self.recorded, strict=True))
+        self.assertEqual(['value'], self.fields(client))
+
+    def testZip(self):
+        archive = os.path.join(self.tmp, 'wsdl.zip')
+        live = self.record(archive)
+        self.stop()
+        shutil.rmtree(self.recorded)
+        store = CatalogStore(archive, strict=True)
+        client = Client(self.url, cache=None, store=store)
+        self.assertEqual(self.fields(live), self.fields(client))
+        self.assertEqual(str(live), str(client))
+        self.assertTrue(client.clone().options.store is store)
+
+    def testTar(self):
+        self.record()
+        self.stop()
+        archive = os.path.join(self.tmp, 'wsdl.tar')
+        with tarfile.open(archive, 'w') as tar:
+            for name in os.listdir(self.recorded):
+                tar.add(os.path.join(self.recorded, name), name)
+        client = Client(self.url, cache=None, store=CatalogStore(archive, strict=True))
+        self.assertEqual(['value'], self.fields(client))
+
+    def testRewrite(self):
+        os.makedirs(os.path.join(self.tmp, 'local', 'xsd'))
+        for name, content in (('echo.wsdl', WSDL), ('xsd/a.xsd', XSD)):
+            with open(os.path.join(self.tmp, 'local', name), 'w') as fp:
+                fp.write(content)
+        base = self.url.rsplit('/', 1)[0]
+        catalog = Catalog()
+        catalog.rewrite(base + '/', '')
+        catalog.add(base + '/xsd/a.xsd?version=2', 'xsd/a.xsd')
+        store = CatalogStore(os.path.join(self.tmp, 'local'), catalog)
+        client = Client(self.url, cache=None, store=store)
+        self.assertEqual(['value'], self.fields(client))
+        self.assertEqual([], self.server.requests)
+
+    def testOutside(self):
+        os.makedirs(os.path.join(self.tmp, 'store'))
+        with open(os.path.join(self.tmp, 'secret.xml'), 'w') as fp:
+            fp.write('<secret/>')
+        with open(os.path.join(self.tmp, 'store', 'a.xml'), 'w') as fp:
+            fp.write('<a/>')
+        store = CatalogStore(os.path.join(self.tmp, 'store'), Catalog())
+        self.assertEqual(b'<a/>', store.read('x/../a.xml'))
+        for location in ('../secret.xml', 'x/../../secret.xml', os.path.join(self.tmp, 'secret.xml')):
+            self.assertRaises(Exception, store.read, location)
+
+    def testEncrypted(self):
+        archive = os.path.join(self.tmp, 'encrypted.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('catalog.xml', Catalog().str())
+        with open(archive, 'rb') as fp:
+            content = bytearray(fp.read())
+        # flag the (only) member as encrypted in its local and central headers.
+        content[6] |= 1
+        content[content.index(b'PK\x01\x02') + 8] |= 1
+        with open(archive, 'wb') as fp:
+            fp.write(content)
+        self.assertRaises(Exception, CatalogStore, archive)
+
+    def testClose(self):
+        archive = os.path.join(self.tmp, 'wsdl.zip')
+        self.record(archive)
+        with CatalogStore(archive, strict=True) as store:
+            self.assertEqual(['value'], self.fields(Client(self.url, cache=None, store=store)))
+        self.assertTrue(store.archive.map.closed)
+
+    def testStrict(self):
+        os.makedirs(os.path.join(self.tmp, 'empty'))
+        lenient = CatalogStore(os.path.join(self.tmp, 'empty'), Catalog())
+        self.assertEqual(['value'], self.fields(Client(self.url, cache=None, store=lenient)))
+        self.assertEqual(2, len(self.server.requests))
+        strict = CatalogStore(os.path.join(self.tmp, 'empty'), Catalog(), strict=True)
+        self.assertRaises(Exception, Client, self.url, cache=None, store=strict)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+import threading
+import time
+
+from suds.client import Client
+from suds.mx.template import Message
+from suds.sax.text import Raw
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+
+class TestCompiled(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url, nosend=True)
+        self.compiled = Client(url, nosend=True, compiledmessages=True)
+
+    def send(self, client, *args, **kwargs):
+        return client.service.duckAdd(*args, **kwargs).envelope
+
+    def assertSame(self, *args, **kwargs):
+        expected = self.send(self.client, *args, **kwargs)
+        compiled = self.send(self.compiled, *args, **kwargs)
+        self.assertEqual(expected, compiled)
+        return compiled
+
+    def templates(self):
+        method = self.compiled.wsdl.services[0].ports[0].methods['duckAdd'][0]
+        return method.binding.input.templates
+
+    def testRepeated(self):
+        for n in range(5):
+            self.assertSame(username='d' * (n + 1), password=str(n), settings=[])
+        self.assertEqual(1, len(self.templates()))
+        self.assertTrue(isinstance(self.compiled.last_sent(), Message))
+
+    def testPositional(self):
+        self.assertSame('donald', 'x', [])
+        self.assertSame('daisy', 'y', [])
+        self.assertEqual(1, len(self.templates()))
+
+    def testNested(self):
+        for n in range(3):
+            settings = [dict(key='k%d' % i, value='v%d' % n) for i in range(n)]
+            self.assertSame(username='donald', password='x', settings=settings)
+        self.assertSame(username='donald', password='y', settings=[dict(key='a', value='b')])
+        self.assertEqual(3, len(self.templates()))
+
+    def testObjects(self):
+        pair = self.client.factory.create('tKeyPair')
+        pair.key = 'color'
+        pair.value = 'yellow'
+        self.assertSame(username='donald', password='x', settings=[pair])
+        pair.value = 'white'
+        envelope = self.assertSame(username='donald', password='x', settings=[pair])
+        self.assertTrue(b'>white<' in envelope)
+
+    def testEscaped(self):
+        self.assertSame(username='plain', password='x', settings=[])
+        envelope = self.assertSame(
+            username='d&<>"\'', password='&amp;', settings=[])
+        self.assertTrue(b'd&amp;&lt;&gt;' in envelope)
+        self.assertSame(username=Raw('<b>raw</b>'), password='x', settings=[])
+
+    def testShapes(self):
+        self.assertSame(username='donald', password='x', settings=[])
+        self.assertSame(username='donald', password=None, settings=[])
+        self.assertSame(username='donald', password='', settings=[])
+        self.assertSame(username=10, password=1.5, settings=[])
+        self.assertEqual(4, len(self.templates()))
+
+    def testBounded(self):
+        binding = self.compiled.wsdl.services[0].ports[0].methods['duckAdd'][0].binding.input
+        binding.capacity = 3
+        for n in range(5):
+            self.assertSame(username='donald', password='x', settings=[{'key': 'k', 'value': 'v'}] * n)
+        self.assertEqual(3, len(self.templates()))
+        self.assertSame(username='donald', password='x', settings=[])
+        self.assertEqual(3, len(self.templates()))
+
+    def testThreads(self):
+        binding = self.compiled.wsdl.services[0].ports[0].methods['duckAdd'][0].binding.input
+        compiled = []
+        compile_message = binding.compile_message
+
+        def counted(*args):
+            compiled.append(args)
+            time.sleep(0.05)
+            return compile_message(*args)
+        binding.compile_message = counted
+        barrier = threading.Barrier(8)
+
+        def call(n):
+            barrier.wait()
+            self.send(self.compiled, username='d' * n, password='x', settings=[])
+        threads = [threading.Thread(target=call, args=(n,)) for n in range(1, 9)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(1, len(compiled))
+        self.assertEqual(1, len(self.templates()))
+
+    def testParser(self):
+        self.compiled.set_options(parser='expat')
+        self.assertSame(username='donald', password='x', settings=[])
+        message = self.compiled.last_sent()
+        self.assertEqual('expat', message.parser)
+        self.assertEqual('donald', message.root().getChild('Body')[0].getChild('username').text)
+
+    def testPretty(self):
+        self.client.set_options(prettyxml=True)
+        self.compiled.set_options(prettyxml=True)
+        self.assertSame(username='donald', password='x', settings=[])
+        self.assertSame(username='daisy', password='y', settings=[])
+
+    def testPlugin(self):
+        from suds.plugin import MessagePlugin
+
+        class Marker(MessagePlugin):
+            def marshalled(self, context):
+                context.envelope.getChild('Body')[0].set('marked', 'true')
+        self.client.set_options(plugins=[Marker()])
+        self.compiled.set_options(plugins=[Marker()])
+        envelope = self.assertSame(username='donald', password='x', settings=[])
+        self.assertTrue(b'marked="true"' in envelope)
+
+
+if __name__ == '__main__':
+    unittest.main()
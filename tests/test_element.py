@@ -0,0 +1,118 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import pickle
+import sys
+from copy import deepcopy
+
+from suds.sax.attribute import Attribute
+from suds.sax.element import Element
+from suds.sax.enc import Encoder
+from suds.sax.parser import Parser
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+XML = """<p:a xmlns:p="urn:p" xmlns:q="urn:q"><p:b q:x="1">text</p:b><c/></p:a>"""
+
+
+class TestElement(TestCase):
+
+    def parse(self):
+        return Parser().parse(string=XML.encode('utf-8')).root()
+
+    def testSharedEmpty(self):
+        a = Element('a')
+        b = Element('b')
+        self.assertTrue(a._children is b._children)
+        self.assertTrue(a._attributes is b._attributes)
+        self.assertRaises(TypeError, a._children.append, b)
+        a.append(b)
+        a.append(Attribute('x', '1'))
+        self.assertEqual([b], a.children)
+        self.assertEqual('1', a.get('x'))
+        self.assertEqual([], b.children)
+        a.insert(Element('c'), 0)
+        self.assertEqual(['c', 'b'], [c.name for c in a.children])
+        self.assertEqual(['c', 'b'], [c.name for c in a.detachChildren()])
+        self.assertEqual([], a.children)
+
+    def testLeaf(self):
+        a = Element('a')
+        b = Element('b')
+        self.assertEqual([], a.children)
+        self.assertFalse(a.children is b.children)
+        a.children.append(b)
+        b.children += [Element('c')]
+        b.attributes.append(Attribute('x', '1'))
+        self.assertEqual([b], a.children)
+        self.assertEqual('<a><b x="1"><c/></b></a>', a.plain())
+        self.assertTrue(Element('d')._children is Element('e')._children)
+
+    def testNoAttributeDict(self):
+        a = Element('a')
+        self.assertRaises(AttributeError, setattr, a, 'unknown', 1)
+        self.assertRaises(AttributeError, setattr, Attribute('x'), 'unknown', 1)
+
+    def testNsprefixes(self):
+        a = Element('a')
+        b = Element('b', ns=('p', 'urn:p'))
+        self.assertEqual({'p': 'urn:p'}, b.nsprefixes)
+        a.nsprefixes['q'] = 'urn:q'
+        self.assertEqual(('q', 'urn:q'), a.resolvePrefix('q'))
+        self.assertEqual({}, Element('c').nsprefixes)
+        root = self.parse()
+        self.assertEqual({'p': 'urn:p', 'q': 'urn:q'}, root.nsprefixes)
+        self.assertEqual({}, root.getChild('b').nsprefixes)
+        self.assertEqual('urn:q', root.getChild('b').getAttribute('x').namespace()[1])
+
+    def testInterned(self):
+        first = self.parse()
+        second = self.parse()
+        self.assertTrue(first.getChild('b').name is second.getChild('b').name)
+        self.assertTrue(first.resolvePrefix('p')[1] is second.resolvePrefix('p')[1])
+
+    def testCopy(self):
+        root = self.parse()
+        for copied in (deepcopy(root), pickle.loads(pickle.dumps(root, 2))):
+            self.assertEqual(root.str(), copied.str())
+            c = copied.getChild('c')
+            self.assertEqual([], c.children)
+            c.append(Element('d'))
+            self.assertEqual(1, len(c.children))
+            self.assertEqual(0, len(root.getChild('c').children))
+
+
+class TestEncoder(TestCase):
+
+    def testEncode(self):
+        encoder = Encoder()
+        plain = 'no special characters'
+        self.assertTrue(encoder.encode(plain) is plain)
+        self.assertEqual('a &lt;b&gt; &quot;c&quot; &apos;d&apos;', encoder.encode('a <b> "c" \'d\''))
+        self.assertEqual('&amp;&amp; &lt; &amp;x; &amp;amp &lt;', encoder.encode('&&amp; &lt; &x; &amp <'))
+        self.assertEqual(None, encoder.encode(None))
+
+    def testDecode(self):
+        encoder = Encoder()
+        self.assertEqual('<a> & "b" \'c\' &lt;', encoder.decode('&lt;a&gt; &amp; &quot;b&quot; &apos;c&apos; &amp;lt;'))
+        self.assertEqual('&x; no entities', encoder.decode('&x; no entities'))
+
+
+if __name__ == '__main__':
+    unittest.main()
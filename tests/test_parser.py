@@ -0,0 +1,183 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+
+from suds.client import Client
+from suds.sax import parser
+from suds.sax.attribute import Attribute
+from suds.sax.element import Element
+from suds.sax.parser import Parser
+from xml.sax.handler import feature_external_ges
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+DOCUMENTS = [
+    """<?xml version="1.0" encoding="UTF-8"?><a/>""",
+    """<a x="1" y="2"><b>text</b><c/></a>""",
+    """<a xmlns="urn:default" xmlns:p="urn:p"><p:b p:x="1" y="2">x</p:b><c xmlns="">y</c></a>""",
+    """<p:a xmlns:p="urn:p"><p:b xmlns:p="urn:q"><p:c/></p:b></p:a>""",
+    """<a xmlns="urn:x" xmlns:p="urn:x"><b/><p:c/></a>""",
+    """<a xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+         <b xsi:nil="true"/>
+         <c xml:lang="en">  padded  </c>
+       </a>""",
+    """<a>mixed <b>content</b> with <c>children</c> and tail</a>""",
+    """<a><![CDATA[<not> & markup]]></a>""",
+    """<a>&lt;&amp;&gt;&quot;&apos; &#169; &#x263A;</a>""",
+    """<a><!-- comment -->before<!-- another -->after<?pi data?></a>""",
+    u"""<a name="éè">日本語 ü</a>""",
+    """<?xml version="1.0" encoding="ISO-8859-1"?><a>caf\xe9</a>""",
+    """<a>
+      <b>
+         <c>  1  </c>
+      </b>
+   </a>""",
+]
+
+
+def dump(node):
+    """
+    Get a comparable (tuple) representation of an element tree.
+    """
+    attributes = [(a.prefix, a.name, a.value) for a in node.attributes]
+    children = [dump(c) for c in node.children]
+    text = node.text
+    if text is not None:
+        text = (text, text.escaped, text.lang)
+    return (
+        node.prefix, node.name, node.expns,
+        sorted(node.nsprefixes.items()),
+        attributes, text, children)
+
+
+def encoded(document):
+    if document.startswith('<?xml version="1.0" encoding="ISO-8859-1"?>'):
+        return document.encode('latin-1')
+    return document.encode('utf-8')
+
+
+ENTITIES = [
+    b'<!DOCTYPE r [<!ENTITY e SYSTEM "file:///etc/hostname">]><r>&e;</r>',
+    b'<!DOCTYPE r [<!ENTITY e "x">]><r>a&e;b<s>&e;</s>c</r>',
+    b'<!DOCTYPE r [<!ENTITY e "x"><!ENTITY f SYSTEM "f.txt">]><r>&e;&f;&amp;</r>',
+]
+
+
+class TestParser(TestCase):
+
+    backends = ['expat', 'lxml']
+
+    def parse(self, backend, document):
+        root = Parser(backend).parse(string=encoded(document))
+        return dump(root.root())
+
+    def assertParity(self, backend):
+        for document in DOCUMENTS:
+            expected = self.parse('sax', document)
+            self.assertEqual(expected, self.parse(backend, document), document)
+
+    def testExpat(self):
+        self.assertParity('expat')
+
+    @unittest.skipIf(parser.etree is None, 'lxml not installed')
+    def testLxml(self):
+        self.assertParity('lxml')
+
+    def testIncremental(self):
+        for document in DOCUMENTS:
+            expected = self.parse('sax', document)
+            for backend in self.backends:
+                if backend == 'lxml' and parser.etree is None:
+                    continue
+                p = Parser(backend).open()
+                for b in encoded(document):
+                    p.feed(bytes([b]))
+                p.close()
+                root = p.handler.nodes[0]
+                self.assertEqual(expected, dump(root.root()), document)
+
+    def testFile(self):
+        path = os.path.abspath("test_overload_DuckService2.wsdl")
+        with open(path, 'rb') as fp:
+            expected = dump(Parser().parse(fp).root())
+        for backend in self.backends:
+            if backend == 'lxml' and parser.etree is None:
+                continue
+            with open(path, 'rb') as fp:
+                self.assertEqual(expected, dump(Parser(backend).parse(fp).root()))
+
+    def testMalformed(self):
+        for backend in ['sax'] + self.backends:
+            if backend == 'lxml' and parser.etree is None:
+                continue
+            self.assertRaises(Exception, Parser(backend).parse, string=b'<a><b></a>')
+
+    def testEntities(self):
+        texts = [None, 'axbc', 'x&']
+        for document, text in zip(ENTITIES, texts):
+            for backend in ['sax'] + self.backends:
+                if backend == 'lxml' and parser.etree is None:
+                    continue
+                root = Parser(backend).parse(string=document).root()
+                self.assertEqual(text, root.text, (backend, document))
+                self.assertEqual(dump(Parser().parse(string=document).root()), dump(root), backend)
+
+    def testSaxParser(self):
+        sax, handler = Parser.saxparser()
+        self.assertFalse(sax.getFeature(feature_external_ges))
+        sax.feed(encoded(DOCUMENTS[2]))
+        sax.close()
+        expected = self.parse('sax', DOCUMENTS[2])
+        self.assertEqual(expected, dump(handler.nodes[0].root()))
+
+    def testMapPrefix(self):
+        handler = parser.Handler()
+        node = Element('a')
+        self.assertTrue(handler.mapPrefix(node, Attribute('xmlns', 'urn:default')))
+        self.assertTrue(handler.mapPrefix(node, Attribute('xmlns:p', 'urn:p')))
+        self.assertFalse(handler.mapPrefix(node, Attribute('p:x', '1')))
+        self.assertEqual('urn:default', node.expns)
+        self.assertEqual('urn:p', node.resolvePrefix('p')[1])
+
+    def testNotFound(self):
+        self.assertRaises(Exception, Parser('none').parse, string=b'<a/>')
+
+    def testClient(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        reply = """<?xml version="1.0" encoding="UTF-8"?>
+            <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+               <soap:Body>
+                  <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+                     <ns2:return>5</ns2:return>
+                  </ns2:duckAddResponse>
+               </soap:Body>
+            </soap:Envelope>"""
+        for backend in ['expat']:
+            for streaming in (False, True):
+                client = Client(url, parser=backend, streaming=streaming)
+                result = client.service.duckAdd(
+                    username='d', password='x', settings=[],
+                    __inject={'reply': reply})
+                self.assertEqual(5, result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import sys
+import time
+
+from suds.client import Client
+from suds.sax.parser import Parser
+from suds.wsdl import Definitions
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+import tests
+from tests import setup_logging, Server, wsdl, xsd
+
+setup_logging()
+
+DOCUMENTS = {
+    '/wsdl/echo.wsdl': wsdl(type='a:a', imports=[('a', 'a.xsd'), ('b', '../xsd/b.xsd')]),
+    '/wsdl/a.xsd': xsd('a', imports=[('c', '../xsd/c.xsd')], includes=['a2.xsd']),
+    '/wsdl/a2.xsd': xsd('a', 'a2'),
+    '/xsd/b.xsd': xsd('b', imports=[('c', 'c.xsd'), ('d', 'd.xsd')]),
+    '/xsd/c.xsd': xsd('c'),
+    '/xsd/d.xsd': xsd('d'),
+}
+
+
+class Handler(tests.Handler):
+    """
+    Serves the documents by path (after the run prefix) and records
+    the peak of the requests served concurrently.
+    """
+
+    def do_GET(self):
+        server = self.server
+        path = '/' + self.path.split('/', 2)[2]
+        with server.lock:
+            server.requests.append(path)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            time.sleep(server.latency)
+            document = server.documents.get(path)
+            if document is None:
+                self.reply(b'not found', 404)
+            else:
+                self.reply(document.encode('utf-8'))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+class TestPrefetch(TestCase):
+
+    def setUp(self):
+        self.server = Server(Handler, DOCUMENTS, latency=0.1)
+        self.server.active = 0
+        self.server.peak = 0
+        self.base = self.server.url('/0')
+        self.url = self.base + '/wsdl/echo.wsdl'
+        self.runs = 0
+
+    def tearDown(self):
+        self.server.stop()
+
+    def load(self, prefetch):
+        # imported schemas are cached (globally) by url.
+        self.server.requests = []
+        self.server.peak = 0
+        self.runs += 1
+        url = self.server.url('/%d/wsdl/echo.wsdl' % self.runs)
+        client = Client(url, cache=None, prefetch=prefetch)
+        return client.wsdl.schema
+
+    def testReferences(self):
+        xsd = DOCUMENTS['/xsd/b.xsd'].encode('utf-8')
+        root = Parser().parse(string=xsd).root()
+        url = self.base + '/xsd/b.xsd'
+        self.assertEqual(
+            [self.base + '/xsd/c.xsd', self.base + '/xsd/d.xsd'],
+            Definitions.references(url, root))
+        wsdl = DOCUMENTS['/wsdl/echo.wsdl'].encode('utf-8')
+        root = Parser().parse(string=wsdl).root()
+        self.assertEqual(
+            [self.base + '/wsdl/a.xsd', self.base + '/xsd/b.xsd'],
+            Definitions.references(self.url, root))
+
+    def testConcurrent(self):
+        sequential = self.load(0)
+        self.assertEqual(1, self.server.peak)
+        requests = list(self.server.requests)
+        concurrent = self.load(4)
+        self.assertTrue(self.server.peak > 1)
+        self.assertEqual(sorted(requests), sorted(self.server.requests))
+        self.assertEqual(list(sequential.types.keys()), list(concurrent.types.keys()))
+        self.assertEqual(list(sequential.elements.keys()), list(concurrent.elements.keys()))
+        for name in ('a', 'a2', 'b', 'c', 'd'):
+            type = concurrent.types[(name, 'urn:%s' % name[0])]
+            self.assertEqual('value', type.get_child('value')[0].name)
+
+    def testMissing(self):
+        del self.server.documents['/xsd/d.xsd']
+        self.assertRaises(Exception, self.load, 4)
+        self.assertEqual(2, self.server.requests.count('/xsd/d.xsd'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import gc
+import os
+import shutil
+import sys
+import tempfile
+
+import suds
+from suds.client import Client
+from suds.registry import registry
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging, wsdl
+
+setup_logging()
+
+NS = 'http://example.com/duck/'
+
+def private():
+    """
+    The private (dirty) memory of the process in kB.
+    """
+    with open('/proc/self/smaps_rollup') as fp:
+        for line in fp:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+
+
+class TestPreload(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'many.wsdl')
+        with open(self.path, 'w') as fp:
+            fp.write(wsdl(200))
+        self.url = 'file://' + self.path
+        self.capacity = registry.capacity
+
+    def tearDown(self):
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+        registry.capacity = self.capacity
+        registry.invalidate()
+        shutil.rmtree(self.tmp)
+
+    def testRegistered(self):
+        wsdl = suds.preload(self.url, cache=None)[0]
+        os.remove(self.path)
+        client = Client(self.url, cache=None, shared=True)
+        self.assertTrue(client.wsdl.schema is wsdl.schema)
+        item = client.factory.create('item7')
+        self.assertEqual(['field%d' % n for n in range(20)], [k for k, v in item])
+        self.assertRaises(Exception, Client, self.url, cache=None)
+
+    def testWarm(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        wsdl = suds.preload([url], freeze=False, cache=None, lazy=True)[0]
+        duck = wsdl.schema.types[('duck', NS)]
+        self.assertTrue('rawchildren' in duck.__dict__)
+        self.assertTrue('model' in duck.cache)
+        methods = wsdl.services[0].ports[0].methods['duckAdd']
+        for m in methods:
+            self.assertTrue(('bodypart_types', True) in m.prepared)
+            self.assertTrue(('bodypart_types', False) in m.prepared)
+        self.assertEqual(set(['parameters']), methods[0].soap.input.part_names)
+        client = Client(url, cache=None, shared=True, nosend=True, lazy=True)
+        self.assertTrue(client.wsdl.services[0].ports[0].methods['duckAdd'][0].prepared is methods[0].prepared)
+
+    def testSeveral(self):
+        first = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        second = 'file://' + os.path.abspath("test_overload_DuckService.wsdl")
+        wsdl = suds.preload([first, second], freeze=False, cache=None)[0]
+        schema = wsdl.schema
+        duck = schema.types[('duck', NS)]
+        self.assertTrue(schema.tables is schema.lookup())
+        self.assertTrue(duck.cache['model'] is duck.model())
+        Client(self.url, cache=None)
+        self.assertTrue(schema.tables is schema.lookup())
+        self.assertTrue(duck.cache['model'] is duck.model())
+
+    def testPinned(self):
+        registry.capacity = 0
+        suds.preload(self.url, freeze=False, cache=None)
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        Client(url, cache=None, shared=True)
+        gc.collect()
+        self.assertEqual([self.url], [k[0] for k in registry.entries])
+        self.assertTrue(list(registry.entries.values())[0].pinned)
+
+    def worker(self, shared):
+        """
+        Fork a worker creating a client and get the private memory (kB)
+        it used.
+        """
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(r)
+                used = private()
+                client = Client(self.url, cache=None, shared=shared)
+                for n in range(0, 200, 10):
+                    client.factory.create('item%d' % n)
+                gc.collect()
+                used = private() - used
+                os.write(w, str(used).encode('ascii'))
+            finally:
+                os._exit(0)
+        os.close(w)
+        try:
+            used = int(os.read(r, 64))
+        finally:
+            os.close(r)
+            os.waitpid(pid, 0)
+        return used
+
+    def testForked(self):
+        if not hasattr(os, 'fork') or not os.path.exists('/proc/self/smaps_rollup'):
+            self.skipTest('private memory of a forked worker not measurable')
+        loading = self.worker(False)
+        suds.preload(self.url, cache=None)
+        preloaded = self.worker(True)
+        self.assertTrue(preloaded * 2 < loading, (preloaded, loading))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from suds import metrics
+from suds.cache import ObjectCache
+from suds.client import Client
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="urn:echo"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="urn:echo" xmlns:t="urn:types">
+  <wsdl:types>
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        elementFormDefault="qualified" targetNamespace="urn:echo">
+      <xs:import namespace="urn:types" schemaLocation="types.xsd"/>
+      <xs:element name="echo" type="t:text"/>
+    </xs:schema>
+  </wsdl:types>
+  <wsdl:message name="echo">
+    <wsdl:part name="parameters" element="tns:echo"/>
+  </wsdl:message>
+  <wsdl:portType name="Echo">
+    <wsdl:operation name="echo">
+      <wsdl:input message="tns:echo"/>
+      <wsdl:output message="tns:echo"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="EchoBinding" type="tns:Echo">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="echo">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="EchoService">
+    <wsdl:port name="EchoPort" binding="tns:EchoBinding">
+      <soap:address location="http://localhost/echo"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    elementFormDefault="qualified" targetNamespace="urn:types">
+  <xs:complexType name="text">
+    <xs:sequence>
+      <xs:element name="value" type="xs:string"/>
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+
+class TestProfile(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name, content in (('echo.wsdl', WSDL), ('types.xsd', TYPES)):
+            with open(os.path.join(self.tmp, name), 'w') as fp:
+                fp.write(content)
+        self.url = 'file://' + os.path.join(self.tmp, 'echo.wsdl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def testPhases(self):
+        profile = Client(self.url, cache=None, profile=True).startup_profile
+        paths = list(profile.phases.keys())
+        self.assertEqual('client', paths[0])
+        for path in ('client/wsdl/definitions/read/download',
+                     'client/wsdl/definitions/read/parse',
+                     'client/wsdl/definitions/build_schema/schema.build',
+                     'client/wsdl/definitions/build_schema/schema.open_imports',
+                     'client/wsdl/definitions/set_wrapped',
+                     'client/service_definitions'):
+            self.assertTrue(path in paths, path)
+        self.assertTrue(paths.index('client/wsdl') < paths.index('client/wsdl/definitions'))
+        client = profile.phases['client']
+        self.assertEqual(1, client.calls)
+        self.assertTrue(0 < client.wall <= profile.wall)
+        self.assertTrue(profile.phases['client/wsdl'].wall <= client.wall)
+        self.assertEqual(None, profile.peak)
+        self.assertEqual(1, profile.counts['types'])
+        self.assertEqual(1, profile.counts['methods'])
+
+    def testDocuments(self):
+        cache = ObjectCache(os.path.join(self.tmp, 'cache'))
+        for source in ('download', 'cache'):
+            profile = Client(self.url, cache=cache, profile=True, prefetch=0).startup_profile
+            documents = dict((d['url'].rsplit('/', 1)[-1], d) for d in profile.documents)
+            self.assertEqual(['echo.wsdl', 'types.xsd'], sorted(documents))
+            xsd = documents['types.xsd']
+            self.assertEqual(source, xsd['source'])
+            self.assertEqual(4, xsd['nodes'])
+            if source == 'download':
+                self.assertEqual(len(TYPES), xsd['bytes'])
+            else:
+                self.assertEqual(None, xsd['bytes'])
+        self.assertEqual(2, profile.counts['documents'])
+
+    def testPrefetched(self):
+        profile = Client(self.url, cache=None, profile=True, prefetch=2).startup_profile
+        self.assertTrue('prefetch/download' in profile.phases)
+        self.assertEqual(2, len(profile.documents))
+
+    def testTraced(self):
+        if metrics.tracemalloc is None:
+            self.skipTest('tracemalloc not available')
+        tracemalloc = metrics.tracemalloc
+        profile = Client(self.url, cache=None, profile=True, tracememory=True).startup_profile
+        self.assertTrue(profile.peak > 0)
+        self.assertFalse(tracemalloc.is_tracing())
+        tracemalloc.start()
+        try:
+            data = [bytearray(1 << 20)]
+            peak = tracemalloc.get_traced_memory()[1]
+            del data
+            with metrics.Profile(trace=True) as profile:
+                pass
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertTrue(tracemalloc.get_traced_memory()[1] >= peak)
+            self.assertEqual(None, profile.peak)
+        finally:
+            tracemalloc.stop()
+
+    def testJson(self):
+        profile = Client(self.url, cache=None, profile=True).startup_profile
+        exported = json.loads(profile.json())
+        self.assertEqual(self.url, exported['url'])
+        self.assertEqual(list(profile.phases.keys()), [p['path'] for p in exported['phases']])
+        self.assertEqual(profile.counts, exported['counts'])
+        self.assertTrue('client' in str(profile))
+
+    def testInactive(self):
+        client = Client(self.url, cache=None)
+        self.assertEqual(None, client.startup_profile)
+        self.assertTrue(metrics.phase('client') is metrics.NOT_RUNNING)
+        with metrics.Profile() as profile:
+            with metrics.phase('outer'):
+                with metrics.phase('inner'):
+                    pass
+                with metrics.phase('inner'):
+                    pass
+        self.assertEqual(['outer', 'outer/inner'], list(profile.phases.keys()))
+        self.assertEqual(2, profile.phases['outer/inner'].calls)
+        self.assertEqual(None, profile.peak)
+        self.assertEqual(None, metrics.Profile.current())
+
+
+if __name__ == '__main__':
+    unittest.main()
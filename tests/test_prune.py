@@ -0,0 +1,197 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+from suds import MethodNotFound
+from suds.cache import ObjectCache
+from suds.client import Client
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+NS = 'http://example.com/duck/'
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="urn:shop"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="urn:shop" xmlns:t="urn:types">
+  <wsdl:types>
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        elementFormDefault="qualified" targetNamespace="urn:shop">
+      <xs:import namespace="urn:types" schemaLocation="types.xsd"/>
+      <xs:element name="quote" type="t:symbol"/>
+      <xs:element name="quoteResponse" type="t:price"/>
+      <xs:element name="order" type="t:order"/>
+      <xs:element name="orderResponse" type="xs:int"/>
+    </xs:schema>
+  </wsdl:types>
+  <wsdl:message name="quote">
+    <wsdl:part name="parameters" element="tns:quote"/>
+  </wsdl:message>
+  <wsdl:message name="quoteResponse">
+    <wsdl:part name="parameters" element="tns:quoteResponse"/>
+  </wsdl:message>
+  <wsdl:message name="order">
+    <wsdl:part name="parameters" element="tns:order"/>
+  </wsdl:message>
+  <wsdl:message name="orderResponse">
+    <wsdl:part name="parameters" element="tns:orderResponse"/>
+  </wsdl:message>
+  <wsdl:portType name="Shop">
+    <wsdl:operation name="GetQuote">
+      <wsdl:input message="tns:quote"/>
+      <wsdl:output message="tns:quoteResponse"/>
+    </wsdl:operation>
+    <wsdl:operation name="PlaceOrder">
+      <wsdl:input message="tns:order"/>
+      <wsdl:output message="tns:orderResponse"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="ShopBinding" type="tns:Shop">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="GetQuote">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+    <wsdl:operation name="PlaceOrder">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="ShopService">
+    <wsdl:port name="ShopPort" binding="tns:ShopBinding">
+      <soap:address location="http://localhost/shop"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+    xmlns:t="urn:types" elementFormDefault="qualified" targetNamespace="urn:types">
+  <xs:simpleType name="code">
+    <xs:restriction base="xs:string"/>
+  </xs:simpleType>
+  <xs:complexType name="symbol">
+    <xs:sequence>
+      <xs:element name="code" type="t:code"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="listed">
+    <xs:complexContent>
+      <xs:extension base="t:symbol">
+        <xs:sequence>
+          <xs:element name="exchange" type="xs:string"/>
+        </xs:sequence>
+      </xs:extension>
+    </xs:complexContent>
+  </xs:complexType>
+  <xs:complexType name="price">
+    <xs:sequence>
+      <xs:element name="amount" type="xs:decimal"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="order">
+    <xs:sequence>
+      <xs:element name="symbol" type="t:symbol"/>
+      <xs:element name="line" type="t:line" maxOccurs="unbounded"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:complexType name="line">
+    <xs:sequence>
+      <xs:element name="quantity" type="xs:int"/>
+    </xs:sequence>
+  </xs:complexType>
+</xs:schema>
+"""
+
+
+class TestPrune(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        for name, content in (('shop.wsdl', WSDL), ('types.xsd', TYPES)):
+            with open(os.path.join(self.tmp, name), 'w') as fp:
+                fp.write(content)
+        self.url = 'file://' + os.path.join(self.tmp, 'shop.wsdl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def types(self, client):
+        return sorted(n for n, ns in client.wsdl.schema.types)
+
+    def testPruned(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        full = Client(url, cache=None, nosend=True)
+        pruned = Client(url, cache=None, nosend=True, operations=['duckAdd'])
+        self.assertEqual(['duckAdd'], [m[0] for m in pruned.sd[0].ports[0][1]])
+        self.assertRaises(MethodNotFound, getattr, pruned.service, 'duckList')
+        self.assertEqual(['duckAdd', 'duckAddResponse', 'tKeyPair'], self.types(pruned))
+        self.assertEqual(['duck', 'duckAdd', 'duckAddResponse', 'duckList', 'duckListResponse', 'tKeyPair'],
+                         self.types(full))
+        self.assertEqual(['duckAdd', 'duckAddResponse'], sorted(n for n, ns in pruned.wsdl.schema.elements))
+        messages = []
+        for client in (full, pruned):
+            settings = client.factory.create('tKeyPair')
+            settings.key, settings.value = ('k', 'v')
+            messages.append(str(client.service.duckAdd('u', 'p', [settings]).envelope))
+        self.assertEqual(messages[0], messages[1])
+        self.assertTrue(len(pickle.dumps(pruned.wsdl, 2)) < len(pickle.dumps(full.wsdl, 2)))
+
+    def testImported(self):
+        pruned = Client(self.url, cache=None, operations=['GetQuote'])
+        self.assertEqual(['code', 'listed', 'price', 'symbol'], self.types(pruned))
+        self.assertEqual(['quote', 'quoteResponse'], sorted(n for n, ns in pruned.wsdl.schema.elements))
+        self.assertEqual(['quote', 'quoteResponse'], sorted(n for n, ns in pruned.wsdl.messages))
+        imported = pruned.wsdl.schema.types[('symbol', 'urn:types')].schema
+        self.assertEqual(['code', 'listed', 'price', 'symbol'], sorted(n for n, ns in imported.types))
+        self.assertEqual(['code', 'exchange'], [k for k, v in pruned.factory.create('{urn:types}listed')])
+        full = Client(self.url, cache=None)
+        self.assertEqual(['code', 'line', 'listed', 'order', 'price', 'symbol'], self.types(full))
+        self.assertEqual(['GetQuote', 'PlaceOrder'], sorted(m[0] for m in full.sd[0].ports[0][1]))
+
+    def testLazy(self):
+        pruned = Client(self.url, cache=None, lazy=True, operations=['PlaceOrder'])
+        self.assertEqual(['code', 'line', 'listed', 'order', 'symbol'], self.types(pruned))
+        order = pruned.factory.create('{urn:types}order')
+        self.assertEqual(['symbol', 'line'], [k for k, v in order])
+
+    def testUndefined(self):
+        self.assertRaises(MethodNotFound, Client, self.url, cache=None, operations=['GetQuote', 'Cancel'])
+
+    def testCached(self):
+        cache = ObjectCache(os.path.join(self.tmp, 'cache'))
+        pruned = Client(self.url, cache=cache, cachingpolicy=1, operations=['GetQuote'])
+        full = Client(self.url, cache=cache, cachingpolicy=1)
+        self.assertEqual(4, len(self.types(pruned)))
+        self.assertEqual(6, len(self.types(full)))
+        pruned = Client(self.url, cache=cache, cachingpolicy=1, operations=['GetQuote'])
+        self.assertEqual(4, len(self.types(pruned)))
+
+
+if __name__ == '__main__':
+    unittest.main()
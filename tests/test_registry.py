@@ -0,0 +1,101 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import gc
+import os
+import sys
+
+from suds.client import Client
+from suds.plugin import DocumentPlugin
+from suds.registry import registry
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+
+class TestRegistry(TestCase):
+
+    def setUp(self):
+        self.url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.other = 'file://' + os.path.abspath("test_overload_DuckService.wsdl")
+        self.capacity = registry.capacity
+        registry.invalidate()
+
+    def tearDown(self):
+        registry.capacity = self.capacity
+        registry.invalidate()
+
+    def entry(self, url):
+        for key, entry in registry.entries.items():
+            if key[0] == url:
+                return entry
+
+    def testShared(self):
+        a = Client(self.url, cache=None, shared=True, nosend=True)
+        b = Client(self.url, cache=None, shared=True)
+        self.assertTrue(a.wsdl.schema is b.wsdl.schema)
+        self.assertTrue(a.wsdl.messages is b.wsdl.messages)
+        self.assertFalse(a.wsdl is b.wsdl)
+        self.assertTrue(a.wsdl.options is a.options)
+        self.assertTrue(b.wsdl.options is b.options)
+        self.assertEqual(2, self.entry(self.url).refcount())
+        context = a.service.duckAdd(username='donald', password='x', settings=[])
+        self.assertTrue(b'donald' in context.envelope)
+        reply = ('<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+                 '<soap:Body><ns:duckAddResponse xmlns:ns="http://example.com/duck/"/>'
+                 '</soap:Body></soap:Envelope>')
+        b.service.duckAdd(username='donald', password='x', settings=[], __inject={'reply': reply})
+        self.assertEqual(str(Client(self.url, cache=None)), str(b))
+        del a, context
+        gc.collect()
+        self.assertEqual(1, self.entry(self.url).refcount())
+
+    def testNotShared(self):
+        a = Client(self.url, cache=None, shared=True)
+        b = Client(self.url, cache=None)
+        c = Client(self.url, cache=None, shared=True, plugins=[DocumentPlugin()])
+        d = Client(self.url, cache=None, shared=True, lazy=True)
+        self.assertFalse(a.wsdl.schema is b.wsdl.schema)
+        self.assertFalse(a.wsdl.schema is c.wsdl.schema)
+        self.assertFalse(a.wsdl.schema is d.wsdl.schema)
+        self.assertTrue(d.wsdl.schema.lazy)
+
+    def testEviction(self):
+        registry.capacity = 1
+        a = Client(self.url, cache=None, shared=True)
+        schema = a.wsdl.schema
+        b = Client(self.other, cache=None, shared=True)
+        self.assertEqual(2, len(registry.entries))
+        del a
+        gc.collect()
+        self.assertEqual(1, len(registry.entries))
+        self.assertEqual(None, self.entry(self.url))
+        self.assertTrue(self.entry(self.other).wsdl.schema is b.wsdl.schema)
+        a = Client(self.url, cache=None, shared=True)
+        self.assertFalse(a.wsdl.schema is schema)
+
+    def testInvalidate(self):
+        a = Client(self.url, cache=None, shared=True)
+        registry.invalidate(self.url)
+        b = Client(self.url, cache=None, shared=True)
+        self.assertFalse(a.wsdl.schema is b.wsdl.schema)
+        self.assertEqual('duck', a.factory.create('duck').__class__.__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()
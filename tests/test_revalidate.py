@@ -0,0 +1,151 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from suds.cache import ObjectCache
+from suds.client import Client
+from suds.store import Catalog, CatalogStore
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+import tests
+from tests import setup_logging, Server, wsdl, xsd
+
+setup_logging()
+
+class Handler(tests.Handler):
+    """
+    Serves the documents by path with an I{ETag} (replying 304 to a
+    matching I{If-None-Match}) and records the (path, code) requested.
+    """
+
+    def do_GET(self):
+        server = self.server
+        document = server.documents[self.path].encode('utf-8')
+        etag = '"%s"' % hashlib.md5(document).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            code, body = 304, b''
+        else:
+            code, body = 200, document
+        with server.lock:
+            server.requests.append((self.path, code))
+        self.reply(body, code, [('ETag', etag)])
+
+
+class TestRevalidate(TestCase):
+
+    def setUp(self):
+        self.server = Server(Handler, {
+            '/echo.wsdl': wsdl(type='a:a', imports=[('a', 'a.xsd'), ('b', 'b.xsd')]),
+            '/a.xsd': xsd('a'),
+            '/b.xsd': xsd('b'),
+        })
+        self.base = self.server.url()
+        self.location = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.location)
+
+    def load(self, policy):
+        self.server.requests = []
+        cache = ObjectCache(self.location, days=1)
+        return Client(self.base + '/echo.wsdl', cache=cache, cachingpolicy=policy)
+
+    def expire(self):
+        past = time.time() - 2 * 24 * 3600
+        for fn in os.listdir(self.location):
+            os.utime(os.path.join(self.location, fn), (past, past))
+
+    def requests(self):
+        return sorted(self.server.requests)
+
+    def fields(self, client, ns):
+        type = client.wsdl.schema.types[(ns, 'urn:%s' % ns)]
+        return [c.name for c, a in type.children()]
+
+    def testDocuments(self):
+        self.load(0)
+        self.assertEqual(
+            [('/a.xsd', 200), ('/b.xsd', 200), ('/echo.wsdl', 200)], self.requests())
+        self.load(0)
+        self.assertEqual([], self.requests())
+        self.expire()
+        client = self.load(0)
+        self.assertEqual(
+            [('/a.xsd', 304), ('/b.xsd', 304), ('/echo.wsdl', 304)], self.requests())
+        self.assertEqual(['value'], self.fields(client, 'a'))
+        self.load(0)
+        self.assertEqual([], self.requests())
+        self.server.documents['/a.xsd'] = xsd('a', fields=('value', 'added'))
+        self.expire()
+        client = self.load(0)
+        self.assertEqual(
+            [('/a.xsd', 200), ('/b.xsd', 304), ('/echo.wsdl', 304)], self.requests())
+        self.assertEqual(['value', 'added'], self.fields(client, 'a'))
+        self.assertEqual(['value', 'added'], self.fields(self.load(0), 'a'))
+        self.assertEqual([], self.requests())
+
+    def testDefinitions(self):
+        self.load(1)
+        self.assertEqual(
+            [('/a.xsd', 200), ('/b.xsd', 200), ('/echo.wsdl', 200)], self.requests())
+        self.expire()
+        client = self.load(1)
+        self.assertEqual(
+            [('/a.xsd', 304), ('/b.xsd', 304), ('/echo.wsdl', 304)], self.requests())
+        self.assertEqual(['value'], self.fields(client, 'b'))
+        self.load(1)
+        self.assertEqual([], self.requests())
+        self.server.documents['/b.xsd'] = xsd('b', fields=('value', 'added'))
+        self.expire()
+        client = self.load(1)
+        requests = self.requests()
+        self.assertEqual([('/b.xsd', 200)], [r for r in requests if r[0] == '/b.xsd'])
+        self.assertEqual(['value', 'added'], self.fields(client, 'b'))
+        self.load(1)
+        self.assertEqual([], self.requests())
+
+    def testStore(self):
+        directory = os.path.join(self.location, 'store')
+        os.mkdir(directory)
+        with open(os.path.join(directory, 'a.xsd'), 'w') as fp:
+            fp.write(self.server.documents['/a.xsd'])
+        catalog = Catalog()
+        catalog.add(self.base + '/a.xsd', 'a.xsd')
+        store = CatalogStore(directory, catalog)
+
+        def load():
+            self.server.requests = []
+            cache = ObjectCache(os.path.join(self.location, 'cache'), days=1)
+            return Client(self.base + '/echo.wsdl', cache=cache, cachingpolicy=1, store=store)
+        load()
+        self.assertEqual([('/b.xsd', 200), ('/echo.wsdl', 200)], self.requests())
+        past = time.time() - 2 * 24 * 3600
+        for fn in os.listdir(os.path.join(self.location, 'cache')):
+            os.utime(os.path.join(self.location, 'cache', fn), (past, past))
+        client = load()
+        self.assertEqual([('/b.xsd', 304), ('/echo.wsdl', 304)], self.requests())
+        self.assertEqual(['value'], self.fields(client, 'a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,320 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+import tempfile
+
+from suds import BuildError, TypeNotFound
+from suds.client import Client
+from suds.sax.parser import Parser
+from suds.xsd.query import ElementQuery
+from suds.xsd.sxbasic import Element, Factory
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+NS = 'http://example.com/duck/'
+
+COMPLEX = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<xs:complexType name="mixed">
+  <xs:sequence>
+    <xs:element name="a" type="xs:string"/>
+    <xs:any/>
+    <xs:element name="b" type="xs:string"/>
+  </xs:sequence>
+  <xs:attribute name="x" type="xs:string"/>
+</xs:complexType>
+</xs:schema>"""
+
+CHOICE = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<xs:complexType name="choice">
+  <xs:sequence>
+    <xs:element name="a" type="xs:string"/>
+    <xs:choice>
+      <xs:element name="b" type="xs:string"/>
+      <xs:element name="c" type="xs:string"/>
+    </xs:choice>
+  </xs:sequence>
+  <xs:attribute name="x" type="xs:string"/>
+</xs:complexType>
+</xs:schema>"""
+
+DERIVED = """<?xml version="1.0" encoding="UTF-8"?>
+<wsdl:definitions targetNamespace="urn:derived"
+    xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+    xmlns:tns="urn:derived">
+  <wsdl:types>
+    <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+        elementFormDefault="qualified" targetNamespace="urn:derived">
+      <xs:element name="echo" type="tns:c"/>
+      <xs:element name="note" type="xs:string"/>
+      <xs:group name="g">
+        <xs:sequence>
+          <xs:element name="g1" type="xs:string"/>
+        </xs:sequence>
+      </xs:group>
+      <xs:complexType name="a">
+        <xs:sequence>
+          <xs:element name="a1" type="xs:string"/>
+          <xs:element ref="tns:note"/>
+        </xs:sequence>
+        <xs:attribute name="x" type="xs:string"/>
+      </xs:complexType>
+      <xs:complexType name="c">
+        <xs:complexContent>
+          <xs:extension base="tns:b">
+            <xs:sequence>
+              <xs:element name="c1" type="tns:a"/>
+            </xs:sequence>
+          </xs:extension>
+        </xs:complexContent>
+      </xs:complexType>
+      <xs:complexType name="b">
+        <xs:complexContent>
+          <xs:extension base="tns:a">
+            <xs:sequence>
+              <xs:group ref="tns:g"/>
+            </xs:sequence>
+          </xs:extension>
+        </xs:complexContent>
+      </xs:complexType>
+      %(invalid)s
+    </xs:schema>
+  </wsdl:types>
+  <wsdl:message name="echo">
+    <wsdl:part name="parameters" element="tns:echo"/>
+  </wsdl:message>
+  <wsdl:portType name="Echo">
+    <wsdl:operation name="echo">
+      <wsdl:input message="tns:echo"/>
+      <wsdl:output message="tns:echo"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="EchoBinding" type="tns:Echo">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="echo">
+      <soap:operation soapAction=""/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="EchoService">
+    <wsdl:port name="EchoPort" binding="tns:EchoBinding">
+      <soap:address location="http://localhost/echo"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+"""
+
+INVALID = """<xs:complexType name="invalid">
+        <xs:complexContent>
+          <xs:extension base="tns:unknown"/>
+        </xs:complexContent>
+      </xs:complexType>"""
+
+
+class TestIndex(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url, cache=None)
+        self.schema = self.client.wsdl.schema
+
+    def linear(self, sx, name):
+        for child, ancestry in sx.children():
+            if child.any() or child.name == name:
+                return (child, ancestry)
+        return (None, [])
+
+    def testGetChild(self):
+        duckAdd = self.schema.types[('duckAdd', NS)]
+        for name in ('username', 'password', 'settings', 'unknown'):
+            self.assertEqual(self.linear(duckAdd, name), duckAdd.get_child(name))
+        self.assertEqual((None, []), duckAdd.get_attribute('username'))
+
+    def testAny(self):
+        root = Parser().parse(string=COMPLEX.encode('utf-8')).root()
+        complex = Factory.build(root, self.schema, ('complexType',))[0]
+        self.assertEqual('a', complex.get_child('a')[0].name)
+        self.assertTrue(complex.get_child('b')[0].any())
+        self.assertTrue(complex.get_child('c')[0].any())
+        self.assertEqual('x', complex.get_attribute('x')[0].name)
+        self.assertEqual(None, complex.get_attribute('y')[0])
+
+    def testModel(self):
+        root = Parser().parse(string=CHOICE.encode('utf-8')).root()
+        complex = Factory.build(root, self.schema, ('complexType',))[0]
+        model = complex.model()
+        self.assertEqual(('a', 'b', 'c', '_x'), model.ordering)
+        self.assertEqual((False, True, True), model.choice)
+        self.assertEqual(('_x',), model.attrnames)
+        self.assertEqual(list(model.children), complex.children())
+        self.assertEqual(4, len(complex))
+        self.assertEqual('c', complex[2][0].name)
+        self.assertEqual(None, complex[4])
+
+    def testInvalidate(self):
+        duck = self.schema.types[('duck', NS)]
+        model = duck.model()
+        self.assertTrue(model is duck.model())
+        tkeypair = self.schema.types[('tKeyPair', NS)]
+        sequence = duck.rawchildren[0]
+        sequence.rawchildren = sequence.rawchildren + tkeypair.rawchildren[0].rawchildren
+        self.assertEqual(None, duck.get_child('key')[0])
+        sequence.merge(tkeypair.rawchildren[0])
+        self.assertFalse(model is duck.model())
+        self.assertEqual('key', duck.get_child('key')[0].name)
+
+
+class TestLookup(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url, cache=None)
+        self.schema = self.client.wsdl.schema
+
+    def testTables(self):
+        lookup = self.schema.lookup()
+        self.assertTrue(lookup is self.schema.lookup())
+        self.assertTrue(lookup.types[('duck', NS)] is self.schema.types[('duck', NS)])
+        self.assertTrue(lookup.elements[('Duck', NS)] is self.schema.elements[('Duck', NS)])
+        self.assertTrue(lookup.find(('duckAdd', NS)) is self.schema.elements[('duckAdd', NS)])
+        self.assertTrue(lookup.find(('tKeyPair', NS)) is self.schema.types[('tKeyPair', NS)])
+        self.assertEqual(None, lookup.find(('unknown', NS)))
+        xs = 'http://www.w3.org/2001/XMLSchema'
+        self.assertTrue(lookup.find(('string', xs)).builtin())
+        self.assertTrue(lookup.find(('string', xs)) is lookup.builtin(('string', xs)))
+        self.schema.invalidate()
+        self.assertFalse(lookup is self.schema.lookup())
+
+    def testScoped(self):
+        lookup = self.schema.lookup()
+        duck = self.schema.types[('duck', NS)]
+        model = duck.model()
+        url = 'file://' + os.path.abspath("test_overload_DuckService.wsdl")
+        other = Client(url, cache=None).wsdl.schema
+        other.invalidate()
+        self.assertTrue(lookup is self.schema.lookup())
+        self.assertTrue(model is duck.model())
+        self.assertFalse(other.tables is other.lookup())
+
+    def testPath(self):
+        resolver = self.client.factory.resolver
+        settings = resolver.find('duckAdd.settings')
+        self.assertEqual('tKeyPair', settings.name)
+        self.assertTrue(settings is resolver.find('duckAdd.settings'))
+        resolver.find('duckAdd.unknown')
+        self.assertFalse(('duckAdd.unknown', True) in resolver.found)
+        self.assertEqual(['key', 'value'], [k for k, v in self.client.factory.create('duckAdd.settings')])
+
+
+class TestLazy(TestCase):
+
+    def client(self, lazy, invalid='', document=DERIVED):
+        fd, path = tempfile.mkstemp(suffix='.wsdl')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(document % dict(invalid=invalid))
+        try:
+            return Client('file://' + path, cache=None, nosend=True, lazy=lazy)
+        finally:
+            os.remove(path)
+
+    def content(self, client, name):
+        type = client.wsdl.schema.types[(name, 'urn:derived')]
+        return ([c.name for c, a in type.children()],
+                [a.name for a, ancestry in type.attributes()])
+
+    def testDeferred(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        eager = Client(url, cache=None)
+        lazy = Client(url, cache=None, lazy=True)
+        duck = lazy.wsdl.schema.types[('duck', NS)]
+        self.assertFalse('rawchildren' in duck.__dict__)
+        self.assertEqual(str(eager), str(lazy))
+        self.assertEqual(str(eager.factory.create('duck')), str(lazy.factory.create('duck')))
+        self.assertTrue('rawchildren' in duck.__dict__)
+
+    def testDerived(self):
+        eager = self.client(False)
+        lazy = self.client(True)
+        for name in ('c', 'b', 'a'):
+            self.assertEqual(self.content(eager, name), self.content(lazy, name))
+        self.assertEqual((['a1', 'note', 'g1', 'c1'], ['x']), self.content(lazy, 'c'))
+        messages = []
+        for client in (eager, lazy):
+            c = client.factory.create('c')
+            c.a1, c.note, c.g1 = ('1', '2', '3')
+            c.c1.a1 = '4'
+            c._x = '5'
+            messages.append(str(client.service.echo(c).envelope))
+        self.assertEqual(messages[0], messages[1])
+
+    def testNested(self):
+        # The objects of the second schema are merged into the first
+        # one and found by a deep search.
+        other = ('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"'
+                 ' elementFormDefault="qualified" targetNamespace="urn:other">'
+                 '<xs:complexType name="d"><xs:sequence>'
+                 '<xs:element name="d1" type="xs:string"/>'
+                 '</xs:sequence></xs:complexType>'
+                 '<xs:complexType name="e"><xs:sequence>'
+                 '<xs:element name="e1" type="xs:string"/>'
+                 '</xs:sequence></xs:complexType>'
+                 '</xs:schema>')
+        document = DERIVED.replace('</wsdl:types>', other + '</wsdl:types>', 1)
+        lazy = self.client(True, document=document)
+        schema = lazy.wsdl.schema
+        d, e = [schema.types[(name, 'urn:other')] for name in ('d', 'e')]
+        d.children()
+        d1 = ElementQuery(('d1', 'urn:other')).execute(schema)
+        self.assertEqual('d1', d1.name)
+        self.assertFalse('rawchildren' in e.__dict__)
+        e.children()
+        e1 = schema.lookup().nested(Element).get(('e1', 'urn:other'))
+        self.assertEqual('e1', e1.name)
+        self.assertTrue(d1 is ElementQuery(('d1', 'urn:other')).execute(schema))
+
+    def testInvalid(self):
+        self.assertRaises(TypeNotFound, self.client, False, INVALID)
+        lazy = self.client(True, INVALID)
+        self.assertEqual(['a1', 'note'], self.content(lazy, 'a')[0])
+        for n in range(2):
+            self.assertRaises(BuildError, lazy.factory.create, 'invalid')
+
+
+class TestCollection(TestCase):
+
+    def testEmptyFirst(self):
+        empty = ('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"'
+                 ' targetNamespace="urn:derived"/>')
+        document = DERIVED.replace('<wsdl:types>', '<wsdl:types>' + empty, 1)
+        fd, path = tempfile.mkstemp(suffix='.wsdl')
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(document % dict(invalid=''))
+        try:
+            client = Client('file://' + path, cache=None)
+        finally:
+            os.remove(path)
+        c = client.wsdl.schema.types[('c', 'urn:derived')]
+        self.assertEqual(['a1', 'note', 'g1', 'c1'], [x.name for x, a in c.children()])
+
+
+if __name__ == '__main__':
+    unittest.main()
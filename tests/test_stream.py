@@ -0,0 +1,124 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+
+from suds import WebFault
+from suds.client import Client
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+from tests import setup_logging
+
+setup_logging()
+
+ENVELOPE = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"
+   xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+   <soap:Header><ns2:session xmlns:ns2="http://example.com/duck/">42</ns2:session></soap:Header>
+   <soap:Body>
+%s
+   </soap:Body>
+</soap:Envelope>
+"""
+
+ADD = ENVELOPE % """
+      <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+         <ns2:return>%d</ns2:return>
+      </ns2:duckAddResponse>"""
+
+DUCK = """
+         <ns2:return>
+            <ns2:info><ns2:key>name</ns2:key><ns2:value>%s</ns2:value></ns2:info>
+            <ns2:info xsi:nil="true"/>
+            <ns2:info><ns2:key xml:lang="en">color</ns2:key><ns2:value> white &amp; blue </ns2:value></ns2:info>
+         </ns2:return>"""
+
+LIST = ENVELOPE % """
+      <ns2:duckListResponse xmlns:ns2="http://example.com/duck/">%s
+      </ns2:duckListResponse>"""
+
+MULTIREF = ENVELOPE % """
+      <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+         <ns2:return href="#id0"/>
+      </ns2:duckAddResponse>
+      <multiRef id="id0">%d</multiRef>"""
+
+MIXED = """
+         <ns2:return>duck
+            <ns2:info><ns2:key>name</ns2:key><ns2:value>%s</ns2:value></ns2:info>
+         </ns2:return>"""
+
+FAULT = ENVELOPE % """
+      <soap:Fault>
+         <faultcode>soap:Server</faultcode>
+         <faultstring>no such duck</faultstring>
+      </soap:Fault>"""
+
+
+class TestStream(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url)
+        self.streaming = Client(url, streaming=True)
+
+    def invoke(self, client, name, reply):
+        method = getattr(client.service, name)
+        return method(username='d', password='x', settings=[], __inject={'reply': reply})
+
+    def assertSame(self, name, reply):
+        expected = self.invoke(self.client, name, reply)
+        streamed = self.invoke(self.streaming, name, reply)
+        self.assertEqual(str(expected), str(streamed))
+        return streamed
+
+    def testSimple(self):
+        self.assertEqual(7, self.assertSame('duckAdd', ADD % 7))
+        body = self.streaming.last_received().getChild('Envelope').getChild('Body')
+        self.assertEqual(['duckAddResponse'], [c.name for c in body.children])
+        self.assertEqual([], body.children[0].children)
+
+    def testList(self):
+        ducks = ''.join([DUCK % ('duck%d' % n) for n in range(10)])
+        result = self.assertSame('duckList', LIST % ducks)
+        self.assertEqual(10, len(result))
+        self.assertEqual('duck9', result[9].info[0].value)
+        self.assertEqual(None, result[0].info[1])
+        self.assertEqual(' white & blue ', result[0].info[2].value)
+        self.assertEqual('en', result[0].info[2].key.lang)
+
+    def testEmptyList(self):
+        self.assertEqual([], self.assertSame('duckList', LIST % ''))
+
+    def testMultiRef(self):
+        self.assertEqual(3, self.assertSame('duckAdd', MULTIREF % 3))
+
+    def testMixed(self):
+        ducks = DUCK % 'duck0' + MIXED % 'duck1'
+        result = self.assertSame('duckList', LIST % ducks)
+        self.assertEqual('duck1', result[1].getChild('info').getChild('value').text)
+
+    def testFault(self):
+        try:
+            self.invoke(self.streaming, 'duckAdd', FAULT)
+            self.fail('expected WebFault')
+        except WebFault as e:
+            self.assertEqual('no such duck', e.fault.faultstring)
+
+
+if __name__ == '__main__':
+    unittest.main()
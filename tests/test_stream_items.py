@@ -0,0 +1,202 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import sys
+import threading
+import types
+
+from suds import WebFault, UnstreamableReply
+from suds.client import Client
+from suds.plugin import MessagePlugin
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+import tests
+from tests import setup_logging, Server
+
+setup_logging()
+
+HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <ns2:duckListResponse xmlns:ns2="http://example.com/duck/">"""
+
+DUCK = """
+         <ns2:return>
+            <ns2:info><ns2:key>name</ns2:key><ns2:value>duck%d</ns2:value></ns2:info>
+         </ns2:return>"""
+
+TAIL = """
+      </ns2:duckListResponse>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+FAULT = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <soap:Fault>
+         <faultcode>soap:Server</faultcode>
+         <faultstring>no such duck</faultstring>
+      </soap:Fault>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+MULTIREF = """
+         <ns2:return href="#id0"/>
+      </ns2:duckListResponse>
+      <ns2:return id="id0">
+         <ns2:info><ns2:key>name</ns2:key><ns2:value>duck</ns2:value></ns2:info>
+      </ns2:return>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+def reply(first, last):
+    return ''.join([DUCK % n for n in range(first, last)])
+
+
+class Received(MessagePlugin):
+
+    def __init__(self):
+        self.replies = []
+
+    def received(self, context):
+        self.replies.append(context.reply)
+
+
+class Handler(tests.Handler):
+    """
+    Sends the first 10 ducks then waits for the client (test) to
+    signal that it has received the first duck before sending the rest.
+    The reply (of unknown length) ends when the connection is closed.
+    """
+
+    protocol_version = 'HTTP/1.0'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.end_headers()
+        self.wfile.write((HEAD + reply(0, 10)).encode('utf-8'))
+        self.wfile.flush()
+        self.server.resumed = self.server.received.wait(10)
+        self.wfile.write((reply(10, 1000) + TAIL).encode('utf-8'))
+        self.wfile.flush()
+
+
+class Replies(tests.Handler):
+    """
+    Replies with 5 ducks.
+    """
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.reply((HEAD + reply(0, 5) + TAIL).encode('utf-8'))
+
+
+class TestStreamItems(TestCase):
+
+    def setUp(self):
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url, iterreply=True)
+
+    def invoke(self, **kwargs):
+        return self.client.service.duckList(username='d', password='x', settings=[], **kwargs)
+
+    def testGenerator(self):
+        result = self.invoke(__inject={'reply': HEAD + reply(0, 5) + TAIL})
+        self.assertTrue(isinstance(result, types.GeneratorType))
+        self.assertEqual(None, self.client.last_received())
+        values = [d.info[0].value for d in result]
+        self.assertEqual(['duck%d' % n for n in range(5)], values)
+        self.assertTrue(self.client.last_received() is not None)
+
+    def testBounded(self):
+        added = self.client.service.duckAdd(
+            username='d', password='x', settings=[],
+            __inject={'reply': HEAD.replace('duckList', 'duckAdd') +
+                      '<ns2:return>3</ns2:return>' + TAIL.replace('duckList', 'duckAdd')})
+        self.assertEqual(3, added)
+
+    def testFault(self):
+        result = self.invoke(__inject={'reply': FAULT})
+        try:
+            list(result)
+            self.fail('expected WebFault')
+        except WebFault as e:
+            self.assertEqual('no such duck', e.fault.faultstring)
+
+    def testMultiRef(self):
+        result = self.invoke(__inject={'reply': HEAD + reply(0, 3) + MULTIREF})
+        values = []
+        try:
+            for d in result:
+                values.append(d.info[0].value)
+            self.fail('expected UnstreamableReply')
+        except UnstreamableReply as e:
+            self.assertTrue('duckList' in str(e))
+        self.assertEqual(['duck0', 'duck1', 'duck2'], values)
+
+    def testPlugin(self):
+        plugin = Received()
+        server = Server(Replies)
+        try:
+            self.client.set_options(
+                location=server.url('/DuckService2'), plugins=[plugin])
+            result = self.invoke()
+        finally:
+            server.stop()
+        self.assertTrue(isinstance(result, list))
+        self.assertEqual(5, len(result))
+        self.assertEqual(1, len(plugin.replies))
+
+    def testRetxml(self):
+        server = Server(Replies)
+        try:
+            self.client.set_options(
+                location=server.url('/DuckService2'), retxml=True)
+            result = self.invoke()
+        finally:
+            server.stop()
+        self.assertEqual((HEAD + reply(0, 5) + TAIL).encode('utf-8'), result)
+
+    def testIncremental(self):
+        server = Server(Handler)
+        server.received = threading.Event()
+        server.resumed = False
+        try:
+            self.client.set_options(location=server.url('/DuckService2'))
+            result = self.invoke()
+            first = next(result)
+            server.received.set()
+            rest = list(result)
+        finally:
+            server.stop()
+        self.assertTrue(server.resumed)
+        self.assertEqual('duck0', first.info[0].value)
+        self.assertEqual(999, len(rest))
+        self.assertEqual('duck999', rest[-1].info[0].value)
+
+
+if __name__ == '__main__':
+    unittest.main()
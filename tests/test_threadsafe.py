@@ -0,0 +1,114 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import os
+import re
+import sys
+import threading
+import time
+
+from suds.client import Client
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+import tests
+from tests import setup_logging, Server
+
+setup_logging()
+
+# The reply returns the value through a multiref so that a catalog
+# shared between threads would resolve the wrong value.
+REPLY = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+   <soap:Body>
+      <ns2:duckAddResponse xmlns:ns2="http://example.com/duck/">
+         <ns2:return href="#id0"/>
+      </ns2:duckAddResponse>
+      <multiRef xmlns:soapenc="http://schemas.xmlsoap.org/soap/encoding/"
+         id="id0" soapenc:root="0">%d</multiRef>
+   </soap:Body>
+</soap:Envelope>
+"""
+
+
+class Handler(tests.Handler):
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        username = re.search(r'<ns\d:username>(.*)</ns\d:username>', body)
+        time.sleep(0.001)
+        self.reply((REPLY % len(username.group(1))).encode('utf-8'))
+
+
+class TestThreadSafe(TestCase):
+
+    THREADS = 8
+    CALLS = 25
+
+    def setUp(self):
+        self.server = Server(Handler)
+        location = self.server.url('/DuckService2')
+        url = 'file://' + os.path.abspath("test_overload_DuckService2.wsdl")
+        self.client = Client(url, location=location)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def testConcurrentCalls(self):
+        client = self.client
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(self.CALLS):
+                    username = 'd' * (n * self.CALLS + i + 1)
+                    result = client.service.duckAdd(
+                        username=username, password='x', settings=[])
+                    if result != len(username):
+                        errors.append((username, result))
+                    sent = str(client.last_sent())
+                    if '>%s<' % username not in sent:
+                        errors.append((username, 'last_sent'))
+                    received = client.last_received()
+                    if received is None:
+                        errors.append((username, 'last_received'))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(self.THREADS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([], errors)
+
+    def testMessagesPerThread(self):
+        client = self.client
+        client.service.duckAdd(username='main', password='x', settings=[])
+        seen = []
+
+        def worker():
+            seen.append(client.last_sent())
+            client.service.duckAdd(username='worker', password='x', settings=[])
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        self.assertEqual([None], seen)
+        self.assertTrue('>main<' in str(client.last_sent()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the (LGPL) GNU Lesser General Public License as
+# published by the Free Software Foundation; either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Library Lesser General Public License for more details at
+# ( http://www.gnu.org/licenses/lgpl.html ).
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place - Suite 330, Boston, MA 02111-1307, USA.
+import sys
+import time
+
+from six.moves import urllib
+from suds.transport import Request, TransportError
+from suds.transport.pool import PooledHttpAuthenticated
+
+sys.path.insert(0, '../')
+import unittest
+from unittest import TestCase
+import tests
+from tests import setup_logging, Server
+
+setup_logging()
+
+
+class Handler(tests.Handler):
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.server.peers.append(self.client_address)
+        self.server.cookies.append(self.headers.get('Cookie'))
+        self.server.paths.append(self.path)
+        if self.path == '/slow':
+            time.sleep(2)
+        code = 500 if self.path == '/fault' else 200
+        self.reply(b'<reply/>', code, [('Set-Cookie', 'session=42; Path=/')])
+
+
+class TestPooledTransport(TestCase):
+
+    def setUp(self):
+        self.server = Server(Handler)
+        self.server.peers = []
+        self.server.cookies = []
+        self.server.paths = []
+        self.url = self.server.url('/service')
+
+    def tearDown(self):
+        self.server.stop()
+
+    def send(self, transport, url=None):
+        request = Request(url or self.url, b'<request/>')
+        request.headers['Content-Type'] = 'text/xml'
+        return transport.send(request)
+
+    def testConnectionReused(self):
+        transport = PooledHttpAuthenticated()
+        for i in range(5):
+            reply = self.send(transport)
+            self.assertEqual(b'<reply/>', reply.message)
+        self.assertEqual(5, len(self.server.peers))
+        self.assertEqual(1, len(set(self.server.peers)))
+        self.assertEqual(1, len(transport.pool))
+        transport.close()
+        self.assertEqual(0, len(transport.pool))
+
+    def testCookiesKept(self):
+        transport = PooledHttpAuthenticated()
+        self.send(transport)
+        self.send(transport)
+        self.assertEqual([None, 'session=42'], self.server.cookies)
+
+    def testFaultConnectionReused(self):
+        transport = PooledHttpAuthenticated()
+        try:
+            self.send(transport, self.url.replace('service', 'fault'))
+            self.fail('expected TransportError')
+        except TransportError as e:
+            self.assertEqual(500, e.httpcode)
+            self.assertEqual(b'<reply/>', e.fp.read())
+        self.send(transport)
+        self.assertEqual(1, len(set(self.server.peers)))
+
+    def testIdleTimeout(self):
+        transport = PooledHttpAuthenticated(idle_timeout=0)
+        self.send(transport)
+        self.send(transport)
+        self.assertEqual(2, len(set(self.server.peers)))
+
+    def testMaxPerHost(self):
+        transport = PooledHttpAuthenticated(max_per_host=0)
+        self.send(transport)
+        self.assertEqual(0, len(transport.pool))
+        self.send(transport)
+        self.assertEqual(2, len(set(self.server.peers)))
+
+    def testStaleConnection(self):
+        transport = PooledHttpAuthenticated()
+        self.send(transport)
+        for connections in transport.pool.idle.values():
+            for conn, stamp in connections:
+                conn.sock.close()
+        reply = self.send(transport)
+        self.assertEqual(b'<reply/>', reply.message)
+
+    def testTimeoutNotRetried(self):
+        transport = PooledHttpAuthenticated(timeout=0.5)
+        self.send(transport)
+        self.assertEqual(1, len(transport.pool))
+        try:
+            self.send(transport, self.url.replace('service', 'slow'))
+            self.fail('expected timeout')
+        except (urllib.error.URLError, OSError):
+            pass
+        self.assertEqual(['/service', '/slow'], self.server.paths)
+        self.assertEqual(1, len(set(self.server.peers)))
+        self.assertEqual(0, len(transport.pool))
+
+
+if __name__ == '__main__':
+    unittest.main()